@@ -0,0 +1,30 @@
+"""Base schema.
+
+Revision ID: 0000_base_schema
+Revises:
+Create Date: 2026-10-18
+
+The schema predates Alembic: tables were created by Base.metadata.create_all
+(init_db). This revision does the same with checkfirst, so ``alembic
+upgrade head`` works on an empty database and on one init_db already
+created. Because it creates the tables as the models currently define
+them, every later revision skips objects that already exist.
+"""
+
+from alembic import op
+
+from app.database import Base
+import app.models  # noqa: F401 — register every table on Base.metadata
+
+revision = "0000_base_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    Base.metadata.create_all(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    Base.metadata.drop_all(op.get_bind(), checkfirst=True)
@@ -0,0 +1,45 @@
+"""Indexes for hot foreign keys and lookup columns.
+
+Revision ID: 0001_hot_path_indexes
+Revises: 0000_base_schema
+Create Date: 2026-10-18
+
+Covers the queries behind GET /geo/runs/{id}/metrics,
+collect_domain_intelligence and _run_gap_analysis. Uses IF NOT EXISTS so it
+is safe on databases whose tables were created by create_all.
+"""
+
+from alembic import op
+
+revision = "0001_hot_path_indexes"
+down_revision = "0000_base_schema"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_geo_runs_project_status_created", "geo_runs", ["project_id", "status", "created_at"]),
+    ("ix_geo_responses_run_prompt_provider_turn", "geo_responses", ["run_id", "prompt_id", "provider", "turn"]),
+    ("ix_brand_mentions_response_id", "brand_mentions", ["response_id"]),
+    ("ix_brand_mentions_brand_id", "brand_mentions", ["brand_id"]),
+    ("ix_source_citations_response_id", "source_citations", ["response_id"]),
+    ("ix_source_citations_domain", "source_citations", ["domain"]),
+    ("ix_serp_queries_project_niche", "serp_queries", ["project_id", "niche"]),
+    ("ix_serp_results_query_position", "serp_results", ["query_id", "position"]),
+    ("ix_serp_results_domain", "serp_results", ["domain"]),
+    ("ix_gap_analyses_project_created", "gap_analyses", ["project_id", "created_at"]),
+    ("ix_gap_items_analysis_id", "gap_items", ["analysis_id"]),
+    ("ix_brands_project_id", "brands", ["project_id"]),
+    ("ix_brand_domains_domain", "brand_domains", ["domain"]),
+    ("ix_brand_domains_brand_id", "brand_domains", ["brand_id"]),
+    ("ix_prompts_project_niche_active", "prompts", ["project_id", "niche_id", "is_active"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
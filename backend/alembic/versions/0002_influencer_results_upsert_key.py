@@ -0,0 +1,39 @@
+"""Unique upsert key for influencer results.
+
+Revision ID: 0002_influencer_results_upsert_key
+Revises: 0001_hot_path_indexes
+Create Date: 2026-10-18
+
+Re-searches upsert on (project_id, niche_slug, platform, profile_url).
+Duplicates left by the old delete-and-insert path are removed first,
+keeping the newest row of each group (rows without a niche_slug never
+conflict, so they are left alone). The DELETE is plain SQL that runs on
+both Postgres and SQLite.
+"""
+
+from alembic import op
+
+revision = "0002_influencer_results_upsert_key"
+down_revision = "0001_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+INDEX = "ux_influencer_results_project_niche_platform_url"
+COLUMNS = ["project_id", "niche_slug", "platform", "profile_url"]
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM influencer_results WHERE EXISTS ("
+        "SELECT 1 FROM influencer_results b "
+        "WHERE b.project_id = influencer_results.project_id "
+        "AND b.niche_slug = influencer_results.niche_slug "
+        "AND b.platform = influencer_results.platform "
+        "AND b.profile_url = influencer_results.profile_url "
+        "AND (b.created_at, b.id) > (influencer_results.created_at, influencer_results.id))"
+    )
+    op.create_index(INDEX, "influencer_results", COLUMNS, unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="influencer_results", if_exists=True)
@@ -0,0 +1,27 @@
+"""SourceCitation.url_alive.
+
+Revision ID: 0003_source_citation_url_alive
+Revises: 0002_influencer_results_upsert_key
+Create Date: 2026-10-18
+
+Liveness verdict for citation URLs, filled when a GEO run finalizes
+(NULL = not checked yet). Skipped when the column already exists.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_source_citation_url_alive"
+down_revision = "0002_influencer_results_upsert_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("source_citations")}
+    if "url_alive" not in columns:
+        op.add_column("source_citations", sa.Column("url_alive", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("source_citations", "url_alive")
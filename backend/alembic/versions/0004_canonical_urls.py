@@ -0,0 +1,46 @@
+"""Canonical URL table referenced by citations, SERP results and gap items.
+
+Revision ID: 0004_canonical_urls
+Revises: 0003_source_citation_url_alive
+Create Date: 2026-10-18
+
+canonical_url_id stays NULL for rows written before this revision; gap
+analysis resolves ids for them when it reads them. The table, columns
+and indexes are each skipped when they already exist (create_all).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_canonical_urls"
+down_revision = "0003_source_citation_url_alive"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("source_citations", "serp_results", "gap_items")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "canonical_urls" not in inspector.get_table_names():
+        op.create_table(
+            "canonical_urls",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("url", sa.String(2048), nullable=False, unique=True),
+            sa.Column("domain", sa.String(512), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+    for table in _TABLES:
+        if "canonical_url_id" not in {c["name"] for c in inspector.get_columns(table)}:
+            op.add_column(
+                table,
+                sa.Column("canonical_url_id", sa.Integer(), sa.ForeignKey("canonical_urls.id"), nullable=True),
+            )
+        op.create_index(f"ix_{table}_canonical_url_id", table, ["canonical_url_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_index(f"ix_{table}_canonical_url_id", table_name=table)
+        op.drop_column(table, "canonical_url_id")
+    op.drop_table("canonical_urls")
@@ -0,0 +1,78 @@
+"""Stored key opportunity scores and Project.intel_version.
+
+Revision ID: 0005_key_opportunity_store
+Revises: 0004_canonical_urls
+Create Date: 2026-10-18
+
+intel_version is compared against key_opportunity_snapshots.version to
+decide whether the stored scores are stale. Each step is skipped when the
+table or column already exists (databases created by create_all).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0005_key_opportunity_store"
+down_revision = "0004_canonical_urls"
+branch_labels = None
+depends_on = None
+
+_JSON_COLUMNS = (
+    "competitor_brands", "content_types", "keywords", "top_urls",
+    "niches", "geo_providers", "recommended_actions",
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "intel_version" not in {c["name"] for c in inspector.get_columns("projects")}:
+        op.add_column(
+            "projects",
+            sa.Column("intel_version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    if "key_opportunity_snapshots" not in tables:
+        op.create_table(
+            "key_opportunity_snapshots",
+            sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("total", sa.Integer(), nullable=True),
+            sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "key_opportunity_scores" not in tables:
+        op.create_table(
+            "key_opportunity_scores",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("rank", sa.Integer(), nullable=False),
+            sa.Column("domain", sa.String(512), nullable=False),
+            sa.Column("display_name", sa.String(255), nullable=True),
+            sa.Column("domain_type", sa.String(20), nullable=True),
+            sa.Column("accepts_sponsored", sa.Boolean(), nullable=True),
+            sa.Column("seo_score", sa.Float(), nullable=False),
+            sa.Column("geo_score", sa.Float(), nullable=False),
+            sa.Column("backlink_score", sa.Float(), nullable=False),
+            sa.Column("content_gap_score", sa.Float(), nullable=False),
+            sa.Column("competitive_density", sa.Float(), nullable=False),
+            sa.Column("key_opportunity_score", sa.Float(), nullable=False),
+            sa.Column("priority", sa.String(10), nullable=False),
+            sa.Column("estimated_20x_potential", sa.Boolean(), nullable=True),
+            *(sa.Column(name, postgresql.JSONB(), nullable=True) for name in _JSON_COLUMNS),
+            sa.Column("domain_authority", sa.Integer(), nullable=True),
+            sa.Column("monthly_traffic", sa.Integer(), nullable=True),
+        )
+        op.create_index(
+            "ix_key_opportunity_scores_project_rank", "key_opportunity_scores", ["project_id", "rank"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_key_opportunity_scores_project_rank", table_name="key_opportunity_scores")
+    op.drop_table("key_opportunity_scores")
+    op.drop_table("key_opportunity_snapshots")
+    op.drop_column("projects", "intel_version")
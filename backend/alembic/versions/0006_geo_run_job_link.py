@@ -0,0 +1,41 @@
+"""GeoRun.job_id and BackgroundJob.updated_at.
+
+Revision ID: 0006_geo_run_job_link
+Revises: 0005_key_opportunity_store
+Create Date: 2026-10-18
+
+Resuming a GEO run checks the run's current job and its heartbeat
+(updated_at, touched by every progress write) so a live run is never
+resumed twice.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0006_geo_run_job_link"
+down_revision = "0005_key_opportunity_store"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "updated_at" not in {c["name"] for c in inspector.get_columns("background_jobs")}:
+        op.add_column(
+            "background_jobs",
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        )
+    if "job_id" not in {c["name"] for c in inspector.get_columns("geo_runs")}:
+        op.add_column(
+            "geo_runs",
+            sa.Column(
+                "job_id", postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("background_jobs.id", ondelete="SET NULL"), nullable=True,
+            ),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("geo_runs", "job_id")
+    op.drop_column("background_jobs", "updated_at")
@@ -0,0 +1,33 @@
+"""Daily API quota ledger.
+
+Revision ID: 0007_daily_quota_usage
+Revises: 0006_geo_run_job_link
+Create Date: 2026-10-18
+
+Units spent per provider and quota day, used by rate_limiter.take_daily
+when Redis is not configured. Skipped when the table already exists.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_daily_quota_usage"
+down_revision = "0006_geo_run_job_link"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "daily_quota_usage" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "daily_quota_usage",
+        sa.Column("provider", sa.String(50), primary_key=True),
+        sa.Column("day", sa.String(10), primary_key=True),
+        sa.Column("used", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_quota_usage")
@@ -6,8 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.analysis import ActionBrief, GapAnalysis, GapItem
+from app.database import get_db, get_read_db
+from app.models.analysis import ActionBrief, GapAnalysis, GapItem, KeyOpportunityScore
 from app.models.job import BackgroundJob
 from app.schemas.analysis import (
     ActionBriefResponse,
@@ -17,7 +17,7 @@ from app.schemas.analysis import (
     GapItemResponse,
 )
 from app.schemas.geo import JobStatusResponse
-from app.schemas.key_opportunity import KeyOpportunityResponse
+from app.schemas.key_opportunity import KeyOpportunityResponse, KeyOpportunityWhatIfRequest
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
@@ -42,26 +42,18 @@ async def create_gap_analysis(
     db.add(job)
     await db.flush()
 
-    from app.tasks.inline_runner import use_inline
+    from app.tasks.analysis_tasks import _run_gap_analysis, run_gap_analysis
+    from app.tasks.scheduler import submit_job
 
     analysis_id_str = str(analysis.id)
     job_id_str = str(job.id)
 
-    if use_inline():
-        from app.tasks.analysis_tasks import _run_gap_analysis
-        from app.tasks.inline_runner import dispatch_inline
-
-        await db.commit()
-        dispatch_inline(
-            lambda: _run_gap_analysis(analysis_id_str, job_id_str),
-            job_id=job_id_str,
-        )
-    else:
-        from app.tasks.analysis_tasks import run_gap_analysis
-
-        task = run_gap_analysis.delay(str(analysis.id), str(job.id))
-        job.celery_task_id = task.id
-        await db.commit()
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_gap_analysis(analysis_id_str, job_id_str, session_factory=sf),
+        celery_task=run_gap_analysis,
+        args=(analysis_id_str, job_id_str),
+    )
 
     await db.refresh(job)
     return job
@@ -70,7 +62,7 @@ async def create_gap_analysis(
 @router.get("/gaps", response_model=list[GapAnalysisResponse])
 async def list_gap_analyses(
     project_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List gap analyses for a project."""
     result = await db.execute(
@@ -98,7 +90,7 @@ async def get_gap_items(
     content_type: str | None = None,
     domain_type: str | None = None,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get gap items for an analysis, with optional filters."""
     query = (
@@ -124,7 +116,7 @@ async def list_briefs(
     priority: str | None = None,
     status: str | None = None,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List action briefs for a project."""
     query = select(ActionBrief).where(ActionBrief.project_id == project_id)
@@ -167,23 +159,68 @@ async def get_key_opportunities(
     min_score: float = 0,
     priority: str | None = None,
     limit: int = 50,
+    offset: int = 0,
     db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
 ):
     """Get Key Opportunity scores combining SEO + GEO + Backlinks + Content Gap.
 
     Aggregates all intelligence at the DOMAIN level to answer:
     "Which media outlets should we prioritize for placements?"
+
+    Scores are stored per project and only recomputed when a GEO run, gap
+    analysis or SERP fetch has completed since the last computation. The
+    staleness check runs on the primary; the listing is served from the read
+    replica unless it was just recomputed (the replica may not have it yet).
     """
-    from app.engines.intelligence.aggregator import collect_domain_intelligence
-    from app.engines.intelligence.key_opportunity import score_key_opportunities
+    from app.engines.intelligence.opportunity_store import ensure_key_opportunities
 
-    domain_intel = await collect_domain_intelligence(db, project_id)
-    opportunities = score_key_opportunities(domain_intel)
+    recomputed = await ensure_key_opportunities(db, project_id)
 
-    # Apply filters
+    query = select(KeyOpportunityScore).where(KeyOpportunityScore.project_id == project_id)
     if min_score > 0:
-        opportunities = [o for o in opportunities if o.key_opportunity_score >= min_score]
+        query = query.where(KeyOpportunityScore.key_opportunity_score >= min_score)
     if priority:
-        opportunities = [o for o in opportunities if o.priority == priority]
+        query = query.where(KeyOpportunityScore.priority == priority)
+    query = query.order_by(KeyOpportunityScore.rank).offset(offset).limit(limit)
 
-    return opportunities[:limit]
+    result = await (db if recomputed else read_db).execute(query)
+    return result.scalars().all()
+
+
+@router.post("/key-opportunities/what-if", response_model=list[KeyOpportunityResponse])
+async def what_if_key_opportunities(
+    data: KeyOpportunityWhatIfRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Re-rank Key Opportunities with custom weights and priority thresholds.
+
+    Works from the stored per-dimension scores (seo, geo, backlink,
+    content_gap, competitive) — no intelligence re-collection.
+    """
+    from app.engines.intelligence.key_opportunity import WEIGHTS
+    from app.engines.intelligence.opportunity_store import rerank_key_opportunities
+
+    invalid = set(data.weights) - set(WEIGHTS)
+    if invalid:
+        raise HTTPException(400, f"Invalid weights: {invalid}. Must be among: {set(WEIGHTS)}")
+    if any(v < 0 for v in data.weights.values()):
+        raise HTTPException(400, "Weights must be >= 0")
+
+    ranked = await rerank_key_opportunities(
+        db,
+        data.project_id,
+        weights=data.weights,
+        critical_threshold=data.critical_threshold,
+        high_threshold=data.high_threshold,
+        medium_threshold=data.medium_threshold,
+        min_score=data.min_score,
+        priority=data.priority,
+        limit=data.limit,
+    )
+    return [
+        KeyOpportunityResponse.model_validate(row).model_copy(
+            update={"key_opportunity_score": score, "priority": prio}
+        )
+        for row, score, prio in ranked
+    ]
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.content import ContentBrief
 from app.models.job import BackgroundJob
 from app.models.project import Project
@@ -120,7 +120,7 @@ async def list_briefs(
     status: str | None = Query(None),
     category: str | None = Query(None),
     recommendation_type: str | None = Query(None),  # NEW: filter by keyword/prompt
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List content briefs with optional filters."""
     query = select(ContentBrief).where(ContentBrief.project_id == project_id)
@@ -374,28 +374,22 @@ async def generate_content(data: ContentGenerateRequest, db: AsyncSession = Depe
     await db.flush()
 
     # Dispatch task
-    from app.tasks.inline_runner import use_inline
+    from app.tasks.content_tasks import _run_content_generation, run_content_generation
+    from app.tasks.scheduler import submit_job
 
     project_id_str = str(data.project_id)
     job_id_str = str(job.id)
     niche_str = data.niche
     provider_str = data.provider
 
-    if use_inline():
-        from app.tasks.content_tasks import _run_content_generation
-        from app.tasks.inline_runner import dispatch_inline
-
-        await db.commit()
-        dispatch_inline(
-            lambda: _run_content_generation(project_id_str, niche_str, job_id_str, provider_str),
-            job_id=job_id_str,
-        )
-    else:
-        from app.tasks.content_tasks import run_content_generation
-
-        task = run_content_generation.delay(project_id_str, niche_str, job_id_str, provider_str)
-        job.celery_task_id = task.id
-        await db.commit()
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_content_generation(
+            project_id_str, niche_str, job_id_str, provider_str, session_factory=sf,
+        ),
+        celery_task=run_content_generation,
+        args=(project_id_str, niche_str, job_id_str, provider_str),
+    )
 
     await db.refresh(job)
     return {"job_id": str(job.id), "briefs_queued": len(briefs)}
@@ -7,7 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.engines.intelligence.opportunity_store import bump_all_intel_versions
 from app.models.domain import Domain, ExclusionRule, ProjectDomain
 from app.schemas.domain import (
     BatchClassifyItem,
@@ -29,7 +30,7 @@ async def list_domains(
     domain_type: str | None = None,
     accepts_sponsored: bool | None = None,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List domains from the global catalog."""
     query = select(Domain)
@@ -65,6 +66,7 @@ async def create_domain(data: DomainCreate, db: AsyncSession = Depends(get_db)):
         classified_at=datetime.now(timezone.utc),
     )
     db.add(domain)
+    await bump_all_intel_versions(db)
     await db.commit()
     await db.refresh(domain)
     return domain
@@ -164,6 +166,8 @@ async def batch_classify_domains(
             ))
 
     try:
+        if uncached:
+            await bump_all_intel_versions(db)
         await db.commit()
     except Exception:
         await db.rollback()  # If duplicate domains somehow
@@ -195,6 +199,7 @@ async def update_domain(
     domain.classified_by = "manual"
     domain.classified_at = datetime.now(timezone.utc)
 
+    await bump_all_intel_versions(db)
     await db.commit()
     await db.refresh(domain)
     return domain
@@ -1,17 +1,19 @@
 """GEO engine API endpoints: runs, responses, metrics."""
 
 import asyncio
+import json
 import uuid
+from datetime import datetime, timezone
 from typing import List
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.models.geo import BrandMention, GeoResponse, GeoRun, SourceCitation
 from app.models.job import BackgroundJob
 from app.models.project import Brand
@@ -28,6 +30,8 @@ from app.schemas.geo import (
 
 router = APIRouter(prefix="/geo", tags=["geo"])
 
+_SSE_KEEPALIVE_SECONDS = 15
+
 
 @router.post("/runs", response_model=JobStatusResponse, status_code=201)
 async def create_geo_run(data: GeoRunCreate, db: AsyncSession = Depends(get_db)):
@@ -68,29 +72,22 @@ async def create_geo_run(data: GeoRunCreate, db: AsyncSession = Depends(get_db))
     )
     db.add(job)
     await db.flush()
+    run.job_id = job.id
 
     # Dispatch task (Celery if Redis available, otherwise inline)
-    from app.tasks.inline_runner import use_inline
+    from app.tasks.geo_tasks import _run_geo_analysis, run_geo_analysis
+    from app.tasks.scheduler import submit_job
 
     # Capture IDs before session closes (avoids lazy-load in lambda)
     run_id_str = str(run.id)
     job_id_str = str(job.id)
 
-    if use_inline():
-        from app.tasks.geo_tasks import _run_geo_analysis
-        from app.tasks.inline_runner import dispatch_inline
-
-        await db.commit()
-        dispatch_inline(
-            lambda: _run_geo_analysis(None, run_id_str, job_id_str),
-            job_id=job_id_str,
-        )
-    else:
-        from app.tasks.geo_tasks import run_geo_analysis
-
-        task = run_geo_analysis.delay(str(run.id), str(job.id))
-        job.celery_task_id = task.id
-        await db.commit()
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_geo_analysis(None, run_id_str, job_id_str, session_factory=sf),
+        celery_task=run_geo_analysis,
+        args=(run_id_str, job_id_str),
+    )
 
     await db.refresh(job)
     return JobStatusResponse(
@@ -110,7 +107,7 @@ async def create_geo_run(data: GeoRunCreate, db: AsyncSession = Depends(get_db))
 async def list_geo_runs(
     project_id: uuid.UUID,
     niche_id: uuid.UUID | None = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List GEO runs for a project, optionally filtered by niche."""
     query = select(GeoRun).where(GeoRun.project_id == project_id)
@@ -131,11 +128,68 @@ async def get_geo_run(run_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     return run
 
 
+@router.post("/runs/{run_id}/resume", response_model=JobStatusResponse, status_code=201)
+async def resume_geo_run(run_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Resume an interrupted GEO run.
+
+    Only allowed once the run's job has finished without completing the
+    run, or has written no progress for geo_resume_stale_seconds — a stale
+    job is marked failed and replaced. Prompt/provider units that already
+    have stored responses are skipped, so only the remainder is re-queried.
+    """
+    from app.tasks.geo_tasks import _run_geo_analysis, run_geo_analysis
+    from app.tasks.scheduler import TERMINAL_STATUSES, submit_job, supersede_job
+
+    # Row lock (Postgres): a concurrent resume waits, then sees the new job
+    result = await db.execute(select(GeoRun).where(GeoRun.id == run_id).with_for_update())
+    run = result.scalar_one_or_none()
+    if not run:
+        raise HTTPException(404, "GEO run not found")
+    if run.status == "completed":
+        raise HTTPException(409, "GEO run already completed")
+
+    previous = await db.get(BackgroundJob, run.job_id) if run.job_id else None
+    if previous is not None:
+        live = previous.status not in TERMINAL_STATUSES
+        heartbeat = previous.updated_at or previous.started_at or previous.created_at
+    else:
+        # Runs created before jobs were linked: only the run's own timestamps
+        live = run.status in ("pending", "running")
+        heartbeat = run.started_at or run.created_at
+    if live:
+        if heartbeat.tzinfo is None:  # SQLite returns naive UTC
+            heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+        idle = (datetime.now(timezone.utc) - heartbeat).total_seconds()
+        if idle < settings.geo_resume_stale_seconds:
+            raise HTTPException(409, "GEO run is still in progress")
+
+    job = BackgroundJob(project_id=run.project_id, job_type="geo_analysis")
+    db.add(job)
+    await db.flush()
+    run.status = "pending"
+    run.job_id = job.id
+    if previous is not None and live:
+        await supersede_job(db, previous, f"Stale: superseded by job {job.id}")
+
+    run_id_str = str(run.id)
+    job_id_str = str(job.id)
+
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_geo_analysis(None, run_id_str, job_id_str, session_factory=sf),
+        celery_task=run_geo_analysis,
+        args=(run_id_str, job_id_str),
+    )
+
+    await db.refresh(job)
+    return JobStatusResponse.model_validate(job).model_copy(update={"run_id": run.id})
+
+
 @router.get("/runs/{run_id}/responses", response_model=list[GeoResponseDetail])
 async def get_run_responses(
     run_id: uuid.UUID,
     provider: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all responses for a GEO run, optionally filtered by provider."""
     query = (
@@ -155,7 +209,7 @@ async def get_run_responses(
 
 
 @router.get("/runs/{run_id}/metrics", response_model=AggregatedResultResponse)
-async def get_run_metrics(run_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def get_run_metrics(run_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
     """Get aggregated brand visibility metrics for a completed GEO run."""
     # Load run
     run_result = await db.execute(select(GeoRun).where(GeoRun.id == run_id))
@@ -200,7 +254,12 @@ async def get_run_metrics(run_id: uuid.UUID, db: AsyncSession = Depends(get_db))
                 for m in r.mentions
             ],
             "citations": [
-                {"url": c.url, "domain": c.domain or "", "title": c.title or ""}
+                {
+                    "url": c.url,
+                    "canonical_url_id": c.canonical_url_id,
+                    "domain": c.domain or "",
+                    "title": c.title or "",
+                }
                 for c in r.citations
             ],
         })
@@ -260,33 +319,16 @@ class ValidateUrlsRequest(BaseModel):
 
 @router.post("/validate-urls")
 async def validate_urls(body: ValidateUrlsRequest):
-    """Check which URLs are reachable (2xx/3xx). Used to filter LLM-hallucinated URLs."""
-    urls = list(set(body.urls))[:80]  # deduplicate, cap at 80
+    """Check which URLs are reachable (2xx/3xx). Used to filter LLM-hallucinated URLs.
 
-    _HEADERS = {
-        "User-Agent": (
-            "Mozilla/5.0 (compatible; SanchoCMO/1.0; +https://sancho.ai)"
-        )
-    }
-
-    async def check(url: str) -> tuple[str, bool]:
-        try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                timeout=6.0,
-                verify=False,  # noqa: S501 — external URLs, SSL errors irrelevant
-            ) as client:
-                r = await client.head(url, headers=_HEADERS)
-                if r.status_code == 405:
-                    # Server doesn't accept HEAD — try GET with stream
-                    r = await client.get(url, headers=_HEADERS)
-                return url, r.status_code < 400
-        except Exception:
-            return url, False
-
-    results = await asyncio.gather(*[check(u) for u in urls])
-    valid = [u for u, ok in results if ok]
-    return {"valid": valid}
+    Verdicts are cached (see app.utils.url_liveness), so repeated calls for
+    the same citations don't hit the network again.
+    """
+    from app.utils.url_liveness import check_urls
+
+    urls = list(dict.fromkeys(body.urls))[:settings.url_validate_max_urls]
+    verdicts = await check_urls(urls)
+    return {"valid": [u for u in urls if verdicts.get(u)]}
 
 
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
@@ -299,3 +341,87 @@ async def get_job_status(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     if not job:
         raise HTTPException(404, "Job not found")
     return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: uuid.UUID):
+    """Stream job progress as Server-Sent Events.
+
+    The first event is the full job (same shape as GET /jobs/{job_id});
+    later events carry only the changed fields. The stream closes once the
+    job reaches a terminal status.
+    """
+    from fastapi.responses import StreamingResponse
+
+    from app.database import async_session
+    from app.tasks.scheduler import TERMINAL_STATUSES
+    from app.utils import job_events
+
+    def _sse(payload: dict) -> str:
+        return f"data: {json.dumps(payload, default=str)}\n\n"
+
+    async def _stream():
+        async with job_events.subscribe(str(job_id)) as events:
+            async with async_session() as db:
+                job = (await db.execute(
+                    select(BackgroundJob).where(BackgroundJob.id == job_id)
+                )).scalar_one_or_none()
+                snapshot = JobStatusResponse.model_validate(job).model_dump(mode="json") if job else None
+            if snapshot is None:
+                yield _sse({"id": str(job_id), "status": "failed", "error": "Job not found"})
+                return
+            yield _sse(snapshot)
+            if snapshot["status"] in TERMINAL_STATUSES:
+                return
+
+            # One pending read that survives keepalive timeouts — wait_for
+            # would cancel it, and a cancelled async generator is finished
+            it = events.__aiter__()
+            pending: asyncio.Future | None = None
+            try:
+                while True:
+                    if pending is None:
+                        pending = asyncio.ensure_future(it.__anext__())
+                    done, _ = await asyncio.wait({pending}, timeout=_SSE_KEEPALIVE_SECONDS)
+                    if not done:
+                        yield ": keepalive\n\n"
+                        continue
+                    read, pending = pending, None
+                    try:
+                        event = read.result()
+                    except StopAsyncIteration:
+                        return
+                    yield _sse(event)
+                    if event.get("status") in TERMINAL_STATUSES:
+                        return
+            finally:
+                if pending is not None:
+                    pending.cancel()
+                    await asyncio.gather(pending, return_exceptions=True)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobStatusResponse)
+async def cancel_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Cancel a pending or running background job.
+
+    Pending jobs are dropped from the queue; running ones stop at their next
+    cancellation check (between prompts / queries / platforms).
+    """
+    from app.tasks.scheduler import cancel_job as _cancel_job
+
+    result = await db.execute(
+        select(BackgroundJob).where(BackgroundJob.id == job_id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(404, "Job not found")
+    if not await _cancel_job(db, job):
+        raise HTTPException(409, f"Job already {job.status}")
+    await db.refresh(job)
+    return job
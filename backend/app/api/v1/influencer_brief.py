@@ -23,6 +23,11 @@ class InfluencerBriefResponse(BaseModel):
     niche_name: str
 
 
+_BRIEF_CLAUDE_MODEL = "claude-sonnet-4-6"
+
+
+# Not memoized: the brief is saved on the niche and served from there, and
+# ?regenerate=true always wants a fresh one
 async def _generate_influencer_brief(
     client_name: str,
     company_type: str | None,
@@ -176,7 +181,7 @@ REGLAS DE GENERACIÓN:
     async def _call_llm(p: str, s: str) -> str:
         if settings.anthropic_api_key:
             from app.engines.geo.claude_adapter import ClaudeAdapter
-            adapter = ClaudeAdapter(model="claude-sonnet-4-6")
+            adapter = ClaudeAdapter(model=_BRIEF_CLAUDE_MODEL)
             resp = await adapter.query(p, system_prompt=s)
             await adapter.close()
             return resp.text
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.influencer import InfluencerResult
 from app.models.job import BackgroundJob
 from app.schemas.geo import JobStatusResponse
@@ -25,33 +25,26 @@ async def search_influencers(
     db.add(job)
     await db.flush()
 
-    from app.tasks.inline_runner import use_inline
+    from app.tasks.influencer_tasks import _run_influencer_search, run_influencer_search
+    from app.tasks.scheduler import submit_job
 
     job_id_str = str(job.id)
     project_id_str = str(data.project_id)
     niche_id_str = str(data.niche_id) if data.niche_id else None
 
-    if use_inline():
-        from app.tasks.influencer_tasks import _run_influencer_search
-        from app.tasks.inline_runner import dispatch_inline
-
-        await db.commit()
-        dispatch_inline(
-            lambda: _run_influencer_search(
-                job_id_str, project_id_str, niche_id_str,
-                data.niche_slug, data.platforms, data.num_results,
-            ),
-            job_id=job_id_str,
-        )
-    else:
-        from app.tasks.influencer_tasks import run_influencer_search
-
-        task = run_influencer_search.delay(
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_influencer_search(
             job_id_str, project_id_str, niche_id_str,
             data.niche_slug, data.platforms, data.num_results,
-        )
-        job.celery_task_id = task.id
-        await db.commit()
+            session_factory=sf,
+        ),
+        celery_task=run_influencer_search,
+        args=(
+            job_id_str, project_id_str, niche_id_str,
+            data.niche_slug, data.platforms, data.num_results,
+        ),
+    )
 
     await db.refresh(job)
     return job
@@ -62,7 +55,7 @@ async def list_influencer_results(
     project_id: uuid.UUID,
     niche_slug: str | None = Query(None),
     platform: str | None = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List influencer results for a project/niche."""
     query = select(InfluencerResult).where(InfluencerResult.project_id == project_id)
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
+from app.engines.intelligence.opportunity_store import bump_intel_version
 from app.models.project import Brand, Project
 from app.schemas.project import (
     BrandCreate,
@@ -88,6 +89,7 @@ async def create_brand(project_id: uuid.UUID, data: BrandCreate, db: AsyncSessio
         raise HTTPException(status_code=404, detail="Project not found")
     brand = Brand(project_id=project_id, **data.model_dump())
     db.add(brand)
+    await bump_intel_version(db, project_id)
     await db.flush()
     await db.refresh(brand)
     return brand
@@ -111,6 +113,7 @@ async def update_brand(project_id: uuid.UUID, brand_id: uuid.UUID, data: BrandCr
         raise HTTPException(status_code=404, detail="Brand not found")
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(brand, key, value)
+    await bump_intel_version(db, project_id)
     await db.flush()
     await db.refresh(brand)
     return brand
@@ -125,6 +128,7 @@ async def delete_brand(project_id: uuid.UUID, brand_id: uuid.UUID, db: AsyncSess
     if not brand:
         raise HTTPException(status_code=404, detail="Brand not found")
     await db.delete(brand)
+    await bump_intel_version(db, project_id)
 
 
 @router.post("/{project_id}/brands/{brand_id}/analyze", response_model=BrandResponse)
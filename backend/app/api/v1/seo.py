@@ -7,7 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.job import BackgroundJob
 from app.models.seo import ContentClassification, SerpQuery, SerpResult
 from app.schemas.geo import JobStatusResponse
@@ -64,26 +64,18 @@ async def create_batch_serp_queries(data: SerpQueryBatchCreate, db: AsyncSession
     await db.flush()
 
     # Dispatch task (Celery if Redis available, otherwise inline)
-    from app.tasks.inline_runner import use_inline
+    from app.tasks.scheduler import submit_job
+    from app.tasks.seo_tasks import _run_serp_batch, run_serp_batch
 
     query_ids = [str(q.id) for q in queries]
     job_id_str = str(job.id)
 
-    if use_inline():
-        from app.tasks.seo_tasks import _run_serp_batch
-        from app.tasks.inline_runner import dispatch_inline
-
-        await db.commit()
-        dispatch_inline(
-            lambda: _run_serp_batch(None, query_ids, job_id_str),
-            job_id=job_id_str,
-        )
-    else:
-        from app.tasks.seo_tasks import run_serp_batch
-
-        task = run_serp_batch.delay(query_ids, str(job.id))
-        job.celery_task_id = task.id
-        await db.commit()
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_serp_batch(None, query_ids, job_id_str, session_factory=sf),
+        celery_task=run_serp_batch,
+        args=(query_ids, job_id_str),
+    )
 
     await db.refresh(job)
     return job
@@ -93,7 +85,7 @@ async def create_batch_serp_queries(data: SerpQueryBatchCreate, db: AsyncSession
 async def list_serp_queries(
     project_id: uuid.UUID,
     niche: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List SERP queries for a project, optionally filtered by niche."""
     query = select(SerpQuery).where(SerpQuery.project_id == project_id)
@@ -106,7 +98,7 @@ async def list_serp_queries(
 
 
 @router.get("/queries/{query_id}/results", response_model=SerpQueryWithResults)
-async def get_query_results(query_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def get_query_results(query_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
     """Get a SERP query with its results and classifications."""
     result = await db.execute(
         select(SerpQuery)
@@ -209,25 +201,17 @@ async def refetch_serp_batch(
     db.add(job)
     await db.flush()
 
-    from app.tasks.inline_runner import use_inline
+    from app.tasks.scheduler import submit_job
+    from app.tasks.seo_tasks import _run_serp_batch, run_serp_batch
 
     job_id_str = str(job.id)
 
-    if use_inline():
-        from app.tasks.seo_tasks import _run_serp_batch
-        from app.tasks.inline_runner import dispatch_inline
-
-        await db.commit()
-        dispatch_inline(
-            lambda: _run_serp_batch(None, query_ids, job_id_str),
-            job_id=job_id_str,
-        )
-    else:
-        from app.tasks.seo_tasks import run_serp_batch
-
-        task = run_serp_batch.delay(query_ids, job_id_str)
-        job.celery_task_id = task.id
-        await db.commit()
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_serp_batch(None, query_ids, job_id_str, session_factory=sf),
+        celery_task=run_serp_batch,
+        args=(query_ids, job_id_str),
+    )
 
     await db.refresh(job)
     return job
@@ -245,26 +229,18 @@ async def fetch_serp_results(query_id: uuid.UUID, db: AsyncSession = Depends(get
     db.add(job)
     await db.flush()
 
-    from app.tasks.inline_runner import use_inline
+    from app.tasks.scheduler import submit_job
+    from app.tasks.seo_tasks import _run_serp_query, run_serp_query
 
     query_id_str = str(query_id)
     job_id_str = str(job.id)
 
-    if use_inline():
-        from app.tasks.seo_tasks import _run_serp_query
-        from app.tasks.inline_runner import dispatch_inline
-
-        await db.commit()
-        dispatch_inline(
-            lambda: _run_serp_query(query_id_str, job_id_str),
-            job_id=job_id_str,
-        )
-    else:
-        from app.tasks.seo_tasks import run_serp_query
-
-        task = run_serp_query.delay(query_id_str, job_id_str)
-        job.celery_task_id = task.id
-        await db.commit()
+    await submit_job(
+        db, job,
+        inline=lambda sf: _run_serp_query(query_id_str, job_id_str, session_factory=sf),
+        celery_task=run_serp_query,
+        args=(query_id_str, job_id_str),
+    )
 
     await db.refresh(job)
     return job
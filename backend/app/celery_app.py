@@ -2,6 +2,9 @@
 
 When redis_url is empty (local dev), celery_app is set to None
 and tasks run inline via inline_runner instead.
+
+Jobs are routed to the "interactive" and "bulk" queues by
+app.tasks.scheduler — workers must consume both (-Q interactive,bulk).
 """
 
 from app.config import settings
@@ -26,6 +29,9 @@ if settings.redis_url:
         task_track_started=True,
         task_acks_late=True,
         worker_prefetch_multiplier=1,
+        task_default_queue="bulk",
+        # Honour apply_async(priority=...) on the Redis broker (0 = highest)
+        broker_transport_options={"queue_order_strategy": "priority"},
     )
 
     celery_app.autodiscover_tasks(["app.tasks"])
@@ -9,10 +9,75 @@ class Settings(BaseSettings):
     # Database — SQLite for local dev, Postgres for production
     database_url: str = f"sqlite+aiosqlite:///{_PROJECT_ROOT}/seogeo.db"
     database_url_sync: str = f"sqlite:///{_PROJECT_ROOT}/seogeo.db"
+    # Optional read-only replica for heavy read endpoints (empty = use primary)
+    database_read_url: str = ""
+
+    # Connection pool (Postgres only — SQLite uses the driver defaults)
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30        # seconds to wait for a free connection
+    db_pool_recycle: int = 1800      # recycle connections older than this (s)
+    db_pool_pre_ping: bool = True
 
     # Redis (empty = disabled, uses in-memory fallback)
     redis_url: str = ""
 
+    # In-memory cache fallback: byte budget (LRU eviction) and expiry sweep interval
+    cache_mem_max_bytes: int = 64 * 1024 * 1024
+    cache_sweep_seconds: int = 60
+
+    # With Redis: per-process L1 in front of it (0 = off); entries live at most
+    # cache_l1_ttl_seconds so other workers' writes show up quickly
+    cache_l1_max_bytes: int = 16 * 1024 * 1024
+    cache_l1_ttl_seconds: int = 60
+    # Compress Redis payloads larger than this (zstd if installed, else zlib)
+    cache_compress_min_bytes: int = 1024
+
+    # Memoize deterministic LLM calls (app.utils.llm_cache) in the cache above
+    llm_cache_enabled: bool = True
+
+    # Inline runner (no Redis): concurrent background jobs, one DB engine each
+    inline_workers: int = 4
+
+    # Max running jobs per BackgroundJob.job_type (0 / missing = unlimited).
+    # Applies to both the inline pool and Celery workers.
+    job_concurrency: dict[str, int] = {
+        "geo_analysis": 1,
+        # Chunks of fanned-out GEO runs (geo_chunk_size > 0); the run's
+        # geo_analysis slot is only held while the chord is dispatched
+        "geo_chunk": 4,
+        "serp_batch": 2,
+        "influencer_search": 2,
+        "serp_fetch": 4,
+        "gap_analysis": 2,
+        "content_generation": 2,
+    }
+
+    # Min interval between BackgroundJob progress writes (status changes flush immediately)
+    job_progress_flush_ms: int = 500
+
+    # GEO runs on Celery: prompts per chunk task (0 = whole run in one task)
+    geo_chunk_size: int = 5
+    # Check citation URLs when a run finalizes (stored in SourceCitation.url_alive)
+    geo_validate_citations: bool = True
+    # A GEO run can only be resumed once its job failed or has written no
+    # progress for this long (a live job heartbeats at least once per prompt)
+    geo_resume_stale_seconds: int = 900
+
+    # URL liveness checks (POST /geo/validate-urls and citation validation)
+    url_validate_max_urls: int = 200       # per request to the endpoint
+    url_check_concurrency: int = 32
+    url_check_per_host: int = 4
+    url_check_timeout: float = 6.0
+    url_check_alive_ttl: int = 7 * 24 * 3600
+    url_check_dead_ttl: int = 24 * 3600
+
+    # Page fetching for domain analysis (extracted text cached on disk)
+    page_cache_dir: str = str(_PROJECT_ROOT / ".page_cache")
+    page_cache_ttl: int = 24 * 3600        # served without revalidating
+    page_fetch_max_bytes: int = 512 * 1024  # stop reading a page after this
+    page_fetch_timeout: float = 15.0
+
     # LLM API Keys (individual — used if openrouter_api_key is empty)
     openai_api_key: str = ""
     anthropic_api_key: str = ""
@@ -29,6 +94,8 @@ class Settings(BaseSettings):
 
     # YouTube Data API v3 (influencer discovery — optional, falls back to SearchAPI/SERP)
     youtube_api_key: str = ""
+    youtube_daily_quota: int = 10_000
+    youtube_quota_reserve: int = 200  # units searches leave free for channels.list lookups
 
     # SearchAPI.io (influencer discovery — optional, falls back to SERP)
     # https://www.searchapi.io — supports engine=youtube with subscriber counts
@@ -39,11 +106,20 @@ class Settings(BaseSettings):
     # API key from Google Cloud Console (same project as YouTube API if using both)
     google_cse_key: str = ""
     google_cse_cx: str = ""   # CX = Search Engine ID (e.g. "017576662512468239146:omuauf_lfve")
+    google_cse_daily_limit: int = 100  # requests/day (each result page is one request)
 
     # Apify — Instagram follower count enrichment (~$5/mo free = ~2,500 profiles)
     # https://apify.com  →  actor: apify/instagram-profile-scraper
     apify_token: str = ""
 
+    # Shared influencer profiles (followers, title, language) are refetched after this
+    influencer_profile_ttl_hours: int = 7 * 24
+
+    # Instagram meta-tag scraping: handles per search, requests in flight, requests/sec
+    instagram_enrich_max_handles: int = 60
+    instagram_enrich_concurrency: int = 4
+    instagram_enrich_rps: float = 2.0
+
     # DataForSEO (keyword research, SERP analysis)
     dataforseo_login: str = ""
     dataforseo_password: str = ""
@@ -54,6 +130,9 @@ class Settings(BaseSettings):
     gemini_rpm: int = 60
     perplexity_rpm: int = 50
     serp_rpm: int = 100
+    youtube_rpm: int = 600
+    searchapi_rpm: int = 300
+    google_cse_rpm: int = 100
 
     # App
     secret_key: str = "change-me-in-production"
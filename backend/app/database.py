@@ -1,6 +1,6 @@
 import json
 
-from sqlalchemy import event, text
+from sqlalchemy import event, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -15,8 +15,11 @@ def _make_engine(database_url: str):
     WAL mode (set in init_db) + 30s busy_timeout handles concurrent writes
     without StaticPool — StaticPool causes conflicts between the main event
     loop and the inline_runner background thread's new event loop.
+
+    Postgres engines get the pool settings from config (size, overflow,
+    timeout, recycle, pre-ping).
     """
-    if _is_sqlite:
+    if database_url.startswith("sqlite"):
         return create_async_engine(
             database_url,
             echo=False,
@@ -25,12 +28,24 @@ def _make_engine(database_url: str):
                 "timeout": 30,  # aiosqlite busy wait in seconds
             },
         )
-    return create_async_engine(database_url, echo=False)
+    return create_async_engine(
+        database_url,
+        echo=False,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
 
 
 engine = _make_engine(settings.database_url)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Read replica for heavy read endpoints — falls back to the primary
+read_engine = _make_engine(settings.database_read_url) if settings.database_read_url else engine
+async_read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
@@ -55,6 +70,15 @@ async def init_db():
                 ))
             except Exception:
                 pass  # Column already exists
+            # Job heartbeat + run -> job link (GEO resume)
+            for migration_sql in (
+                "ALTER TABLE background_jobs ADD COLUMN updated_at DATETIME",
+                "ALTER TABLE geo_runs ADD COLUMN job_id VARCHAR(36) REFERENCES background_jobs(id)",
+            ):
+                try:
+                    await conn.execute(text(migration_sql))
+                except Exception:
+                    pass  # Column already exists
             # Add brief column to niches if missing (SQLite migration)
             try:
                 await conn.execute(text(
@@ -81,6 +105,56 @@ async def init_db():
                     await conn.execute(text(migration_sql))
                 except Exception:
                     pass  # Column already exists
+            # Version stamp for cached key opportunity scores
+            try:
+                await conn.execute(text(
+                    "ALTER TABLE projects ADD COLUMN intel_version INTEGER DEFAULT 0"
+                ))
+            except Exception:
+                pass  # Column already exists
+            # Citation URL liveness (checked when a GEO run finalizes)
+            try:
+                await conn.execute(text(
+                    "ALTER TABLE source_citations ADD COLUMN url_alive BOOLEAN"
+                ))
+            except Exception:
+                pass  # Column already exists
+            # Canonical URL references (app.utils.urls)
+            for table in ("source_citations", "serp_results", "gap_items"):
+                try:
+                    await conn.execute(text(
+                        f"ALTER TABLE {table} ADD COLUMN canonical_url_id INTEGER REFERENCES canonical_urls(id)"
+                    ))
+                except Exception:
+                    pass  # Column already exists
+            await conn.run_sync(_dedupe_influencer_results)
+            # Indexes declared in __table_args__ after the table already
+            # existed (create_all only adds indexes with new tables)
+            await conn.run_sync(_create_missing_indexes)
+
+
+def _dedupe_influencer_results(sync_conn) -> None:
+    """Drop duplicate influencer results (keep the newest) so the unique
+    upsert index can be created — once, while that index doesn't exist yet
+    (same as alembic 0002)."""
+    indexes = {ix["name"] for ix in inspect(sync_conn).get_indexes("influencer_results")}
+    if "ux_influencer_results_project_niche_platform_url" in indexes:
+        return
+    sync_conn.execute(text(
+        "DELETE FROM influencer_results WHERE EXISTS ("
+        "SELECT 1 FROM influencer_results b "
+        "WHERE b.project_id = influencer_results.project_id "
+        "AND b.niche_slug = influencer_results.niche_slug "
+        "AND b.platform = influencer_results.platform "
+        "AND b.profile_url = influencer_results.profile_url "
+        "AND (b.created_at, b.id) > (influencer_results.created_at, influencer_results.id))"
+    ))
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
 
 
 async def get_db() -> AsyncSession:
@@ -95,6 +169,19 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db() -> AsyncSession:
+    """Session on the read replica (or the primary if none is configured).
+
+    For read-only endpoints; data may lag the primary slightly.
+    """
+    async with async_read_session() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
 def create_worker_session() -> async_sessionmaker[AsyncSession]:
     """Create a fresh engine + session factory for background threads.
 
@@ -18,6 +18,8 @@ from app.models.analysis import GapAnalysis, GapItem
 from app.models.niche import Niche, NicheBrand
 from app.models.project import Brand, Project as ProjectModel
 from app.models.seo import SerpQuery
+from app.utils import cache
+from app.utils.llm_cache import memoize_llm
 
 log = logging.getLogger(__name__)
 
@@ -133,6 +135,17 @@ async def _call_llm(prompt: str, system_prompt: str) -> str:
     raise RuntimeError("No LLM API key configured")
 
 
+def _llm_model() -> str:
+    """Backend _call_llm picks (part of the memoization key)."""
+    from app.config import settings
+
+    if settings.openrouter_api_key:
+        return "openrouter:openai/gpt-4o"
+    if settings.anthropic_api_key:
+        return "anthropic"
+    return "openai"
+
+
 _MARKET_LABELS = {
     "es": "Spain (España)",
     "us": "United States",
@@ -145,6 +158,7 @@ _MARKET_LABELS = {
 }
 
 
+@memoize_llm(ttl=cache.SERP_TTL, model=_llm_model, cache_if=bool)
 async def _generate_keywords_from_brief(
     niche_name: str,
     brief: dict | None,
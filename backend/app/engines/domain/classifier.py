@@ -1,6 +1,7 @@
 """Hybrid domain classifier: Rules engine → LLM fallback → Manual override."""
 
 from app.engines.domain.rules_engine import RuleClassification, classify_by_rules
+from app.utils.llm_cache import memoize_llm
 
 
 async def classify_domain(domain: str, *, use_llm_fallback: bool = True) -> RuleClassification:
@@ -23,6 +24,12 @@ async def classify_domain(domain: str, *, use_llm_fallback: bool = True) -> Rule
     return await _classify_with_llm(domain)
 
 
+@memoize_llm(
+    ttl=30 * 24 * 3600,
+    provider="openai",
+    result_type=RuleClassification,
+    cache_if=lambda r: r.classified_by != "llm_error",
+)
 async def _classify_with_llm(domain: str) -> RuleClassification:
     """Use LLM to classify an unknown domain."""
     from app.engines.geo import get_adapter
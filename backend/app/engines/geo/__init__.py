@@ -1,5 +1,7 @@
 """GEO engine: LLM adapters, response parsing, and metrics aggregation."""
 
+import inspect
+
 from app.engines.geo.base import LLMAdapter, LLMResponse
 from app.engines.geo.claude_adapter import ClaudeAdapter
 from app.engines.geo.gemini_adapter import GeminiAdapter
@@ -40,6 +42,18 @@ def get_adapter(provider: str) -> LLMAdapter:
     return cls()
 
 
+def adapter_model(provider: str) -> str:
+    """Model id get_adapter(provider) would query, without creating a client."""
+    from app.config import settings
+
+    if settings.openrouter_api_key:
+        return OPENROUTER_MODELS.get(provider, provider)
+    cls = DIRECT_ADAPTERS.get(provider)
+    if cls is None:
+        raise ValueError(f"Unknown provider: {provider}. Available: {list(DIRECT_ADAPTERS)}")
+    return inspect.signature(cls).parameters["model"].default
+
+
 __all__ = [
     "LLMAdapter",
     "LLMResponse",
@@ -49,6 +63,7 @@ __all__ = [
     "PerplexityAdapter",
     "OpenRouterAdapter",
     "get_adapter",
+    "adapter_model",
     "DIRECT_ADAPTERS",
     "OPENROUTER_MODELS",
 ]
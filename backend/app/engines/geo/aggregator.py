@@ -2,6 +2,8 @@
 
 from dataclasses import dataclass, field
 
+from app.utils.urls import canonicalize_url
+
 
 @dataclass
 class BrandMetrics:
@@ -55,7 +57,8 @@ def aggregate(
             - prompt_id: str
             - provider: str
             - mentions: list of ParsedMention-like dicts
-            - citations: list of ParsedCitation-like dicts
+            - citations: list of ParsedCitation-like dicts, optionally with
+              canonical_url_id (URLs are deduped per domain by canonical URL)
         brand_names: All brand names being tracked.
         total_prompts: Number of unique prompts in the run.
 
@@ -65,7 +68,7 @@ def aggregate(
     accum: dict[str, _MentionAccum] = {b.lower(): _MentionAccum() for b in brand_names}
     domain_counts: dict[str, int] = {}
     domain_providers: dict[str, set[str]] = {}
-    domain_urls: dict[str, set[str]] = {}
+    domain_urls: dict[str, dict[int | str, str]] = {}  # domain -> {canonical id: first URL seen}
     domain_url_titles: dict[str, dict[str, str]] = {}  # domain -> {url: title}
     providers_set: set[str] = set()
     prompts_per_provider: dict[str, set[str]] = {}
@@ -97,7 +100,8 @@ def aggregate(
                 domain_providers.setdefault(domain, set()).add(provider)
                 url = c.get("url", "")
                 if url:
-                    domain_urls.setdefault(domain, set()).add(url)
+                    key = c.get("canonical_url_id") or canonicalize_url(url)
+                    url = domain_urls.setdefault(domain, {}).setdefault(key, url)
                     # Keep LLM-provided titles (from markdown links)
                     title = c.get("title", "")
                     if title:
@@ -198,7 +202,7 @@ def aggregate(
     top_domains = sorted(domain_counts.items(), key=lambda x: x[1], reverse=True)[:50]
     top_cited = []
     for d, c in top_domains:
-        all_urls = list(domain_urls.get(d, set()))
+        all_urls = list(domain_urls.get(d, {}).values())
         # Prefer article URLs (with meaningful path) over homepage URLs
         article_urls = sorted(u for u in all_urls if _has_article_path(u))
         homepage_urls = sorted(u for u in all_urls if not _has_article_path(u))
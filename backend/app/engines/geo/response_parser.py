@@ -4,6 +4,8 @@ import re
 from dataclasses import dataclass, field
 from urllib.parse import urlparse
 
+from app.utils.urls import canonicalize_url
+
 
 @dataclass
 class ParsedMention:
@@ -159,15 +161,22 @@ def parse_response(
             ParsedCitation(url=url, domain=_extract_domain(url), title=title)
         )
 
-    # 3. Bare URLs (skip duplicates from markdown links)
-    existing_urls = {c.url for c in result.citations}
+    # 3. Bare URLs
     for url_match in _URL_RE.finditer(text):
         url = url_match.group(0).rstrip(".")
-        if url not in existing_urls:
-            result.citations.append(
-                ParsedCitation(url=url, domain=_extract_domain(url))
-            )
-            existing_urls.add(url)
+        result.citations.append(
+            ParsedCitation(url=url, domain=_extract_domain(url))
+        )
+
+    # One citation per canonical URL (http/www/tracking/fragment variants of
+    # a page are the same source); the first keeps its place, a later
+    # markdown link can still supply the title
+    unique_citations: dict[str, ParsedCitation] = {}
+    for c in result.citations:
+        first = unique_citations.setdefault(canonicalize_url(c.url), c)
+        if first is not c and not first.title and c.title:
+            first.title = c.title
+    result.citations = list(unique_citations.values())
 
     # Assign positions to citations that don't have one
     for idx, c in enumerate(result.citations):
@@ -0,0 +1 @@
+"""Influencer discovery: shared creator profiles and enrichment."""
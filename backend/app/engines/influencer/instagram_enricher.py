@@ -0,0 +1,153 @@
+"""Polite, concurrent Instagram profile scraping (og:description meta tag).
+
+One shared HTTP client (HTTP/2 when the optional ``h2`` package is
+installed), a few requests in flight at once and a token bucket for
+instagram.com instead of fixed sleeps. 429s and redirects to the login
+page halve the request rate; after several in a row the remaining handles
+are skipped rather than pushing further into a block. Only the ``<head>``
+of each page is read — the og:description tag sits there, the rest of the
+page is hundreds of KB of scripts.
+"""
+
+import asyncio
+import html
+import re
+import time
+
+import httpx
+
+from app.config import settings
+
+_HEADERS = {
+    # Use a realistic browser User-Agent to reduce block rate
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "es-ES,es;q=0.9",
+}
+
+_OG_DESCRIPTION = (
+    re.compile(r'<meta\s+property="og:description"\s+content="([^"]*)"'),
+    re.compile(r'<meta\s+content="([^"]*)"\s+property="og:description"'),
+)
+
+# Stop reading a page after this much even if </head> hasn't shown up
+_MAX_HEAD_BYTES = 256 * 1024
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+class Blocked(Exception):
+    """Instagram answered with 429 or sent us to the login page."""
+
+
+class _TokenBucket:
+    """Async token bucket whose rate can be lowered and restored at runtime."""
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def take(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def slow_down(self) -> None:
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+        self._tokens = 0.0
+
+    def speed_up(self) -> None:
+        self.rate = min(self.max_rate, self.rate * 1.25)
+
+
+class InstagramEnricher:
+    """Fetch og:description for many handles with bounded concurrency."""
+
+    def __init__(
+        self,
+        *,
+        concurrency: int | None = None,
+        rate_per_sec: float | None = None,
+        max_handles: int | None = None,
+        max_blocks: int = 3,
+    ):
+        self.concurrency = concurrency or settings.instagram_enrich_concurrency
+        self.max_handles = max_handles or settings.instagram_enrich_max_handles
+        self.max_blocks = max_blocks
+        self._bucket = _TokenBucket(rate_per_sec or settings.instagram_enrich_rps, burst=self.concurrency)
+        self._blocks = 0  # consecutive
+
+    async def fetch_descriptions(self, handles: list[str]) -> dict[str, str]:
+        """Return {lowercase handle: og:description} for the handles that could be read."""
+        handles = list(dict.fromkeys(h.lstrip("@").lower() for h in handles if h))[: self.max_handles]
+        result: dict[str, str] = {}
+        if not handles:
+            return result
+
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for h in handles:
+            queue.put_nowait(h)
+
+        async with httpx.AsyncClient(
+            timeout=10.0, headers=_HEADERS, follow_redirects=True, http2=_HTTP2,
+            limits=httpx.Limits(max_connections=self.concurrency),
+        ) as client:
+
+            async def worker() -> None:
+                while not queue.empty() and self._blocks < self.max_blocks:
+                    h = queue.get_nowait()
+                    await self._bucket.take()
+                    try:
+                        content = await self._fetch_one(client, h)
+                    except Blocked:
+                        self._blocks += 1
+                        self._bucket.slow_down()
+                        print(f"[instagram] blocked on @{h} (rate now {self._bucket.rate:.2f}/s)")
+                        continue
+                    except Exception:
+                        continue
+                    self._blocks = 0
+                    self._bucket.speed_up()
+                    if content:
+                        result[h] = content
+
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(handles)))))
+
+        if self._blocks >= self.max_blocks:
+            print(f"[instagram] stopped after {self.max_blocks} consecutive blocks; "
+                  f"{queue.qsize()} handles skipped")
+        return result
+
+    async def _fetch_one(self, client: httpx.AsyncClient, handle: str) -> str | None:
+        async with client.stream("GET", f"https://www.instagram.com/{handle}/") as resp:
+            if resp.status_code == 429 or resp.url.path.startswith("/accounts/login"):
+                raise Blocked(handle)
+            if resp.status_code != 200:
+                return None
+            head = ""
+            async for chunk in resp.aiter_text():
+                head += chunk
+                if "</head>" in head or len(head) > _MAX_HEAD_BYTES:
+                    break
+        for pattern in _OG_DESCRIPTION:
+            m = pattern.search(head)
+            if m:
+                return html.unescape(m.group(1))
+        return None
@@ -0,0 +1,80 @@
+"""Language heuristics for creator profiles.
+
+Lightweight marker-word scoring (no langdetect): Portuguese and English
+markers that don't occur in Spanish vs. Spanish markers. Markers written
+with surrounding spaces (" the ") are whole words and are looked up in a
+hashed token table built from one ``split`` per text; the rest are
+substring markers ("inscreva", "subscribe") matched against the text, but
+only after a single precompiled regex says at least one of them occurs.
+Scores are memoised per text, since the same titles and descriptions come
+back from several queries and platforms in one job.
+"""
+
+import re
+from functools import lru_cache
+
+_LANGS = ("pt", "en", "es")
+
+_MARKERS = {
+    # Strong Portuguese markers (words that don't appear in Spanish)
+    "pt": [
+        "você", "vocês", "estou", "estão", "também", "porque", "então",
+        "nosso", "nossa", "muito", "obrigado", "obrigada", "já", "ainda",
+        "canal", "vídeo", "inscreva", "inscreva-se", "siga-nos",
+        " em ", " para ", " com ", " como ", " mas ", " por ", " sem ",
+    ],
+    # Strong English markers
+    "en": [
+        " the ", " and ", " with ", " for ", " this ", " from ", " that ",
+        " have ", " will ", " about ", " your ", " our ", "subscribe",
+        "unboxing", "review", "tutorial",
+    ],
+    # Spanish markers (to confirm it IS Spanish, reduce false positives)
+    "es": [
+        " el ", " la ", " los ", " las ", " en ", " con ", " por ",
+        " que ", " de ", " del ", " un ", " una ", " es ",
+        "español", "españa", "canal", "suscríbete", "sígueme",
+    ],
+}
+
+# " the " → word "the"; everything else stays a substring marker
+_WORDS = {
+    lang: frozenset(m.strip() for m in markers if m.startswith(" ") and m.endswith(" "))
+    for lang, markers in _MARKERS.items()
+}
+_SUBSTRINGS = {
+    lang: tuple(m for m in markers if not (m.startswith(" ") and m.endswith(" ")))
+    for lang, markers in _MARKERS.items()
+}
+_ANY_SUBSTRING = re.compile(
+    "|".join(re.escape(m) for m in sorted({m for ms in _SUBSTRINGS.values() for m in ms}, key=len, reverse=True))
+)
+
+
+@lru_cache(maxsize=8192)
+def marker_scores(text: str) -> tuple[int, int, int]:
+    """(pt, en, es) marker counts for *text* (lowercased by the caller)."""
+    # " word " occurs in the text exactly when "word" is a token of
+    # text.split(" ") with a token on each side
+    words = set(text.split(" ")[1:-1])
+    has_substring = _ANY_SUBSTRING.search(text) is not None
+    return tuple(
+        len(_WORDS[lang] & words)
+        + (sum(1 for m in _SUBSTRINGS[lang] if m in text) if has_substring else 0)
+        for lang in _LANGS
+    )
+
+
+def is_non_spanish(text: str) -> bool:
+    """Return True if text appears to be in a non-Spanish language (e.g. Portuguese, English)."""
+    if not text:
+        return False
+    pt_score, en_score, es_score = marker_scores(text.lower())
+
+    # If clearly Portuguese or English AND not clearly Spanish → reject
+    return (pt_score >= 2 or en_score >= 3) and es_score <= 1
+
+
+def non_spanish_many(texts: list[str | None]) -> list[bool]:
+    """is_non_spanish for a batch of candidate texts, in order."""
+    return [is_non_spanish(t or "") for t in texts]
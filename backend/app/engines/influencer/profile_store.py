@@ -0,0 +1,73 @@
+"""Global influencer profile store, keyed by platform + channel_id/handle.
+
+Follower counts change slowly and many niches share creators, so YouTube
+channel stats and Instagram follower counts are kept across projects and
+only refetched once older than settings.influencer_profile_ttl_hours.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.compat import upsert_insert
+from app.models.influencer import InfluencerProfile
+
+_UPDATABLE = ("handle", "title", "description", "followers", "is_spanish", "extra")
+
+
+def profile_key(platform: str, value: str) -> str:
+    """Normalise a channel_id (YouTube) or handle (Instagram) into a store key."""
+    if platform == "instagram":
+        return value.lstrip("@").lower()
+    return value
+
+
+async def get_fresh_profiles(
+    session: AsyncSession, platform: str, keys: list[str],
+) -> dict[str, InfluencerProfile]:
+    """Profiles fetched within the TTL, by key; stale or unknown keys are absent."""
+    if not keys:
+        return {}
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.influencer_profile_ttl_hours)
+    result = await session.execute(
+        select(InfluencerProfile).where(
+            InfluencerProfile.platform == platform,
+            InfluencerProfile.key.in_(set(keys)),
+            InfluencerProfile.fetched_at >= cutoff,
+        )
+    )
+    return {p.key: p for p in result.scalars().all()}
+
+
+async def save_profiles(session: AsyncSession, platform: str, profiles: list[dict]) -> None:
+    """Insert or refresh profiles ({"key", "followers"?, "title"?, ...}) and commit.
+
+    Uses INSERT .. ON CONFLICT so concurrent discovery tasks saving the same
+    creator don't collide on the unique (platform, key) index.
+    """
+    if not profiles:
+        return
+    # Only overwrite the fields this source provides (meta-tag scraping
+    # knows followers, not the title)
+    cols = [c for c in _UPDATABLE if any(c in p for p in profiles)]
+    now = datetime.now(timezone.utc)
+    rows = {
+        p["key"]: {
+            "id": uuid.uuid4(),
+            "platform": platform,
+            "key": p["key"],
+            **{col: p.get(col) for col in cols},
+            "fetched_at": now,
+        }
+        for p in profiles
+    }
+    stmt = upsert_insert(InfluencerProfile, session).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["platform", "key"],
+        set_={col: stmt.excluded[col] for col in (*cols, "fetched_at")},
+    )
+    await session.execute(stmt)
+    await session.commit()
@@ -0,0 +1,258 @@
+"""YouTube Data API v3 client for influencer discovery.
+
+One connection pool per job. ``search.list`` runs once per query (100
+units each); the channel ids found by all queries are then merged and
+looked up with ``channels.list`` in batches of 50 ids (1 unit per call),
+skipping channels with a fresh entry in the shared profile store.
+
+Units are counted in a daily ledger (app.utils.rate_limiter.take_daily:
+Redis when redis_url is set, else the daily_quota_usage table). Searches must leave
+``youtube_quota_reserve`` units free, so the cheap channels.list calls of
+a job that already searched never hit the limit; when the searches don't
+fit, QuotaExhausted is raised before any call and the caller falls back
+to SearchAPI/SERP.
+"""
+
+import asyncio
+
+import httpx
+
+import app.database as _db
+from app.config import settings
+from app.engines.influencer.language import non_spanish_many
+from app.engines.influencer.profile_store import get_fresh_profiles, save_profiles
+from app.utils import rate_limiter
+
+_API = "https://www.googleapis.com/youtube/v3"
+_QUOTA_TZ = "America/Los_Angeles"  # quota resets at midnight Pacific time
+SEARCH_COST = 100
+CHANNELS_COST = 1
+CHANNELS_BATCH = 50  # max ids per channels.list call
+
+# Music topic IDs — channels with exclusively these topics are auto-generated artists
+MUSIC_TOPIC_IDS = {
+    "/m/04rlf", "/m/02mscn", "/m/0ggq0m", "/m/01lyv", "/m/02lkt",
+    "/m/0glt670", "/m/05rwpb", "/m/03_d0", "/m/028sqc", "/m/0g293",
+    "/m/064t9", "/m/06j6l", "/m/06by7", "/m/0gywn",
+}
+
+# Brand channels say "somos", "nuestros servicios", etc. while
+# creator channels say "mi canal", "te enseño", "soy", etc.
+_CORPORATE_PHRASES = [
+    "nuestros servicios", "nuestra plataforma", "nuestros clientes",
+    "te ayudamos", "somos una empresa", "somos un equipo",
+    "descubre nuestro", "conoce nuestros", "ofrecemos",
+    "nuestros productos", "nuestra app", "nuestra aplicación",
+    "our services", "our platform", "our clients",
+    # Financial brand patterns (e.g. MyInvestor)
+    "miles de clientes", "abre tu cuenta", "tu banca",
+    "tu cuenta corriente", "únete a los", "gestión automatizada",
+    "pon tu dinero a trabajar", "gestora de fondos",
+    "nuestras tarifas", "nuestra app de inversión",
+]
+_CREATOR_PHRASES = [
+    "mi canal", "soy ", "en este canal", "te enseño", "comparto",
+    "mis videos", "mis análisis", "mi experiencia", "sígueme",
+    "me llamo", "suscríbete",
+]
+
+
+class QuotaExhausted(Exception):
+    """The daily YouTube Data API quota can't cover the requested calls."""
+
+
+async def quota_used(session_factory=None) -> int:
+    """Units spent today according to the ledger."""
+    return await rate_limiter.daily_used("youtube", tz=_QUOTA_TZ, session_factory=session_factory)
+
+
+class YouTubeClient:
+    """Use as ``async with YouTubeClient(api_key) as yt:``."""
+
+    def __init__(self, api_key: str, session_factory=None):
+        self.api_key = api_key
+        self.session_factory = session_factory or _db.async_session
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "YouTubeClient":
+        self._client = httpx.AsyncClient(timeout=15.0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+
+    async def _spend(self, units: int, *, reserve: int = 0) -> None:
+        limit = settings.youtube_daily_quota - reserve
+        if not await rate_limiter.take_daily(
+            "youtube", limit, cost=units, tz=_QUOTA_TZ, session_factory=self.session_factory,
+        ):
+            raise QuotaExhausted(
+                f"YouTube quota: {units} units needed, "
+                f"{await quota_used(self.session_factory)}/{limit} used today"
+            )
+
+    async def _get(self, endpoint: str, params: dict) -> dict:
+        await rate_limiter.acquire("youtube")
+        resp = await self._client.get(f"{_API}/{endpoint}", params={**params, "key": self.api_key})
+        resp.raise_for_status()
+        return resp.json()
+
+    async def search_channels(self, queries: list[str]) -> list[tuple[str, list[dict]]]:
+        """search.list (type=channel) for every query, concurrently.
+
+        The units for all queries are reserved up front, so either every
+        search runs or QuotaExhausted is raised. Failed queries are skipped.
+        Returns (query, search items) in query order.
+        """
+        await self._spend(SEARCH_COST * len(queries), reserve=settings.youtube_quota_reserve)
+
+        async def _search(q: str) -> list[dict]:
+            data = await self._get("search", {
+                "part": "snippet",
+                "q": q,
+                "type": "channel",
+                "maxResults": 50,          # always fetch max to sort by audience
+                "relevanceLanguage": "es",  # no regionCode — include all Spanish-language channels
+            })
+            return data.get("items", [])
+
+        batches = await asyncio.gather(*(_search(q) for q in queries), return_exceptions=True)
+        out = []
+        for q, batch in zip(queries, batches):
+            if isinstance(batch, Exception):
+                print(f"[youtube] search failed for '{q}': {batch}")
+                continue
+            out.append((q, batch))
+        return out
+
+    async def channel_details(self, channel_ids: list[str]) -> dict[str, dict]:
+        """Title, description, subscribers, handle and topic_ids per channel id.
+
+        Fresh profiles come from the store; the rest are fetched with
+        channels.list in batches of 50 and saved back.
+        """
+        channel_ids = list(dict.fromkeys(channel_ids))
+        details: dict[str, dict] = {}
+        async with self.session_factory() as session:
+            for cid, p in (await get_fresh_profiles(session, "youtube", channel_ids)).items():
+                details[cid] = {
+                    "title": p.title or "",
+                    "description": p.description or "",
+                    "subscribers": p.followers,
+                    "handle": p.handle,
+                    "topic_ids": set((p.extra or {}).get("topic_ids", [])),
+                }
+
+        missing = [cid for cid in channel_ids if cid not in details]
+        batches = [missing[i:i + CHANNELS_BATCH] for i in range(0, len(missing), CHANNELS_BATCH)]
+        if not batches:
+            return details
+        await self._spend(CHANNELS_COST * len(batches))
+
+        async def _fetch(ids: list[str]) -> list[dict]:
+            data = await self._get("channels", {
+                "part": "statistics,snippet,topicDetails",
+                "id": ",".join(ids),
+            })
+            return data.get("items", [])
+
+        results = await asyncio.gather(*(_fetch(ids) for ids in batches), return_exceptions=True)
+        fetched_ids: list[str] = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"[youtube] channels.list failed: {result}")
+                continue
+            for item in result:
+                cid = item["id"]
+                snippet = item.get("snippet", {})
+                subs = item.get("statistics", {}).get("subscriberCount")
+                # customUrl comes as "@channelname" — store without leading @ so the
+                # frontend can render "@{handle}" without double-@
+                handle = (snippet.get("customUrl") or "").lstrip("@") or None
+                details[cid] = {
+                    "title": snippet.get("title", ""),
+                    "description": snippet.get("description", ""),
+                    "subscribers": int(subs) if subs else None,
+                    "handle": handle,
+                    "topic_ids": set(item.get("topicDetails", {}).get("topicIds", [])),
+                }
+                fetched_ids.append(cid)
+
+        verdicts = non_spanish_many(
+            [f"{details[cid]['title']} {details[cid]['description']}" for cid in fetched_ids]
+        )
+        fetched = [
+            {"key": cid, **_profile_fields(details[cid]), "is_spanish": not non_spanish}
+            for cid, non_spanish in zip(fetched_ids, verdicts)
+        ]
+
+        async with self.session_factory() as session:
+            await save_profiles(session, "youtube", fetched)
+        return details
+
+
+def _profile_fields(d: dict) -> dict:
+    return {
+        "handle": d["handle"],
+        "title": d["title"],
+        "description": d["description"],
+        "followers": d["subscribers"],
+        "extra": {"topic_ids": sorted(d["topic_ids"])},
+    }
+
+
+def is_creator_channel(d: dict) -> bool:
+    """False for auto-generated music/topic channels and corporate brand channels."""
+    title, description, topic_ids = d["title"], d["description"], d["topic_ids"]
+
+    # Skip auto-generated music/topic channels
+    if title.endswith("- Topic"):
+        return False
+    if "Auto-generated by YouTube" in description:
+        return False
+    if topic_ids and topic_ids.issubset(MUSIC_TOPIC_IDS):
+        return False
+
+    # Skip corporate brand channels — detect by description content.
+    desc_lc = description.lower()[:600]
+    corp_score = sum(1 for p in _CORPORATE_PHRASES if p in desc_lc)
+    creator_score = sum(1 for p in _CREATOR_PHRASES if p in desc_lc)
+    # Also flag if the brand name appears in the first sentence of description
+    # (brand channels promote themselves: "Bienvenido a MyInvestor...")
+    title_first_word = title.lower().split()[0] if title else ""
+    if (len(title_first_word) > 4 and
+            title_first_word in desc_lc[:150] and
+            creator_score == 0):
+        corp_score += 2
+    return not (corp_score >= 2 and creator_score == 0)
+
+
+def build_channels(items: list[dict], details: dict[str, dict]) -> list[dict]:
+    """Turn search items into {channel_id, title, description, profile_url, handle, subscribers}.
+
+    Keeps YouTube's relevance ordering — it already ranks most relevant
+    channels first (sorting by subscribers would push large off-topic
+    channels to the top).
+    """
+    results = []
+    for item in items:
+        channel_id = item.get("id", {}).get("channelId")
+        d = details.get(channel_id) if channel_id else None
+        if d is None or not is_creator_channel(d):
+            continue
+        snippet = item.get("snippet", {})
+        handle = d["handle"]  # stored without leading @
+        profile_url = (
+            f"https://www.youtube.com/@{handle}"
+            if handle
+            else f"https://www.youtube.com/channel/{channel_id}"
+        )
+        results.append({
+            "channel_id": channel_id,
+            "title": d["title"] or snippet.get("title", ""),
+            "description": d["description"] or snippet.get("description", ""),
+            "profile_url": profile_url,
+            "handle": handle,
+            "subscribers": d["subscribers"],
+        })
+    return results
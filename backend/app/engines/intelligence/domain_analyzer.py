@@ -9,10 +9,9 @@ import json
 import logging
 from dataclasses import dataclass
 
-import httpx
-from bs4 import BeautifulSoup
-
 from app.engines.geo.openrouter_adapter import OpenRouterAdapter
+from app.utils import cache
+from app.utils.llm_cache import memoize_llm
 
 logger = logging.getLogger(__name__)
 
@@ -49,50 +48,10 @@ class DomainAnalysis:
 
 
 async def _fetch_page_text(url: str) -> str:
-    """Fetch a URL and extract readable text from HTML."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml",
-        "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-    }
-
-    async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    # Remove noise elements
-    for tag in soup(["script", "style", "nav", "footer", "header", "noscript", "svg", "iframe"]):
-        tag.decompose()
-
-    # Extract structured pieces
-    parts: list[str] = []
-
-    # Title
-    title_tag = soup.find("title")
-    if title_tag and title_tag.string:
-        parts.append(f"Título: {title_tag.string.strip()}")
-
-    # Meta description
-    meta = soup.find("meta", attrs={"name": "description"})
-    if meta and meta.get("content"):
-        parts.append(f"Descripción: {meta['content'].strip()}")
-
-    # H1 headings
-    for h1 in soup.find_all("h1")[:3]:
-        text = h1.get_text(strip=True)
-        if text:
-            parts.append(f"H1: {text}")
-
-    # Body text (first 3000 chars)
-    body_text = soup.get_text(separator=" ", strip=True)
-    # Collapse whitespace
-    body_text = " ".join(body_text.split())
-    if body_text:
-        parts.append(f"Contenido: {body_text[:3000]}")
+    """Fetch a URL and extract readable text from HTML (cached on disk, see app.utils.page_fetch)."""
+    from app.utils.page_fetch import fetch_page_text
 
-    return "\n\n".join(parts)
+    return (await fetch_page_text(url)).render()
 
 
 _KNOWLEDGE_PROMPT = """\
@@ -115,6 +74,12 @@ Responde siempre en español.
 """
 
 
+@memoize_llm(
+    ttl=cache.SERP_TTL,
+    model=_EXTRACTION_MODEL,
+    result_type=DomainAnalysis,
+    cache_if=lambda r: bool(r.company_type or r.services or r.summary),
+)
 async def analyze_domain(url: str) -> DomainAnalysis:
     """Scrape a domain and extract business intelligence via LLM.
     Falls back to LLM knowledge if scraping fails (e.g. 403 Forbidden).
@@ -4,9 +4,10 @@ A "gap" = a URL/domain where competitors appear but the client does not.
 Sources: LLM citations (GEO) + SERP results (SEO).
 """
 
-import uuid
 from dataclasses import dataclass, field
 
+from app.utils.urls import canonicalize_url
+
 
 @dataclass
 class GapOpportunity:
@@ -23,6 +24,7 @@ class GapOpportunity:
     opportunity_score: float  # 0-100
     keyword: str | None  # SERP keyword (if from SEO)
     niche: str | None  # niche category
+    canonical_url_id: int | None = None  # canonical_urls.id
 
 
 @dataclass
@@ -34,6 +36,208 @@ class GapAnalysisResult:
     opportunities: list[GapOpportunity] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class _GapLookups:
+    """Lowercased lookup sets shared by every niche, built once per call."""
+
+    client_names: frozenset[str]
+    client_domains: frozenset[str]
+    excluded: frozenset[str]
+
+
+def _build_lookups(
+    client_brand_names: list[str],
+    client_domains: list[str],
+    excluded_domains: set[str] | None,
+) -> _GapLookups:
+    return _GapLookups(
+        client_names=frozenset(n.lower() for n in client_brand_names),
+        client_domains=frozenset(d.lower() for d in client_domains),
+        excluded=frozenset(excluded_domains or ()),
+    )
+
+
+class _GapColumns:
+    """Columnar intermediate form: one slot per unique URL.
+
+    URLs are interned to integer ids (their slot index) by canonical URL
+    id (canonicalize_url() for rows without one), so http/www/tracking
+    variants of a page share a slot. Competitor brands are interned to ids
+    from a table shared across niches, so the per-row work
+    is a couple of dict lookups and list writes instead of rebuilding
+    sets and dicts for every citation / SERP row.
+    """
+
+    def __init__(
+        self,
+        lookups: _GapLookups,
+        competitor_names: frozenset[str],
+        brand_ids: dict[str, int],
+        brand_names: list[str],
+    ):
+        self.lookups = lookups
+        self.competitor_names = competitor_names
+        self.brand_ids = brand_ids
+        self.brand_names = brand_names
+
+        self.url_ids: dict[int | str, int] = {}
+        self.urls: list[str] = []
+        self.canonical_ids: list[int | None] = []
+        self.domains: list[str] = []
+        self.competitors: list[set[int]] = []
+        self.client_present: list[bool] = []
+        self.found_in_geo: list[bool] = []
+        self.found_in_serp: list[bool] = []
+        self.content_type: list[str | None] = []
+        self.domain_type: list[str | None] = []
+        self.keyword: list[str | None] = []
+        self.niche: list[str | None] = []
+
+    def _new_slot(
+        self,
+        key: int | str,
+        url: str,
+        canonical_id: int | None,
+        domain: str,
+        *,
+        client_present: bool,
+        content_type: str | None,
+        domain_type: str | None,
+        keyword: str | None,
+        niche: str | None,
+    ) -> int:
+        idx = len(self.urls)
+        self.url_ids[key] = idx
+        self.urls.append(url)
+        self.canonical_ids.append(canonical_id)
+        self.domains.append(domain)
+        self.competitors.append(set())
+        self.client_present.append(client_present)
+        self.found_in_geo.append(False)
+        self.found_in_serp.append(False)
+        self.content_type.append(content_type)
+        self.domain_type.append(domain_type)
+        self.keyword.append(keyword)
+        self.niche.append(niche)
+        return idx
+
+    def _brand_id(self, brand: str) -> int:
+        bid = self.brand_ids.get(brand)
+        if bid is None:
+            bid = len(self.brand_names)
+            self.brand_ids[brand] = bid
+            self.brand_names.append(brand)
+        return bid
+
+    def add_citation(self, c: dict) -> None:
+        url = c.get("url", "")
+        domain = c.get("domain", "")
+        if not url or domain in self.lookups.excluded:
+            return
+
+        canonical_id = c.get("canonical_url_id")
+        key = canonical_id or canonicalize_url(url)
+        idx = self.url_ids.get(key)
+        if idx is None:
+            idx = self._new_slot(
+                key, url, canonical_id, domain,
+                client_present=False,
+                content_type=None,
+                domain_type=c.get("domain_type"),
+                keyword=None,
+                niche=None,
+            )
+        self.found_in_geo[idx] = True
+
+        brand = c.get("brand_name", "")
+        if brand:
+            brand_lower = brand.lower()
+            if brand_lower in self.lookups.client_names:
+                self.client_present[idx] = True
+            elif brand_lower in self.competitor_names:
+                self.competitors[idx].add(self._brand_id(brand))
+
+    def add_serp(self, s: dict) -> None:
+        url = s.get("url", "")
+        domain = s.get("domain", "")
+        if not url or domain in self.lookups.excluded:
+            return
+
+        is_client_domain = domain in self.lookups.client_domains
+
+        canonical_id = s.get("canonical_url_id")
+        key = canonical_id or canonicalize_url(url)
+        idx = self.url_ids.get(key)
+        if idx is None:
+            idx = self._new_slot(
+                key, url, canonical_id, domain,
+                client_present=is_client_domain,
+                content_type=s.get("content_type"),
+                domain_type=s.get("domain_type"),
+                keyword=s.get("keyword"),
+                niche=s.get("niche"),
+            )
+        elif is_client_domain:
+            self.client_present[idx] = True
+
+        self.found_in_serp[idx] = True
+        if s.get("content_type"):
+            self.content_type[idx] = s["content_type"]
+        if s.get("keyword"):
+            self.keyword[idx] = s["keyword"]
+        if s.get("niche"):
+            self.niche[idx] = s["niche"]
+        if s.get("domain_type"):
+            self.domain_type[idx] = s["domain_type"]
+
+    def to_result(self) -> GapAnalysisResult:
+        """Build scored opportunities (competitors present, client absent)."""
+        opportunities: list[GapOpportunity] = []
+        client_domains = self.lookups.client_domains
+        brand_names = self.brand_names
+
+        for idx, url in enumerate(self.urls):
+            # Skip client-owned pages
+            if self.domains[idx] in client_domains:
+                continue
+            competitors = self.competitors[idx]
+            if not competitors or self.client_present[idx]:
+                continue
+
+            score = _score_opportunity({
+                "competitors": competitors,
+                "found_in_geo": self.found_in_geo[idx],
+                "found_in_serp": self.found_in_serp[idx],
+                "content_type": self.content_type[idx],
+                "domain_type": self.domain_type[idx],
+            })
+            opportunities.append(
+                GapOpportunity(
+                    url=url,
+                    domain=self.domains[idx],
+                    competitor_brands=sorted(brand_names[b] for b in competitors),
+                    client_present=False,
+                    found_in_geo=self.found_in_geo[idx],
+                    found_in_serp=self.found_in_serp[idx],
+                    content_type=self.content_type[idx],
+                    domain_type=self.domain_type[idx],
+                    opportunity_score=score,
+                    keyword=self.keyword[idx],
+                    niche=self.niche[idx],
+                    canonical_url_id=self.canonical_ids[idx],
+                )
+            )
+
+        # Sort by opportunity score desc
+        opportunities.sort(key=lambda o: o.opportunity_score, reverse=True)
+
+        return GapAnalysisResult(
+            total_urls_analyzed=len(self.urls),
+            gaps_found=len(opportunities),
+            opportunities=opportunities,
+        )
+
+
 def analyze_gaps(
     *,
     geo_citations: list[dict],
@@ -49,6 +253,8 @@ def analyze_gaps(
         geo_citations: List of dicts with keys: url, domain, brand_name (if matched)
         serp_results: List of dicts with keys: url, domain, title, position, keyword, niche,
                       content_type, domain_type
+        Both may carry canonical_url_id; give it to all rows or none, since
+        rows with and without one don't share a slot.
         client_brand_names: Brand names for the client
         competitor_brand_names: Brand names for competitors
         client_domains: Domains owned by the client
@@ -57,113 +263,70 @@ def analyze_gaps(
     Returns:
         GapAnalysisResult with scored opportunities.
     """
-    excluded = excluded_domains or set()
-
-    # Build a map of all URLs/domains with who appears there
-    url_map: dict[str, dict] = {}  # url -> metadata
-
-    # Process GEO citations
+    lookups = _build_lookups(client_brand_names, client_domains, excluded_domains)
+    columns = _GapColumns(
+        lookups,
+        frozenset(n.lower() for n in competitor_brand_names),
+        brand_ids={},
+        brand_names=[],
+    )
     for c in geo_citations:
-        url = c.get("url", "")
-        domain = c.get("domain", "")
-        if not url or domain in excluded:
-            continue
-
-        if url not in url_map:
-            url_map[url] = {
-                "domain": domain,
-                "competitors": set(),
-                "client_present": False,
-                "found_in_geo": False,
-                "found_in_serp": False,
-                "content_type": None,
-                "domain_type": c.get("domain_type"),
-                "keyword": None,
-                "niche": None,
-            }
-
-        url_map[url]["found_in_geo"] = True
-
-        brand = c.get("brand_name", "")
-        if brand:
-            if brand.lower() in {n.lower() for n in client_brand_names}:
-                url_map[url]["client_present"] = True
-            elif brand.lower() in {n.lower() for n in competitor_brand_names}:
-                url_map[url]["competitors"].add(brand)
-
-    # Process SERP results
+        columns.add_citation(c)
     for s in serp_results:
-        url = s.get("url", "")
-        domain = s.get("domain", "")
-        if not url or domain in excluded:
-            continue
-
-        # Check if this domain belongs to client
-        is_client_domain = domain in {d.lower() for d in client_domains}
-
-        if url not in url_map:
-            url_map[url] = {
-                "domain": domain,
-                "competitors": set(),
-                "client_present": is_client_domain,
-                "found_in_geo": False,
-                "found_in_serp": False,
-                "content_type": s.get("content_type"),
-                "domain_type": s.get("domain_type"),
-                "keyword": s.get("keyword"),
-                "niche": s.get("niche"),
-            }
-        else:
-            if is_client_domain:
-                url_map[url]["client_present"] = True
+        columns.add_serp(s)
+    return columns.to_result()
 
-        url_map[url]["found_in_serp"] = True
-        if s.get("content_type"):
-            url_map[url]["content_type"] = s["content_type"]
-        if s.get("keyword"):
-            url_map[url]["keyword"] = s["keyword"]
-        if s.get("niche"):
-            url_map[url]["niche"] = s["niche"]
-        if s.get("domain_type"):
-            url_map[url]["domain_type"] = s["domain_type"]
 
-    # Build gap opportunities (where competitors appear but client doesn't)
-    opportunities: list[GapOpportunity] = []
+def analyze_gaps_many(
+    *,
+    geo_citations: list[dict],
+    serp_results: list[dict],
+    client_brand_names: list[str],
+    competitor_brand_names_by_niche: dict[str | None, list[str]],
+    client_domains: list[str],
+    excluded_domains: set[str] | None = None,
+) -> dict[str | None, GapAnalysisResult]:
+    """Run gap analysis for every niche of a project in a single pass.
 
-    for url, data in url_map.items():
-        # Skip client-owned pages
-        if data["domain"] in {d.lower() for d in client_domains}:
-            continue
+    Client lookups and the brand id table are built once and shared.
+    SERP rows are routed to their niche by the ``niche`` key; citations
+    with a ``niche`` key go to that niche, the rest count for every niche.
+    A ``None`` key collects SERP rows without a niche. Rows for niches
+    not in ``competitor_brand_names_by_niche`` are ignored.
 
-        has_competitors = len(data["competitors"]) > 0
-        client_absent = not data["client_present"]
+    Returns:
+        Mapping niche slug -> GapAnalysisResult (same semantics as analyze_gaps).
+    """
+    lookups = _build_lookups(client_brand_names, client_domains, excluded_domains)
+    brand_ids: dict[str, int] = {}
+    brand_names: list[str] = []
+    by_niche = {
+        niche: _GapColumns(
+            lookups,
+            frozenset(n.lower() for n in names),
+            brand_ids=brand_ids,
+            brand_names=brand_names,
+        )
+        for niche, names in competitor_brand_names_by_niche.items()
+    }
+    all_columns = list(by_niche.values())
 
-        if has_competitors and client_absent:
-            score = _score_opportunity(data)
-            opportunities.append(
-                GapOpportunity(
-                    url=url,
-                    domain=data["domain"],
-                    competitor_brands=sorted(data["competitors"]),
-                    client_present=False,
-                    found_in_geo=data["found_in_geo"],
-                    found_in_serp=data["found_in_serp"],
-                    content_type=data["content_type"],
-                    domain_type=data["domain_type"],
-                    opportunity_score=score,
-                    keyword=data["keyword"],
-                    niche=data["niche"],
-                )
-            )
+    for c in geo_citations:
+        niche = c.get("niche")
+        if niche:
+            columns = by_niche.get(niche)
+            if columns is not None:
+                columns.add_citation(c)
+        else:
+            for columns in all_columns:
+                columns.add_citation(c)
 
-    # Sort by opportunity score desc
-    opportunities.sort(key=lambda o: o.opportunity_score, reverse=True)
+    for s in serp_results:
+        columns = by_niche.get(s.get("niche"))
+        if columns is not None:
+            columns.add_serp(s)
 
-    return GapAnalysisResult(
-        total_urls_analyzed=len(url_map),
-        gaps_found=len(opportunities),
-        opportunities=opportunities,
-    )
+    return {niche: columns.to_result() for niche, columns in by_niche.items()}
 
 
 def _score_opportunity(data: dict) -> float:
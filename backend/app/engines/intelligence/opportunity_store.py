@@ -0,0 +1,211 @@
+"""Persisted Key Opportunity scores, recomputed only when stale.
+
+Project.intel_version is bumped whenever a GEO run, gap analysis or SERP
+fetch completes, and when brands or the domain catalog are edited. The scored list is stored per project (KeyOpportunityScore)
+together with the version it was computed from (KeyOpportunitySnapshot), so
+the dashboard reads precomputed rows and filters/paginates in SQL.
+"""
+
+import heapq
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.engines.intelligence.aggregator import collect_domain_intelligence
+from app.engines.intelligence.key_opportunity import WEIGHTS
+from app.engines.intelligence.vectorized_scoring import combine, score_key_opportunities_vectorized
+from app.models.analysis import KeyOpportunityScore, KeyOpportunitySnapshot
+from app.models.compat import upsert_insert
+from app.models.project import Project
+
+
+async def bump_intel_version(session: AsyncSession, project_id: uuid.UUID) -> None:
+    """Invalidate stored key opportunities for a project (caller commits)."""
+    # updated_at is set to itself so onupdate doesn't mark the project edited
+    await session.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(intel_version=Project.intel_version + 1, updated_at=Project.updated_at)
+    )
+
+
+async def bump_all_intel_versions(session: AsyncSession) -> None:
+    """Invalidate every project's key opportunities (the domain catalog is global)."""
+    await session.execute(
+        update(Project).values(intel_version=Project.intel_version + 1, updated_at=Project.updated_at)
+    )
+
+
+async def ensure_key_opportunities(db: AsyncSession, project_id: uuid.UUID) -> bool:
+    """Recompute the stored scores if they are missing or stale.
+
+    A stale snapshot is rebuilt under a row lock on the project (SELECT ...
+    FOR UPDATE, held until the caller commits), re-checking the snapshot
+    once the lock is held: a concurrent request that found the same stale
+    version waits for the first rebuild instead of inserting a second copy
+    of every row.
+
+    Returns True if the scores were just recomputed, by this call or by a
+    concurrent one it waited for (the read replica may not have them yet).
+    """
+    current = await _intel_version(db, project_id)
+    if current is None:
+        return False
+    if await _snapshot_version(db, project_id) == current:
+        return False
+
+    current = await _intel_version(db, project_id, for_update=True)
+    if current is None:
+        return False
+    if await _snapshot_version(db, project_id) != current:
+        await refresh_key_opportunities(db, project_id, current)
+    return True
+
+
+async def _intel_version(db: AsyncSession, project_id: uuid.UUID, *, for_update: bool = False) -> int | None:
+    query = select(Project.intel_version).where(Project.id == project_id)
+    if for_update:
+        query = query.with_for_update()
+    return (await db.execute(query)).scalar_one_or_none()
+
+
+async def _snapshot_version(db: AsyncSession, project_id: uuid.UUID) -> int | None:
+    return (await db.execute(
+        select(KeyOpportunitySnapshot.version)
+        .where(KeyOpportunitySnapshot.project_id == project_id)
+    )).scalar_one_or_none()
+
+
+async def refresh_key_opportunities(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    version: int,
+) -> int:
+    """Collect, score and store key opportunities for a project.
+
+    Replaces the stored rows, so callers serialize on the project row lock
+    (see ensure_key_opportunities). Returns the number of stored
+    opportunities. The caller commits.
+    """
+    domain_intel = await collect_domain_intelligence(db, project_id)
+    opportunities = score_key_opportunities_vectorized(domain_intel)
+
+    await db.execute(
+        delete(KeyOpportunityScore).where(KeyOpportunityScore.project_id == project_id)
+    )
+    if opportunities:
+        await db.execute(
+            insert(KeyOpportunityScore),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "project_id": project_id,
+                    "version": version,
+                    "rank": rank,
+                    **asdict(o),
+                }
+                for rank, o in enumerate(opportunities)
+            ],
+        )
+
+    values = {
+        "version": version,
+        "total": len(opportunities),
+        "computed_at": datetime.now(timezone.utc),
+    }
+    await db.execute(
+        upsert_insert(KeyOpportunitySnapshot.__table__, db)
+        .values(project_id=project_id, **values)
+        .on_conflict_do_update(index_elements=["project_id"], set_=values)
+    )
+
+    return len(opportunities)
+
+
+async def rerank_key_opportunities(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    *,
+    weights: dict[str, float] | None = None,
+    critical_threshold: float = 70,
+    high_threshold: float = 50,
+    medium_threshold: float = 30,
+    min_score: float = 0,
+    priority: str | None = None,
+    limit: int = 50,
+) -> list[tuple[KeyOpportunityScore, float, str]]:
+    """What-if ranking from the stored per-dimension scores.
+
+    Only the five dimension columns are loaded; the weighted score and
+    priority are recomputed in batch and the top ``limit`` rows picked
+    with a bounded heap. Intelligence is never re-collected unless the
+    project has no stored scores at all.
+
+    Returns:
+        List of (stored row, what-if score, what-if priority), best first.
+    """
+    w = {**WEIGHTS, **(weights or {})}
+
+    if await _snapshot_version(db, project_id) is None:
+        await ensure_key_opportunities(db, project_id)
+
+    rows = (await db.execute(
+        select(
+            KeyOpportunityScore.id,
+            KeyOpportunityScore.seo_score,
+            KeyOpportunityScore.geo_score,
+            KeyOpportunityScore.backlink_score,
+            KeyOpportunityScore.content_gap_score,
+            KeyOpportunityScore.competitive_density,
+            KeyOpportunityScore.estimated_20x_potential,
+        )
+        .where(KeyOpportunityScore.project_id == project_id)
+        .order_by(KeyOpportunityScore.rank)
+    )).all()
+    if not rows or limit <= 0:
+        return []
+
+    ids = [r[0] for r in rows]
+    dims = {
+        "seo": np.array([r[1] for r in rows], dtype=float),
+        "geo": np.array([r[2] for r in rows], dtype=float),
+        "backlink": np.array([r[3] for r in rows], dtype=float),
+        "content_gap": np.array([r[4] for r in rows], dtype=float),
+        "competitive": np.array([r[5] for r in rows], dtype=float),
+    }
+    has_20x = np.array([bool(r[6]) for r in rows])
+
+    combined = np.round(combine(dims, w), 1)
+    priorities = np.select(
+        [
+            (combined >= critical_threshold) | has_20x,
+            combined >= high_threshold,
+            combined >= medium_threshold,
+        ],
+        ["critical", "high", "medium"],
+        default="low",
+    )
+
+    mask = np.ones(len(rows), dtype=bool)
+    if min_score > 0:
+        mask &= combined >= min_score
+    if priority:
+        mask &= priorities == priority
+
+    scores = combined.tolist()
+    # nlargest is stable, so ties keep the stored rank order
+    top = heapq.nlargest(limit, np.flatnonzero(mask).tolist(), key=scores.__getitem__)
+    if not top:
+        return []
+
+    top_ids = [ids[i] for i in top]
+    full_rows = (await db.execute(
+        select(KeyOpportunityScore).where(KeyOpportunityScore.id.in_(top_ids))
+    )).scalars().all()
+    by_id = {r.id: r for r in full_rows}
+
+    return [(by_id[ids[i]], scores[i], str(priorities[i])) for i in top if ids[i] in by_id]
@@ -7,6 +7,8 @@ Classifies SERP results into: review, ranking, solution, news, forum, other.
 import re
 from dataclasses import dataclass
 
+from app.utils.llm_cache import memoize_llm
+
 # -----------------------------------------------------------------
 # Tier 1: URL patterns (fastest, free)
 # -----------------------------------------------------------------
@@ -86,6 +88,13 @@ def classify(url: str, title: str) -> ClassificationResult:
     return ClassificationResult("other", 0.0, "unclassified")
 
 
+@memoize_llm(
+    ttl=30 * 24 * 3600,
+    provider="openai",
+    result_type=ClassificationResult,
+    # Don't cache the ("other", 0.3) fallback for an unparseable answer
+    cache_if=lambda r: r.confidence > 0.3,
+)
 async def classify_with_llm(url: str, title: str, snippet: str) -> ClassificationResult:
     """Tier 3: Use LLM to classify when tiers 1-2 fail."""
     from app.engines.geo import get_adapter
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -13,6 +14,9 @@ async def lifespan(app: FastAPI):
     # Create tables on startup (SQLite dev mode)
     await init_db()
     yield
+    from app.tasks.inline_runner import shutdown_inline_pool
+
+    await asyncio.to_thread(shutdown_inline_pool)
 
 
 app = FastAPI(
@@ -36,3 +40,12 @@ app.include_router(api_router, prefix="/api/v1")
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/health/cache")
+async def cache_health():
+    """This process's cache counters: the shared cache and LLM memoization hit rates."""
+    from app.utils.cache import cache_stats
+    from app.utils.llm_cache import llm_cache_stats
+
+    return {"cache": cache_stats(), "llm": llm_cache_stats()}
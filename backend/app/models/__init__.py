@@ -2,20 +2,22 @@ from app.models.project import Project, Brand, BrandDomain
 from app.models.prompt import PromptTopic, Prompt
 from app.models.geo import GeoRun, GeoResponse, BrandMention, SourceCitation
 from app.models.seo import SerpQuery, SerpResult, ContentClassification
-from app.models.domain import Domain, ExclusionRule, ProjectDomain
-from app.models.analysis import GapAnalysis, GapItem, ActionBrief
+from app.models.domain import CanonicalUrl, Domain, ExclusionRule, ProjectDomain
+from app.models.analysis import GapAnalysis, GapItem, ActionBrief, KeyOpportunityScore, KeyOpportunitySnapshot
 from app.models.content import ContentBrief
 from app.models.job import BackgroundJob
+from app.models.quota import DailyQuotaUsage
 
 __all__ = [
     "Project", "Brand", "BrandDomain",
     "PromptTopic", "Prompt",
     "GeoRun", "GeoResponse", "BrandMention", "SourceCitation",
     "SerpQuery", "SerpResult", "ContentClassification",
-    "Domain", "ExclusionRule", "ProjectDomain",
-    "GapAnalysis", "GapItem", "ActionBrief",
+    "CanonicalUrl", "Domain", "ExclusionRule", "ProjectDomain",
+    "GapAnalysis", "GapItem", "ActionBrief", "KeyOpportunityScore", "KeyOpportunitySnapshot",
     "ContentBrief",
     "BackgroundJob",
-    "InfluencerResult",
+    "DailyQuotaUsage",
+    "InfluencerResult", "InfluencerProfile",
 ]
-from app.models.influencer import InfluencerResult
+from app.models.influencer import InfluencerResult, InfluencerProfile
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -10,6 +10,10 @@ from app.models.compat import PortableUUID, PortableJSON
 
 class GapAnalysis(Base):
     __tablename__ = "gap_analyses"
+    __table_args__ = (
+        # Latest analysis per project / niche
+        Index("ix_gap_analyses_project_created", "project_id", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -25,10 +29,15 @@ class GapAnalysis(Base):
 
 class GapItem(Base):
     __tablename__ = "gap_items"
+    __table_args__ = (
+        Index("ix_gap_items_analysis_id", "analysis_id"),
+        Index("ix_gap_items_canonical_url_id", "canonical_url_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     analysis_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("gap_analyses.id", ondelete="CASCADE"), nullable=False)
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    canonical_url_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("canonical_urls.id"), nullable=True)
     domain: Mapped[str | None] = mapped_column(String(512), nullable=True)
     competitor_brands: Mapped[dict | None] = mapped_column(PortableJSON, nullable=True)
     client_present: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -55,3 +64,52 @@ class ActionBrief(Base):
     priority: Mapped[str] = mapped_column(String(10), default="medium")
     status: Mapped[str] = mapped_column(String(20), default="pending")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class KeyOpportunitySnapshot(Base):
+    """Marks which Project.intel_version the stored key opportunities were scored from."""
+    __tablename__ = "key_opportunity_snapshots"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class KeyOpportunityScore(Base):
+    """A persisted KeyOpportunity row (one per domain per project)."""
+    __tablename__ = "key_opportunity_scores"
+    __table_args__ = (
+        Index("ix_key_opportunity_scores_project_rank", "project_id", "rank"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)  # 0-based position in the scored list
+    domain: Mapped[str] = mapped_column(String(512), nullable=False)
+    display_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    domain_type: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    accepts_sponsored: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+
+    # Dimension scores (0-100)
+    seo_score: Mapped[float] = mapped_column(Float, nullable=False)
+    geo_score: Mapped[float] = mapped_column(Float, nullable=False)
+    backlink_score: Mapped[float] = mapped_column(Float, nullable=False)
+    content_gap_score: Mapped[float] = mapped_column(Float, nullable=False)
+    competitive_density: Mapped[float] = mapped_column(Float, nullable=False)
+    key_opportunity_score: Mapped[float] = mapped_column(Float, nullable=False)
+
+    priority: Mapped[str] = mapped_column(String(10), nullable=False)
+    estimated_20x_potential: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    competitor_brands: Mapped[list] = mapped_column(PortableJSON, default=list)
+    content_types: Mapped[list] = mapped_column(PortableJSON, default=list)
+    keywords: Mapped[list] = mapped_column(PortableJSON, default=list)
+    top_urls: Mapped[list] = mapped_column(PortableJSON, default=list)
+    niches: Mapped[list] = mapped_column(PortableJSON, default=list)
+    geo_providers: Mapped[list] = mapped_column(PortableJSON, default=list)
+    recommended_actions: Mapped[list] = mapped_column(PortableJSON, default=list)
+
+    domain_authority: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    monthly_traffic: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -3,13 +3,15 @@
 - UUID  → String(36) on SQLite, native UUID on Postgres
 - JSONB → JSON on SQLite, native JSONB on Postgres
 - ARRAY → JSON on SQLite, native ARRAY on Postgres
+
+upsert_insert() returns the dialect's INSERT (with on_conflict_do_update).
 """
 
 import json
 import uuid as _uuid
 
 from sqlalchemy import JSON, String, TypeDecorator
-from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.config import settings
 
@@ -80,3 +82,10 @@ class PortableArray(TypeDecorator):
         if isinstance(value, str):
             return json.loads(value)
         return list(value)
+
+
+def upsert_insert(table, session):
+    """INSERT for *session*'s dialect — both support .on_conflict_do_update()."""
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
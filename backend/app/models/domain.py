@@ -61,3 +61,14 @@ class ProjectDomain(Base):
     is_excluded: Mapped[bool] = mapped_column(Boolean, default=False)
     priority_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class CanonicalUrl(Base):
+    """One row per canonical URL (app.utils.urls.canonicalize_url), shared by all projects."""
+
+    __tablename__ = "canonical_urls"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    url: Mapped[str] = mapped_column(String(2048), unique=True, nullable=False)
+    domain: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -18,6 +18,10 @@ class LLMProvider(str, PyEnum):
 
 class GeoRun(Base):
     __tablename__ = "geo_runs"
+    __table_args__ = (
+        # Latest completed run per project (intelligence, gap analysis)
+        Index("ix_geo_runs_project_status_created", "project_id", "status", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -27,6 +31,8 @@ class GeoRun(Base):
     providers: Mapped[list[str]] = mapped_column(PortableArray(), nullable=False)
     total_prompts: Mapped[int] = mapped_column(Integer, default=0)
     completed_prompts: Mapped[int] = mapped_column(Integer, default=0)
+    # Job currently executing the run (replaced when the run is resumed)
+    job_id: Mapped[uuid.UUID | None] = mapped_column(PortableUUID, ForeignKey("background_jobs.id", ondelete="SET NULL"), nullable=True)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -36,6 +42,10 @@ class GeoRun(Base):
 
 class GeoResponse(Base):
     __tablename__ = "geo_responses"
+    __table_args__ = (
+        # Responses of a run + per-(prompt, provider, turn) resume checkpoints
+        Index("ix_geo_responses_run_prompt_provider_turn", "run_id", "prompt_id", "provider", "turn"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     run_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("geo_runs.id", ondelete="CASCADE"), nullable=False)
@@ -55,6 +65,10 @@ class GeoResponse(Base):
 
 class BrandMention(Base):
     __tablename__ = "brand_mentions"
+    __table_args__ = (
+        Index("ix_brand_mentions_response_id", "response_id"),
+        Index("ix_brand_mentions_brand_id", "brand_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     response_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("geo_responses.id", ondelete="CASCADE"), nullable=False)
@@ -71,14 +85,21 @@ class BrandMention(Base):
 
 class SourceCitation(Base):
     __tablename__ = "source_citations"
+    __table_args__ = (
+        Index("ix_source_citations_response_id", "response_id"),
+        Index("ix_source_citations_domain", "domain"),
+        Index("ix_source_citations_canonical_url_id", "canonical_url_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     response_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("geo_responses.id", ondelete="CASCADE"), nullable=False)
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    canonical_url_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("canonical_urls.id"), nullable=True)
     domain: Mapped[str | None] = mapped_column(String(512), nullable=True)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
     position: Mapped[int | None] = mapped_column(Integer, nullable=True)
     brand_id: Mapped[uuid.UUID | None] = mapped_column(PortableUUID, ForeignKey("brands.id"), nullable=True)
+    url_alive: Mapped[bool | None] = mapped_column(Boolean, nullable=True)  # None = not checked yet
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     response: Mapped["GeoResponse"] = relationship(back_populates="citations")
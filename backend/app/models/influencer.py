@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -10,6 +10,14 @@ from app.models.compat import PortableUUID, PortableJSON
 
 class InfluencerResult(Base):
     __tablename__ = "influencer_results"
+    __table_args__ = (
+        # Upsert key for re-searches (see _save_results in influencer_tasks)
+        Index(
+            "ux_influencer_results_project_niche_platform_url",
+            "project_id", "niche_slug", "platform", "profile_url",
+            unique=True,
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(
@@ -33,3 +41,23 @@ class InfluencerResult(Base):
     relevance_score: Mapped[float | None] = mapped_column(Float, nullable=True)  # 0-100
     search_query: Mapped[str | None] = mapped_column(String(512), nullable=True)  # query that found this
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class InfluencerProfile(Base):
+    """Creator profile shared by all projects, refreshed after influencer_profile_ttl_hours."""
+
+    __tablename__ = "influencer_profiles"
+    __table_args__ = (
+        Index("ux_influencer_profiles_platform_key", "platform", "key", unique=True),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    platform: Mapped[str] = mapped_column(String(20), nullable=False)   # youtube | instagram
+    key: Mapped[str] = mapped_column(String(255), nullable=False)       # YouTube channel_id / lowercase IG handle
+    handle: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    title: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    followers: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    is_spanish: Mapped[bool | None] = mapped_column(Boolean, nullable=True)  # None = not checked
+    extra: Mapped[dict | None] = mapped_column(PortableJSON, nullable=True)  # e.g. YouTube topic_ids
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
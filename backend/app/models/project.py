@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -18,6 +18,9 @@ class Project(Base):
     website: Mapped[str | None] = mapped_column(String(512), nullable=True)
     market: Mapped[str] = mapped_column(String(50), default="es")
     language: Mapped[str] = mapped_column(String(10), default="es")
+    # Bumped whenever a GEO run, gap analysis or SERP fetch completes —
+    # invalidates the stored key opportunity scores
+    intel_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -28,6 +31,9 @@ class Project(Base):
 
 class Brand(Base):
     __tablename__ = "brands"
+    __table_args__ = (
+        Index("ix_brands_project_id", "project_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -48,6 +54,11 @@ class Brand(Base):
 
 class BrandDomain(Base):
     __tablename__ = "brand_domains"
+    __table_args__ = (
+        # Citation → brand matching looks up by domain
+        Index("ix_brand_domains_domain", "domain"),
+        Index("ix_brand_domains_brand_id", "brand_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     brand_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False)
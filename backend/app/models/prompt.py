@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -24,6 +24,9 @@ class PromptTopic(Base):
 
 class Prompt(Base):
     __tablename__ = "prompts"
+    __table_args__ = (
+        Index("ix_prompts_project_niche_active", "project_id", "niche_id", "is_active"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     topic_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("prompt_topics.id", ondelete="CASCADE"), nullable=False)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -20,6 +20,9 @@ class ContentType(str, PyEnum):
 
 class SerpQuery(Base):
     __tablename__ = "serp_queries"
+    __table_args__ = (
+        Index("ix_serp_queries_project_niche", "project_id", "niche"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -35,10 +38,16 @@ class SerpQuery(Base):
 
 class SerpResult(Base):
     __tablename__ = "serp_results"
+    __table_args__ = (
+        Index("ix_serp_results_query_position", "query_id", "position"),
+        Index("ix_serp_results_domain", "domain"),
+        Index("ix_serp_results_canonical_url_id", "canonical_url_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PortableUUID, primary_key=True, default=uuid.uuid4)
     query_id: Mapped[uuid.UUID] = mapped_column(PortableUUID, ForeignKey("serp_queries.id", ondelete="CASCADE"), nullable=False)
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    canonical_url_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("canonical_urls.id"), nullable=True)
     domain: Mapped[str | None] = mapped_column(String(512), nullable=True)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
     snippet: Mapped[str | None] = mapped_column(Text, nullable=True)
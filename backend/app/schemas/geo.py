@@ -72,6 +72,7 @@ class SourceCitationResponse(BaseModel):
     title: str | None
     position: int | None
     brand_id: uuid.UUID | None
+    url_alive: bool | None = None
 
     model_config = {"from_attributes": True}
 
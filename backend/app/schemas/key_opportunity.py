@@ -1,6 +1,10 @@
 """Pydantic schemas for Key Opportunity endpoints."""
 
-from pydantic import BaseModel
+import uuid
+
+from pydantic import BaseModel, Field, model_validator
+
+WHAT_IF_MAX_LIMIT = 500
 
 
 class KeyOpportunityResponse(BaseModel):
@@ -37,3 +41,25 @@ class KeyOpportunityResponse(BaseModel):
     # Domain metrics
     domain_authority: int | None
     monthly_traffic: int | None
+
+    model_config = {"from_attributes": True}
+
+
+class KeyOpportunityWhatIfRequest(BaseModel):
+    """Re-rank stored opportunities with custom weights/thresholds."""
+
+    project_id: uuid.UUID
+    # Partial overrides of key_opportunity.WEIGHTS (seo, geo, backlink, content_gap, competitive)
+    weights: dict[str, float] = {}
+    critical_threshold: float = 70
+    high_threshold: float = 50
+    medium_threshold: float = 30
+    min_score: float = 0
+    priority: str | None = None
+    limit: int = Field(50, ge=1, le=WHAT_IF_MAX_LIMIT)
+
+    @model_validator(mode="after")
+    def _thresholds_ordered(self):
+        if not self.critical_threshold >= self.high_threshold >= self.medium_threshold:
+            raise ValueError("thresholds must satisfy critical >= high >= medium")
+        return self
@@ -13,14 +13,17 @@ import app.database as _db
 from app.engines.domain.exclusion_engine import is_excluded
 from app.engines.domain.rules_engine import classify_by_rules
 from app.engines.intelligence.brief_generator import generate_briefs
-from app.engines.intelligence.gap_analyzer import analyze_gaps
+from app.engines.intelligence.gap_analyzer import GapAnalysisResult, analyze_gaps, analyze_gaps_many
+from app.engines.intelligence.opportunity_store import bump_intel_version
 from app.engines.intelligence.scoring import prioritize
 from app.models.analysis import ActionBrief, GapAnalysis, GapItem
 from app.models.geo import GeoResponse, GeoRun, SourceCitation
-from app.models.job import BackgroundJob
-from app.models.niche import NicheBrand
+from app.models.niche import Niche, NicheBrand
 from app.models.project import Brand, BrandDomain
 from app.models.seo import ContentClassification, SerpQuery, SerpResult
+from app.tasks.scheduler import JobCancelled, run_with_slot
+from app.tasks.progress import JobProgress
+from app.utils.urls import canonical_url_ids
 
 
 def _is_domain_only_url(url: str) -> bool:
@@ -32,6 +35,47 @@ def _is_domain_only_url(url: str) -> bool:
         return False
 
 
+def _brand_names(brands) -> list[str]:
+    """Brand names plus their aliases."""
+    names = []
+    for b in brands:
+        names.append(b.name)
+        if b.aliases:
+            names.extend(b.aliases)
+    return names
+
+
+async def _niche_competitor_names(session, project_id) -> dict[str | None, list[str]]:
+    """Competitor names per niche slug of the project (via NicheBrand)."""
+    result = await session.execute(
+        select(Niche)
+        .where(Niche.project_id == project_id)
+        .options(selectinload(Niche.niche_brands).selectinload(NicheBrand.brand))
+    )
+    return {
+        niche.slug: _brand_names(nb.brand for nb in niche.niche_brands if not nb.brand.is_client)
+        for niche in result.scalars().all()
+    }
+
+
+def _merge_niche_results(results: dict[str | None, GapAnalysisResult]) -> GapAnalysisResult:
+    """Flatten per-niche results; citation-only gaps take their niche's slug."""
+    opportunities = []
+    total_urls = 0
+    for niche, niche_result in results.items():
+        total_urls += niche_result.total_urls_analyzed
+        for opp in niche_result.opportunities:
+            if opp.niche is None:
+                opp.niche = niche
+            opportunities.append(opp)
+    opportunities.sort(key=lambda o: o.opportunity_score, reverse=True)
+    return GapAnalysisResult(
+        total_urls_analyzed=total_urls,
+        gaps_found=len(opportunities),
+        opportunities=opportunities,
+    )
+
+
 def _run_async(coro):
     loop = asyncio.new_event_loop()
     try:
@@ -50,11 +94,13 @@ def _celery_task(**kwargs):
 @_celery_task(bind=True, name="analysis.run_gap_analysis")
 def run_gap_analysis(self, analysis_id: str, job_id: str | None = None):
     """Run a complete gap analysis."""
-    return _run_async(_run_gap_analysis(analysis_id, job_id))
+    return run_with_slot(self, "gap_analysis", lambda: _run_async(_run_gap_analysis(analysis_id, job_id)))
 
 
-async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
-    async with _db.async_session() as session:
+async def _run_gap_analysis(analysis_id: str, job_id: str | None, session_factory=None) -> dict:
+    session_factory = session_factory or _db.async_session
+    reporter = JobProgress(job_id, session_factory=session_factory)
+    async with session_factory() as session:
         # Load analysis
         result = await session.execute(
             select(GapAnalysis).where(GapAnalysis.id == uuid.UUID(analysis_id))
@@ -67,7 +113,7 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
         await session.commit()
 
         if job_id:
-            await _update_job(session, job_id, status="running")
+            await reporter.update(status="running")
 
         project_id = analysis.project_id
         niche_id = analysis.niche_id
@@ -96,17 +142,14 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
             brands = all_brands
             competitor_brands = [b for b in all_brands if not b.is_client]
 
-        client_brand_names = []
-        for b in client_brands:
-            client_brand_names.append(b.name)
-            if b.aliases:
-                client_brand_names.extend(b.aliases)
+        client_brand_names = _brand_names(client_brands)
+        competitor_brand_names = _brand_names(competitor_brands)
 
-        competitor_brand_names = []
-        for b in competitor_brands:
-            competitor_brand_names.append(b.name)
-            if b.aliases:
-                competitor_brand_names.extend(b.aliases)
+        # Whole-project analysis: each niche is scored against its own
+        # competitors, as a per-niche analysis would, in a single pass
+        niche_competitor_names: dict[str | None, list[str]] | None = None
+        if not niche_id and not niche_slug:
+            niche_competitor_names = await _niche_competitor_names(session, project_id)
 
         # Load client domains
         client_domain_result = await session.execute(
@@ -116,31 +159,46 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
         )
         client_domains = [bd.domain for bd in client_domain_result.scalars().all()]
 
+        # Precomputed lookups: brand names by id, rule-based domain type by domain
+        brand_name_by_id = {b.id: b.name for b in brands}
+        domain_types: dict[str, str | None] = {}
+
+        def _domain_type(domain: str) -> str | None:
+            if domain not in domain_types:
+                domain_types[domain] = classify_by_rules(domain).domain_type
+            return domain_types[domain]
+
         # Collect GEO citations
         geo_citations = []
         if analysis.geo_run_id:
+            # Citations of a niche-scoped run only count for that niche
+            run_niche = None
+            if niche_competitor_names:
+                run_niche = (await session.execute(
+                    select(Niche.slug)
+                    .join(GeoRun, GeoRun.niche_id == Niche.id)
+                    .where(GeoRun.id == analysis.geo_run_id)
+                )).scalar_one_or_none()
             citation_result = await session.execute(
-                select(SourceCitation)
+                select(
+                    SourceCitation.url, SourceCitation.canonical_url_id,
+                    SourceCitation.domain, SourceCitation.brand_id,
+                )
                 .join(GeoResponse)
                 .where(GeoResponse.run_id == analysis.geo_run_id)
             )
-            for c in citation_result.scalars().all():
-                brand_name = ""
-                if c.brand_id:
-                    for b in brands:
-                        if b.id == c.brand_id:
-                            brand_name = b.name
-                            break
-
+            for url, canonical_id, domain, brand_id in citation_result.all():
                 geo_citations.append({
-                    "url": c.url,
-                    "domain": c.domain or "",
-                    "brand_name": brand_name,
-                    "domain_type": classify_by_rules(c.domain or "").domain_type,
+                    "url": url,
+                    "canonical_url_id": canonical_id,
+                    "domain": domain or "",
+                    "brand_name": brand_name_by_id.get(brand_id, "") if brand_id else "",
+                    "domain_type": _domain_type(domain or ""),
+                    "niche": run_niche,
                 })
 
         if job_id:
-            await _update_job(session, job_id, progress=0.3)
+            await reporter.update(progress=0.3)
 
         # Collect SERP results — filter by niche if set
         serp_data = []
@@ -160,17 +218,24 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
                 ct = sr.classification
                 serp_data.append({
                     "url": sr.url,
+                    "canonical_url_id": sr.canonical_url_id,
                     "domain": sr.domain or "",
                     "title": sr.title or "",
                     "position": sr.position,
                     "keyword": sq.keyword,
                     "niche": sq.niche,
                     "content_type": ct.content_type if ct else None,
-                    "domain_type": classify_by_rules(sr.domain or "").domain_type,
+                    "domain_type": _domain_type(sr.domain or ""),
                 })
 
         if job_id:
-            await _update_job(session, job_id, progress=0.5)
+            await reporter.update(progress=0.5)
+            try:
+                await reporter.check_cancelled()
+            except JobCancelled:
+                analysis.status = "cancelled"
+                await session.commit()
+                raise
 
         # ── Enrich GEO citations with specific article URLs ───────────────────
         # LLMs often cite just domain names (e.g. "techcrunch.com") instead of
@@ -225,6 +290,18 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
         for cit in geo_citations:
             if _is_domain_only_url(cit["url"]) and cit["domain"] in domain_to_best_article:
                 cit["url"] = domain_to_best_article[cit["domain"]]
+                cit["canonical_url_id"] = None
+
+        # Canonical ids for enriched URLs and rows stored before ids existed,
+        # so the analyzer dedupes every URL variant by integer id
+        unresolved = [r["url"] for r in (*geo_citations, *serp_data) if r["canonical_url_id"] is None]
+        if unresolved:
+            url_ids = await canonical_url_ids(session, unresolved)
+            for r in (*geo_citations, *serp_data):
+                if r["canonical_url_id"] is None:
+                    r["canonical_url_id"] = url_ids.get(r["url"])
+            # Shared lookup rows: commit them rather than hold the write lock
+            await session.commit()
 
         # Build excluded domains set
         excluded: set[str] = set()
@@ -237,43 +314,36 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
                 excluded.add(d)
 
         if job_id:
-            await _update_job(session, job_id, progress=0.6)
+            await reporter.update(progress=0.6)
 
         # Run gap analyzer
-        gap_result = analyze_gaps(
-            geo_citations=geo_citations,
-            serp_results=serp_data,
-            client_brand_names=client_brand_names,
-            competitor_brand_names=competitor_brand_names,
-            client_domains=client_domains,
-            excluded_domains=excluded,
-        )
-
-        if job_id:
-            await _update_job(session, job_id, progress=0.7)
-
-        # Store gap items in DB
-        for opp in gap_result.opportunities:
-            gap_item = GapItem(
-                analysis_id=analysis.id,
-                url=opp.url,
-                domain=opp.domain,
-                competitor_brands={"brands": opp.competitor_brands},
-                client_present=opp.client_present,
-                found_in_geo=opp.found_in_geo,
-                found_in_serp=opp.found_in_serp,
-                content_type=opp.content_type,
-                domain_type=opp.domain_type,
-                opportunity_score=opp.opportunity_score,
-                keyword=opp.keyword,
-                niche=opp.niche,
+        if niche_competitor_names is None:
+            gap_result = analyze_gaps(
+                geo_citations=geo_citations,
+                serp_results=serp_data,
+                client_brand_names=client_brand_names,
+                competitor_brand_names=competitor_brand_names,
+                client_domains=client_domains,
+                excluded_domains=excluded,
             )
-            session.add(gap_item)
-
-        await session.flush()
+        else:
+            # SERP rows outside the project's niches (or without one) and
+            # projects without niches are scored against all competitors
+            for s in serp_data:
+                niche_competitor_names.setdefault(s["niche"], competitor_brand_names)
+            if not niche_competitor_names:
+                niche_competitor_names[None] = competitor_brand_names
+            gap_result = _merge_niche_results(analyze_gaps_many(
+                geo_citations=geo_citations,
+                serp_results=serp_data,
+                client_brand_names=client_brand_names,
+                competitor_brand_names_by_niche=niche_competitor_names,
+                client_domains=client_domains,
+                excluded_domains=excluded,
+            ))
 
         if job_id:
-            await _update_job(session, job_id, progress=0.8)
+            await reporter.update(progress=0.7)
 
         # Prioritize and generate briefs
         opp_dicts = [
@@ -299,6 +369,30 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
 
         briefs = generate_briefs(brief_inputs)
 
+        if job_id:
+            await reporter.update(progress=0.8)
+
+        # Store gap items in DB
+        for opp in gap_result.opportunities:
+            gap_item = GapItem(
+                analysis_id=analysis.id,
+                url=opp.url,
+                canonical_url_id=opp.canonical_url_id,
+                domain=opp.domain,
+                competitor_brands={"brands": opp.competitor_brands},
+                client_present=opp.client_present,
+                found_in_geo=opp.found_in_geo,
+                found_in_serp=opp.found_in_serp,
+                content_type=opp.content_type,
+                domain_type=opp.domain_type,
+                opportunity_score=opp.opportunity_score,
+                keyword=opp.keyword,
+                niche=opp.niche,
+            )
+            session.add(gap_item)
+
+        await session.flush()
+
         # Store briefs
         gap_items_result = await session.execute(
             select(GapItem).where(GapItem.analysis_id == analysis.id)
@@ -327,35 +421,14 @@ async def _run_gap_analysis(analysis_id: str, job_id: str | None) -> dict:
             "gaps_found": gap_result.gaps_found,
             "briefs_generated": len(briefs),
         }
+        await bump_intel_version(session, project_id)
         await session.commit()
 
         if job_id:
-            await _update_job(
-                session, job_id,
+            await reporter.update(
                 status="completed",
                 progress=1.0,
                 result=analysis.results,
             )
 
     return {"analysis_id": analysis_id, "gaps": gap_result.gaps_found, "briefs": len(briefs)}
-
-
-async def _update_job(session, job_id: str, **kwargs):
-    result = await session.execute(
-        select(BackgroundJob).where(BackgroundJob.id == uuid.UUID(job_id))
-    )
-    job = result.scalar_one_or_none()
-    if not job:
-        return
-    for k, v in kwargs.items():
-        if k == "status":
-            setattr(job, k, v)
-            if v == "running" and not job.started_at:
-                job.started_at = datetime.now(timezone.utc)
-            if v == "completed":
-                job.completed_at = datetime.now(timezone.utc)
-        elif k == "progress":
-            job.progress = v
-        elif k == "result":
-            job.result = v
-    await session.commit()
@@ -4,18 +4,23 @@ import asyncio
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.celery_app import celery
 import app.database as _db
+from app.config import settings
 from app.engines.geo import get_adapter
 from app.engines.geo.aggregator import aggregate
 from app.engines.geo.response_parser import parse_response
+from app.engines.intelligence.opportunity_store import bump_intel_version
 from app.models.geo import BrandMention, GeoResponse, GeoRun, SourceCitation
-from app.models.job import BackgroundJob
 from app.models.project import Brand
 from app.models.prompt import Prompt
+from app.tasks.scheduler import JobCancelled, run_with_slot
+from app.tasks.progress import JobProgress
 from app.utils import cache, rate_limiter
+from app.utils.url_liveness import check_urls
+from app.utils.urls import canonical_url_ids
 
 GEO_SYSTEM_PROMPT = (
     "You are a helpful assistant. The user is asking about products, services, "
@@ -74,110 +79,193 @@ def _celery_task(**kwargs):
 
 @_celery_task(bind=True, name="geo.run_analysis")
 def run_geo_analysis(self, run_id: str, job_id: str | None = None):
-    """Execute a full GEO analysis run (all prompts x all providers)."""
-    return _run_async(_run_geo_analysis(self, run_id, job_id))
+    """Execute a full GEO analysis run (all prompts x all providers).
 
+    With geo_chunk_size > 0 the run is fanned out as a chord of prompt
+    chunks (geo.run_chunk) across workers, aggregated by geo.finalize_run.
+    """
+    if settings.geo_chunk_size > 0:
+        return run_with_slot(self, "geo_analysis", lambda: _run_async(_fan_out_geo_run(run_id, job_id)))
+    return run_with_slot(self, "geo_analysis", lambda: _run_async(_run_geo_analysis(self, run_id, job_id)))
 
-async def _run_geo_analysis(task, run_id: str, job_id: str | None):
-    async with _db.async_session() as session:
-        # Load the run
-        result = await session.execute(
-            select(GeoRun).where(GeoRun.id == uuid.UUID(run_id))
-        )
-        run = result.scalar_one_or_none()
+
+@_celery_task(bind=True, name="geo.run_chunk")
+def run_geo_chunk(
+    self, run_id: str, job_id: str | None, prompt_ids: list[str], language: str, steps: list[int],
+):
+    """Process one slice of a fanned-out GEO run."""
+    return run_with_slot(self, "geo_chunk", lambda: _run_async(
+        _run_geo_chunk(run_id, job_id, prompt_ids, language, steps)
+    ))
+
+
+@_celery_task(bind=True, name="geo.finalize_run")
+def finalize_geo_run(self, chunk_results: list, run_id: str, job_id: str | None = None):
+    """Chord callback: aggregate all stored responses and complete the run.
+
+    Chunks report failures in their result instead of raising (a failed
+    header task would never trigger this callback); any failure marks the
+    run failed, so it can be resumed.
+    """
+    errors = [r["error"] for r in chunk_results if isinstance(r, dict) and r.get("error")]
+    return _run_async(_finalize_geo_run(run_id, job_id, chunk_errors=errors))
+
+
+async def _run_geo_analysis(task, run_id: str, job_id: str | None, session_factory=None):
+    session_factory = session_factory or _db.async_session
+    reporter = JobProgress(job_id, session_factory=session_factory)
+    async with session_factory() as session:
+        run = await _start_run(session, run_id, reporter)
         if not run:
             return {"error": f"GeoRun {run_id} not found"}
 
-        # Update status
-        run.status = "running"
-        run.started_at = datetime.now(timezone.utc)
-        await session.commit()
-
-        if job_id:
-            await _update_job(session, job_id, status="running")
+        prompts, brand_names, language = await _load_run_inputs(session, run)
+        # Checkpoints: turns already stored for each (prompt, provider) —
+        # empty for a fresh run, populated when resuming an interrupted one
+        done_turns = await _load_done_turns(session, run.id)
+        await _reset_run_progress(session, run, prompts, done_turns)
 
-        # Load prompts — scoped to niche if the run was launched for a specific niche
-        prompt_query = select(Prompt).where(
-            Prompt.project_id == run.project_id,
-            Prompt.is_active.is_(True),
+        await _process_prompts(
+            session, run, prompts, brand_names, language, reporter, done_turns,
         )
-        if run.niche_id:
-            prompt_query = prompt_query.where(Prompt.niche_id == run.niche_id)
-        prompt_result = await session.execute(prompt_query)
-        prompts = prompt_result.scalars().all()
-        run.total_prompts = len(prompts)
-        await session.commit()
 
-        # Load brands (for response parsing)
-        brand_result = await session.execute(
-            select(Brand).where(Brand.project_id == run.project_id)
-        )
-        brands = brand_result.scalars().all()
-        brand_names = []
-        for b in brands:
-            brand_names.append(b.name)
-            if b.aliases:
-                brand_names.extend(b.aliases)
-
-        # Detect language from first prompt
-        language = "es"
-        if prompts:
-            first_text = prompts[0].text.lower()
-            if any(w in first_text for w in ("what", "which", "best", "recommend")):
-                language = "en"
-
-        providers = run.providers
-        completed = 0
-        total = len(prompts) * len(providers)
-        all_parsed: list[dict] = []
-
-        for prompt_idx, prompt in enumerate(prompts):
-            # Update step info once per prompt (not per provider)
-            if job_id:
-                await _update_job(
-                    session, job_id,
-                    step_info={
-                        "current_prompt": prompt.text[:80],
-                        "step": prompt_idx + 1,
-                        "total": len(prompts),
-                    },
-                )
+    return await _finalize_geo_run(run_id, job_id, session_factory=session_factory, reporter=reporter)
+
+
+async def _fan_out_geo_run(run_id: str, job_id: str | None) -> dict:
+    """Split the remaining prompts into chunks and dispatch them as a chord."""
+    from celery import chord, group
+
+    from app.tasks.scheduler import priority_for, queue_for
+
+    reporter = JobProgress(job_id)
+    async with _db.async_session() as session:
+        run = await _start_run(session, run_id, reporter)
+        if not run:
+            return {"error": f"GeoRun {run_id} not found"}
+        prompts, _, language = await _load_run_inputs(session, run)
+        done_turns = await _load_done_turns(session, run.id)
+        await _reset_run_progress(session, run, prompts, done_turns)
+
+        remaining = [
+            (idx, p) for idx, p in enumerate(prompts)
+            if any(not _unit_complete(done_turns.get((p.id, prov))) for prov in run.providers)
+        ]
+
+    if not remaining:
+        return await _finalize_geo_run(run_id, job_id, reporter=reporter)
+
+    size = settings.geo_chunk_size
+    opts = {"queue": queue_for("geo_analysis"), "priority": priority_for("geo_analysis")}
+    header = group(
+        run_geo_chunk.s(
+            run_id, job_id,
+            [str(p.id) for _, p in remaining[i:i + size]],
+            language,
+            [idx + 1 for idx, _ in remaining[i:i + size]],
+        ).set(**opts)
+        for i in range(0, len(remaining), size)
+    )
+    chord(header)(finalize_geo_run.s(run_id, job_id).set(**opts))
+    print(f"[GEO] Run {run_id}: {len(remaining)} prompts fanned out in chunks of {size}")
+    return {"run_id": run_id, "status": "dispatched", "chunks": len(header.tasks)}
 
-            # ── Run all providers in parallel for this prompt ──────────────
-            # Each provider runs T1, then T2+T3 in parallel internally.
-            # No DB writes here — pure LLM calls.
-            tasks = [
-                _run_llm_only(run, prompt, provider, brand_names, language)
-                for provider in providers
-            ]
-            provider_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # ── Write results to DB serially (SQLite-safe) ─────────────────
-            for i, result in enumerate(provider_results):
-                if isinstance(result, Exception):
-                    print(f"[GEO] Error {providers[i]}/{prompt.id}: {result}")
-                    continue
-                for (p_id, provider_name, turn, resp, parsed_obj) in result:
-                    parsed_dict = await _write_turn_to_db(
-                        session, run, prompt, provider_name, resp, parsed_obj, turn
-                    )
-                    if parsed_dict:
-                        all_parsed.append(parsed_dict)
-
-            completed += len(providers)
-            run.completed_prompts = completed
-            progress = completed / total if total else 1.0
-            if job_id:
-                await _update_job(session, job_id, progress=progress)
+
+async def _run_geo_chunk(
+    run_id: str,
+    job_id: str | None,
+    prompt_ids: list[str],
+    language: str,
+    steps: list[int],
+    session_factory=None,
+) -> dict:
+    """Process a chunk; ``steps`` holds each prompt's 1-based position in the run.
+
+    Errors are returned, not raised, so the chord callback always runs.
+    """
+    session_factory = session_factory or _db.async_session
+    reporter = JobProgress(job_id, session_factory=session_factory)
+    try:
+        async with session_factory() as session:
+            run = (await session.execute(
+                select(GeoRun).where(GeoRun.id == uuid.UUID(run_id))
+            )).scalar_one_or_none()
+            if not run or run.status == "cancelled":
+                return {"run_id": run_id, "skipped": True}
+
+            ids = [uuid.UUID(pid) for pid in prompt_ids]
+            step_by_id = dict(zip(ids, steps))
+            by_id = {
+                p.id: p for p in (await session.execute(select(Prompt).where(Prompt.id.in_(ids)))).scalars()
+            }
+            prompts = [by_id[pid] for pid in ids if pid in by_id]
+            brand_names = await _load_brand_names(session, run.project_id)
+            done_turns = await _load_done_turns(session, run.id, prompt_ids=ids)
+
+            units = await _process_prompts(
+                session, run, prompts, brand_names, language, reporter, done_turns,
+                steps=[step_by_id[p.id] for p in prompts],
+            )
+    except JobCancelled:
+        return {"run_id": run_id, "cancelled": True}
+    except Exception as e:
+        print(f"[GEO] Chunk of run {run_id} failed: {e}")
+        return {"run_id": run_id, "error": f"{type(e).__name__}: {e}"}
+    return {"run_id": run_id, "units": units}
+
+
+async def _finalize_geo_run(
+    run_id: str,
+    job_id: str | None,
+    session_factory=None,
+    reporter: JobProgress | None = None,
+    chunk_errors: list[str] | None = None,
+) -> dict:
+    """Aggregate every stored response of the run and mark it completed.
+
+    With ``chunk_errors`` the run and its job are marked failed instead; the
+    stored units are kept, so a resume only re-queries the rest.
+    """
+    session_factory = session_factory or _db.async_session
+    reporter = reporter or JobProgress(job_id, session_factory=session_factory)
+    async with session_factory() as session:
+        run = (await session.execute(
+            select(GeoRun).where(GeoRun.id == uuid.UUID(run_id))
+        )).scalar_one_or_none()
+        if not run:
+            return {"error": f"GeoRun {run_id} not found"}
+        if run.status == "cancelled":
+            return {"run_id": run_id, "status": "cancelled"}
+        if _superseded(run, job_id):
+            return {"run_id": run_id, "status": "superseded"}
+
+        if chunk_errors:
+            run.status = "failed"
             await session.commit()
+            await reporter.update(
+                status="failed",
+                error=f"{len(chunk_errors)} chunk(s) failed: {chunk_errors[0]}",
+            )
+            return {"run_id": run_id, "status": "failed", "errors": chunk_errors}
+
+        if settings.geo_validate_citations:
+            # Own session: a failure here must not roll back (and expire) the run
+            try:
+                await _validate_citations(session_factory, run.id)
+            except Exception as e:
+                print(f"[geo] citation URL validation failed for run {run_id}: {e}")
 
-        # Mark complete
         run.status = "completed"
         run.completed_at = datetime.now(timezone.utc)
+        await bump_intel_version(session, run.project_id)
         await session.commit()
 
         if job_id:
-            agg = aggregate(all_parsed, [b.name for b in brands], len(prompts))
+            brand_result = await session.execute(
+                select(Brand.name).where(Brand.project_id == run.project_id)
+            )
+            all_parsed = await _load_parsed_responses(session, run.id)
+            agg = aggregate(all_parsed, list(brand_result.scalars()), run.total_prompts)
             result_data = {
                 "total_prompts": agg.total_prompts,
                 "total_responses": agg.total_responses,
@@ -192,39 +280,245 @@ async def _run_geo_analysis(task, run_id: str, job_id: str | None):
                     for bm in agg.brands
                 ],
             }
-            await _update_job(session, job_id, status="completed", progress=1.0, result=result_data)
+            await reporter.update(status="completed", progress=1.0, result=result_data)
+
+        completed = run.completed_prompts
 
     return {"run_id": run_id, "status": "completed", "completed": completed}
 
 
+def _superseded(run: GeoRun, job_id: str | None) -> bool:
+    """True if the run was resumed under another job (see resume_geo_run)."""
+    return bool(job_id and run.job_id and str(run.job_id) != job_id)
+
+
+async def _validate_citations(session_factory, run_id: uuid.UUID) -> None:
+    """Check every not-yet-checked citation URL of the run and store url_alive."""
+    async with session_factory() as session:
+        rows = (await session.execute(
+            select(SourceCitation.id, SourceCitation.url)
+            .join(GeoResponse, GeoResponse.id == SourceCitation.response_id)
+            .where(GeoResponse.run_id == run_id, SourceCitation.url_alive.is_(None))
+        )).all()
+        # End the read transaction before the (slow) HTTP checks
+        await session.commit()
+        if not rows:
+            return
+        verdicts = await check_urls([url for _, url in rows])
+        for alive in (True, False):
+            ids = [cid for cid, url in rows if verdicts.get(url, False) is alive]
+            if ids:
+                await session.execute(
+                    update(SourceCitation)
+                    .where(SourceCitation.id.in_(ids))
+                    .values(url_alive=alive)
+                    .execution_options(synchronize_session=False)
+                )
+        await session.commit()
+
+
+async def _start_run(session, run_id: str, reporter: JobProgress) -> GeoRun | None:
+    """Load the run and mark it running (a resumed run keeps its started_at)."""
+    result = await session.execute(
+        select(GeoRun).where(GeoRun.id == uuid.UUID(run_id))
+    )
+    run = result.scalar_one_or_none()
+    if not run:
+        return None
+
+    run.status = "running"
+    run.started_at = run.started_at or datetime.now(timezone.utc)
+    run.completed_at = None
+    await session.commit()
+
+    await reporter.update(status="running")
+    return run
+
+
+async def _load_run_inputs(session, run: GeoRun) -> tuple[list[Prompt], list[str], str]:
+    """Prompts (niche-scoped), brand names/aliases and response language."""
+    # Load prompts — scoped to niche if the run was launched for a specific niche
+    prompt_query = select(Prompt).where(
+        Prompt.project_id == run.project_id,
+        Prompt.is_active.is_(True),
+    )
+    if run.niche_id:
+        prompt_query = prompt_query.where(Prompt.niche_id == run.niche_id)
+    prompt_result = await session.execute(prompt_query.order_by(Prompt.created_at, Prompt.id))
+    prompts = list(prompt_result.scalars().all())
+
+    brand_names = await _load_brand_names(session, run.project_id)
+
+    # Detect language from first prompt
+    language = "es"
+    if prompts:
+        first_text = prompts[0].text.lower()
+        if any(w in first_text for w in ("what", "which", "best", "recommend")):
+            language = "en"
+
+    return prompts, brand_names, language
+
+
+async def _load_brand_names(session, project_id: uuid.UUID) -> list[str]:
+    """Brand names plus aliases (for response parsing)."""
+    brand_result = await session.execute(
+        select(Brand.name, Brand.aliases).where(Brand.project_id == project_id)
+    )
+    brand_names = []
+    for name, aliases in brand_result.all():
+        brand_names.append(name)
+        if aliases:
+            brand_names.extend(aliases)
+    return brand_names
+
+
+async def _reset_run_progress(session, run: GeoRun, prompts: list[Prompt], done_turns: dict) -> None:
+    """Set totals and the already-completed unit count before (re)starting."""
+    providers = run.providers
+    total = len(prompts) * len(providers)
+    completed = sum(
+        1 for p in prompts for prov in providers
+        if _unit_complete(done_turns.get((p.id, prov)))
+    )
+    if completed:
+        print(f"[GEO] Resuming run {run.id}: {completed}/{total} units already done")
+    run.total_prompts = len(prompts)
+    run.completed_prompts = completed
+    await session.commit()
+
+
+async def _process_prompts(
+    session,
+    run: GeoRun,
+    prompts: list[Prompt],
+    brand_names: list[str],
+    language: str,
+    reporter: JobProgress,
+    done_turns: dict[tuple[uuid.UUID, str], set[int]],
+    *,
+    steps: list[int] | None = None,
+) -> int:
+    """Query and store every unfinished (prompt, provider) unit.
+
+    ``steps`` gives each prompt's 1-based position in the whole run, for
+    progress reporting (default: its position in ``prompts``).
+
+    Progress is advanced with an atomic increment on geo_runs, so concurrent
+    chunks of the same run keep an exact count. Returns units processed.
+    """
+    providers = run.providers
+    t1_texts = await _load_turn1_texts(session, run.id, done_turns)
+    processed = 0
+
+    for prompt_idx, prompt in enumerate(prompts):
+        pending = [
+            prov for prov in providers
+            if not _unit_complete(done_turns.get((prompt.id, prov)))
+        ]
+        if not pending:
+            continue
+
+        try:
+            await reporter.check_cancelled()
+        except JobCancelled:
+            await session.refresh(run)
+            if not _superseded(run, reporter.job_id):
+                run.status = "cancelled"
+                run.completed_at = datetime.now(timezone.utc)
+                await session.commit()
+            raise
+
+        # Update step info once per prompt (not per provider)
+        await reporter.update(
+            step_info={
+                "current_prompt": prompt.text[:80],
+                "step": steps[prompt_idx] if steps else prompt_idx + 1,
+                "total": run.total_prompts,
+            },
+        )
+
+        # ── Run all providers in parallel for this prompt ──────────────
+        # Each provider runs T1, then T2+T3 in parallel internally.
+        # No DB writes here — pure LLM calls.
+        tasks = [
+            _run_llm_only(
+                run, prompt, provider, brand_names, language,
+                done_turns=done_turns.get((prompt.id, provider), set()),
+                t1_text=t1_texts.get((prompt.id, provider)),
+            )
+            for provider in pending
+        ]
+        provider_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # ── Write results to DB serially (SQLite-safe) ─────────────────
+        for i, result in enumerate(provider_results):
+            if isinstance(result, Exception):
+                print(f"[GEO] Error {pending[i]}/{prompt.id}: {result}")
+                continue
+            for (p_id, provider_name, turn, resp, parsed_obj) in result:
+                await _write_turn_to_db(
+                    session, run, prompt, provider_name, resp, parsed_obj, turn
+                )
+
+        processed += len(pending)
+        completed = await _advance_run(session, run.id, len(pending))
+        total = run.total_prompts * len(providers)
+        await session.commit()
+        await reporter.update(progress=min(completed / total, 1.0) if total else 1.0)
+
+    return processed
+
+
+async def _advance_run(session, run_id: uuid.UUID, units: int) -> int:
+    """Atomically add finished units to geo_runs.completed_prompts."""
+    await session.execute(
+        update(GeoRun)
+        .where(GeoRun.id == run_id)
+        .values(completed_prompts=GeoRun.completed_prompts + units)
+        .execution_options(synchronize_session=False)
+    )
+    return (await session.execute(
+        select(GeoRun.completed_prompts).where(GeoRun.id == run_id)
+    )).scalar_one()
+
+
 async def _run_llm_only(
     run: GeoRun,
     prompt: Prompt,
     provider_name: str,
     brand_names: list[str],
     language: str,
+    done_turns: set[int] | None = None,
+    t1_text: str | None = None,
 ) -> list[tuple]:
     """Pure LLM calls for one prompt/provider — no DB writes.
 
     Turn 1: original prompt (sequential, needed to get mentioned brands)
     Turn 2 + Turn 3: run in parallel (both standalone, T3 doesn't need T2)
 
+    When resuming, turns in ``done_turns`` are skipped; a stored turn 1
+    (``t1_text``) is re-parsed instead of re-queried.
+
     Returns list of (prompt_id, provider, turn, resp, parsed_obj).
     """
     is_es = language == "es"
     raw_turns: list[tuple] = []
+    done_turns = done_turns or set()
 
     # ─── TURN 1: Original prompt ─────────────────────────────────────────
-    t1_resp = await _query_single(provider_name, prompt.text)
-    native_cit1 = getattr(t1_resp, "citations", []) or []
-    t1_parsed = parse_response(t1_resp.text, brand_names, native_citations=native_cit1)
-    raw_turns.append((prompt.id, provider_name, 1, t1_resp, t1_parsed))
+    if 1 in done_turns and t1_text is not None:
+        t1_parsed = parse_response(t1_text, brand_names)
+    else:
+        t1_resp = await _query_single(provider_name, prompt.text)
+        native_cit1 = getattr(t1_resp, "citations", []) or []
+        t1_parsed = parse_response(t1_resp.text, brand_names, native_citations=native_cit1)
+        raw_turns.append((prompt.id, provider_name, 1, t1_resp, t1_parsed))
 
     mentioned = [m.brand_name for m in t1_parsed.mentions]
 
     # ─── TURN 2: Why + sources (only if brands mentioned) ────────────────
     turn2_coro = None
-    if mentioned:
+    if mentioned and 2 not in done_turns:
         brands_str = ", ".join(mentioned[:5])
         short = prompt.text[:200]
         why_text = (
@@ -296,11 +590,13 @@ async def _write_turn_to_db(
         )
         session.add(mention)
 
+    url_ids = await canonical_url_ids(session, [c.url for c in parsed_obj.citations])
     for c in parsed_obj.citations:
         brand_id = await _match_citation_to_brand(session, run.project_id, c.domain)
         citation = SourceCitation(
             response_id=geo_response.id,
             url=c.url,
+            canonical_url_id=url_ids.get(c.url),
             domain=c.domain,
             title=c.title,
             position=c.position,
@@ -325,12 +621,105 @@ async def _write_turn_to_db(
             for m in parsed_obj.mentions
         ],
         "citations": [
-            {"url": c.url, "domain": c.domain}
+            {"url": c.url, "domain": c.domain, "canonical_url_id": url_ids.get(c.url)}
             for c in parsed_obj.citations
         ],
     }
 
 
+def _unit_complete(turns: set[int] | None) -> bool:
+    """A (prompt, provider) unit is done once its last turn (T3) is stored."""
+    return bool(turns) and 3 in turns
+
+
+async def _load_done_turns(
+    session, run_id: uuid.UUID, prompt_ids: list[uuid.UUID] | None = None,
+) -> dict[tuple[uuid.UUID, str], set[int]]:
+    """Checkpoints for a run: {(prompt_id, provider): {stored turns}}."""
+    query = select(GeoResponse.prompt_id, GeoResponse.provider, GeoResponse.turn).where(
+        GeoResponse.run_id == run_id
+    )
+    if prompt_ids is not None:
+        query = query.where(GeoResponse.prompt_id.in_(prompt_ids))
+    done: dict[tuple[uuid.UUID, str], set[int]] = {}
+    for prompt_id, provider, turn in (await session.execute(query)).all():
+        done.setdefault((prompt_id, provider), set()).add(turn)
+    return done
+
+
+async def _load_parsed_responses(session, run_id: uuid.UUID) -> list[dict]:
+    """Every stored response of a run as aggregate() input.
+
+    Same dict shape _write_turn_to_db returns, rebuilt with three
+    column-only queries.
+    """
+    rows = (await session.execute(
+        select(GeoResponse.id, GeoResponse.prompt_id, GeoResponse.provider, GeoResponse.turn)
+        .where(GeoResponse.run_id == run_id)
+    )).all()
+    if not rows:
+        return []
+
+    mentions: dict[uuid.UUID, list[dict]] = {}
+    for resp_id, text, pos, sentiment, score, recommended in (await session.execute(
+        select(
+            BrandMention.response_id, BrandMention.mention_text, BrandMention.position,
+            BrandMention.sentiment, BrandMention.sentiment_score, BrandMention.is_recommended,
+        )
+        .join(GeoResponse, GeoResponse.id == BrandMention.response_id)
+        .where(GeoResponse.run_id == run_id)
+    )).all():
+        mentions.setdefault(resp_id, []).append({
+            "brand_name": text,
+            "position": pos,
+            "sentiment": sentiment,
+            "sentiment_score": score,
+            "is_recommended": recommended,
+        })
+
+    citations: dict[uuid.UUID, list[dict]] = {}
+    for resp_id, url, domain, canonical_id in (await session.execute(
+        select(
+            SourceCitation.response_id, SourceCitation.url, SourceCitation.domain,
+            SourceCitation.canonical_url_id,
+        )
+        .join(GeoResponse, GeoResponse.id == SourceCitation.response_id)
+        .where(GeoResponse.run_id == run_id)
+    )).all():
+        citations.setdefault(resp_id, []).append(
+            {"url": url, "domain": domain, "canonical_url_id": canonical_id}
+        )
+
+    return [
+        {
+            "prompt_id": str(prompt_id),
+            "provider": provider,
+            "turn": turn,
+            "mentions": mentions.get(resp_id, []),
+            "citations": citations.get(resp_id, []),
+        }
+        for resp_id, prompt_id, provider, turn in rows
+    ]
+
+
+async def _load_turn1_texts(
+    session, run_id: uuid.UUID, done_turns: dict[tuple[uuid.UUID, str], set[int]],
+) -> dict[tuple[uuid.UUID, str], str]:
+    """Stored T1 answers for unfinished units, so resume doesn't re-query them."""
+    partial = {key for key, turns in done_turns.items() if 1 in turns and not _unit_complete(turns)}
+    if not partial:
+        return {}
+    rows = (await session.execute(
+        select(GeoResponse.prompt_id, GeoResponse.provider, GeoResponse.raw_response)
+        .where(
+            GeoResponse.run_id == run_id,
+            GeoResponse.turn == 1,
+            GeoResponse.prompt_id.in_({p for p, _ in partial}),
+        )
+    )).all()
+    return {(p, prov): text for p, prov, text in rows if (p, prov) in partial}
+
+
 async def _query_single(provider_name: str, prompt_text: str):
     """Send a single standalone query to the LLM."""
     await rate_limiter.acquire(provider_name)
@@ -386,29 +775,3 @@ async def _match_citation_to_brand(session, project_id: uuid.UUID, domain: str)
     if bd:
         return bd.brand_id
     return None
-
-
-async def _update_job(
-    session, job_id: str, *, status: str | None = None, progress: float | None = None,
-    result: dict | None = None, step_info: dict | None = None
-):
-    """Update a BackgroundJob record."""
-    job_result = await session.execute(
-        select(BackgroundJob).where(BackgroundJob.id == uuid.UUID(job_id))
-    )
-    job = job_result.scalar_one_or_none()
-    if not job:
-        return
-    if status:
-        job.status = status
-        if status == "running" and not job.started_at:
-            job.started_at = datetime.now(timezone.utc)
-        if status == "completed":
-            job.completed_at = datetime.now(timezone.utc)
-    if progress is not None:
-        job.progress = progress
-    if result is not None:
-        job.result = result
-    if step_info is not None:
-        job.step_info = step_info
-    await session.commit()
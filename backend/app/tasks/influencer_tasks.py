@@ -3,17 +3,24 @@
 import asyncio
 import re
 import uuid
-from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import urlparse
 
-from sqlalchemy import delete as sa_delete, select
+from sqlalchemy import delete as sa_delete, or_, select
 
 from app.celery_app import celery
+from app.config import settings
 import app.database as _db
+from app.engines.influencer.instagram_enricher import InstagramEnricher
+from app.engines.influencer.profile_store import get_fresh_profiles, profile_key, save_profiles
+from app.engines.influencer.youtube_client import QuotaExhausted, YouTubeClient, build_channels
+from app.models.compat import upsert_insert
 from app.models.influencer import InfluencerResult
-from app.models.job import BackgroundJob
 from app.models.project import Brand
 from app.models.seo import SerpQuery
+from app.tasks.scheduler import run_with_slot
+from app.tasks.progress import JobProgress
+from app.utils import rate_limiter
 
 
 def _run_async(coro):
@@ -32,7 +39,9 @@ def _celery_task(**kwargs):
 
 @_celery_task(bind=True, name="influencers.run_search")
 def run_influencer_search(self, job_id: str, project_id: str, niche_id: str | None, niche_slug: str | None, platforms: list[str], num_results: int):
-    return _run_async(_run_influencer_search(job_id, project_id, niche_id, niche_slug, platforms, num_results))
+    return run_with_slot(self, "influencer_search", lambda: _run_async(
+        _run_influencer_search(job_id, project_id, niche_id, niche_slug, platforms, num_results)
+    ))
 
 
 async def _run_influencer_search(
@@ -42,9 +51,12 @@ async def _run_influencer_search(
     niche_slug: str | None,
     platforms: list[str],
     num_results: int,
+    session_factory=None,
 ) -> dict:
-    async with _db.async_session() as session:
-        await _update_job(session, job_id, status="running")
+    session_factory = session_factory or _db.async_session
+    reporter = JobProgress(job_id, session_factory=session_factory)
+    async with session_factory() as session:
+        await reporter.update(status="running")
 
         pid = uuid.UUID(project_id)
 
@@ -130,314 +142,42 @@ async def _run_influencer_search(
         # First short query is the primary; remaining are secondary broadening queries
         base_query = youtube_queries[0]
 
-        # ── Delete previous results for this project+niche (re-search) ──────
-        delete_q = sa_delete(InfluencerResult).where(InfluencerResult.project_id == pid)
-        if niche_slug:
-            delete_q = delete_q.where(InfluencerResult.niche_slug == niche_slug)
-        elif niche_id:
-            delete_q = delete_q.where(InfluencerResult.niche_id == uuid.UUID(niche_id))
-        await session.execute(delete_q)
-        await session.flush()
-
-        # ── Run SERP searches per platform ───────────────────────────────────
+        # ── Discover candidates: platforms and queries fan out concurrently ──
         from app.engines.seo import get_serp_provider
-        from app.utils import rate_limiter
-
-        total_platforms = len(platforms)
-        found: list[InfluencerResult] = []
 
         try:
             provider = get_serp_provider()
         except ValueError:
-            await _update_job(session, job_id, status="failed",
-                              error="No SERP provider configured (set SERPER_API_KEY)")
+            await reporter.update(status="failed", error="No SERP provider configured (set SERPER_API_KEY)")
             return {"error": "No SERP provider"}
 
-        from app.config import settings
-
-        for idx, platform in enumerate(platforms):
-            await _update_job(
-                session, job_id,
-                progress=(idx / total_platforms) * 0.8,
-                step_info={"platform": platform, "query": base_query},
-            )
+        await reporter.check_cancelled()
+        await reporter.update(
+            progress=0.1,
+            step_info={"platform": ", ".join(platforms), "query": base_query},
+        )
 
-            # ── YouTube: Data API v3 → SearchAPI → SERP ──────────────────
-            if platform == "youtube" and settings.youtube_api_key:
-                channels: list[dict] = []
-                existing_ids: set[str] = set()
-                for yt_query in youtube_queries:
-                    try:
-                        batch = await _search_youtube_channels(
-                            yt_query, max(num_results, 20), settings.youtube_api_key
-                        )
-                        for ch in batch:
-                            if ch["channel_id"] not in existing_ids:
-                                existing_ids.add(ch["channel_id"])
-                                channels.append({**ch, "_query": yt_query})
-                    except Exception as e:
-                        print(f"[influencer] YouTube API failed for '{yt_query}': {e}")
-
-                if channels:
-                    for pos, ch in enumerate(channels[:num_results], start=1):
-                        reason = _build_reason(
-                            platform="youtube",
-                            display_name=ch["title"],
-                            snippet=ch["description"],
-                            company_type=company_type,
-                            niche_keywords=niche_keywords,
-                        )
-                        score = max(0.0, 100 - (pos - 1) * 8)
-                        result = InfluencerResult(
-                            project_id=pid,
-                            niche_id=uuid.UUID(niche_id) if niche_id else None,
-                            niche_slug=niche_slug,
-                            job_id=uuid.UUID(job_id),
-                            platform="youtube",
-                            handle=ch.get("handle"),
-                            display_name=ch["title"],
-                            profile_url=ch["profile_url"],
-                            source_url=ch["profile_url"],
-                            subscribers=ch["subscribers"],
-                            snippet=ch["description"][:500] if ch["description"] else None,
-                            recommendation_reason=reason,
-                            relevance_score=round(score, 1),
-                            search_query=ch["_query"],
-                        )
-                        session.add(result)
-                        found.append(result)
-                    continue  # skip SERP for YouTube
-
-            # ── YouTube: SearchAPI.io fallback (no YouTube API key) ──────
-            if platform == "youtube" and settings.searchapi_key:
-                channels = []
-                existing_ids = set()
-                for yt_query in youtube_queries:
-                    try:
-                        batch = await _search_youtube_channels_searchapi(
-                            yt_query, max(num_results, 20), settings.searchapi_key
-                        )
-                        for ch in batch:
-                            if ch["channel_id"] not in existing_ids:
-                                existing_ids.add(ch["channel_id"])
-                                channels.append({**ch, "_query": yt_query})
-                    except Exception as e:
-                        print(f"[influencer] SearchAPI YouTube failed for '{yt_query}': {e}")
-
-                if channels:
-                    for pos, ch in enumerate(channels[:num_results], start=1):
-                        reason = _build_reason(
-                            platform="youtube",
-                            display_name=ch["title"],
-                            snippet=ch["description"],
-                            company_type=company_type,
-                            niche_keywords=niche_keywords,
-                        )
-                        score = max(0.0, 100 - (pos - 1) * 8)
-                        result = InfluencerResult(
-                            project_id=pid,
-                            niche_id=uuid.UUID(niche_id) if niche_id else None,
-                            niche_slug=niche_slug,
-                            job_id=uuid.UUID(job_id),
-                            platform="youtube",
-                            handle=ch.get("handle"),
-                            display_name=ch["title"],
-                            profile_url=ch["profile_url"],
-                            source_url=ch["profile_url"],
-                            subscribers=ch["subscribers"],
-                            snippet=ch["description"][:500] if ch["description"] else None,
-                            recommendation_reason=reason,
-                            relevance_score=round(score, 1),
-                            search_query=ch["_query"],
-                        )
-                        session.add(result)
-                        found.append(result)
-                    continue  # skip SERP for YouTube
-
-            # ── Instagram: Google CSE discovery + Apify enrichment ──────────
-            if platform == "instagram" and settings.google_cse_key and settings.google_cse_cx:
-                cse_profiles: list[dict] = []
-                for q in youtube_queries:
-                    try:
-                        batch = await _search_instagram_google_cse(
-                            q, max(num_results, 20),
-                            settings.google_cse_key, settings.google_cse_cx,
-                        )
-                        existing_urls = {p["profile_url"] for p in cse_profiles}
-                        cse_profiles += [p for p in batch if p["profile_url"] not in existing_urls]
-                    except Exception as e:
-                        print(f"[influencer] Google CSE Instagram failed for '{q}': {e}")
-
-                if cse_profiles:
-                    ig_handles = [p["handle"] for p in cse_profiles if p.get("handle")]
-
-                    # Try Apify first (if token set), fall back to free meta tag scraping
-                    apify_data: dict[str, int] = {}
-                    if settings.apify_token:
-                        try:
-                            apify_data = await _enrich_instagram_apify(ig_handles, settings.apify_token)
-                        except Exception as e:
-                            print(f"[influencer] Apify enrichment failed: {e}")
-                    if not apify_data:
-                        try:
-                            apify_data = await _enrich_instagram_metatag(ig_handles)
-                        except Exception as e:
-                            print(f"[influencer] Meta tag enrichment failed: {e}")
-
-                    for pos, p in enumerate(cse_profiles[:num_results], start=1):
-                        handle = p.get("handle")
-                        h_key = (handle or "").lstrip("@").lower()
-                        followers = apify_data.get(h_key) if h_key else None
-                        reason = _build_reason(
-                            platform="instagram",
-                            display_name=p["display_name"],
-                            snippet=p.get("snippet"),
-                            company_type=company_type,
-                            niche_keywords=niche_keywords,
-                        )
-                        score = max(0.0, 100 - (pos - 1) * 8)
-                        result = InfluencerResult(
-                            project_id=pid,
-                            niche_id=uuid.UUID(niche_id) if niche_id else None,
-                            niche_slug=niche_slug,
-                            job_id=uuid.UUID(job_id),
-                            platform="instagram",
-                            handle=handle,
-                            display_name=p["display_name"],
-                            profile_url=p["profile_url"],
-                            source_url=p["profile_url"],
-                            subscribers=followers or _extract_subscribers(p.get("snippet")),
-                            snippet=p["snippet"][:500] if p.get("snippet") else None,
-                            recommendation_reason=reason,
-                            relevance_score=round(score, 1),
-                            search_query=q,
-                        )
-                        session.add(result)
-                        found.append(result)
-                    continue  # skip SERP for Instagram
-
-            # ── SERP fallback (YouTube without API key, or Instagram) ──────
+        async def _discover(platform: str) -> list[dict]:
+            entries = None
             if platform == "youtube":
-                # Run all candidate queries to maximise results
-                serp_queries = []
-                for q in youtube_queries:
-                    serp_queries.append(f"site:youtube.com/@ {q}")
-                    serp_queries.append(f"youtuber {q} canal")
+                entries = await _discover_youtube(youtube_queries, num_results, session_factory)
             elif platform == "instagram":
-                # Build Instagram-specific SERP queries.
-                # Mix of: direct site: queries + "mejores influencers X instagram" articles
-                serp_queries = []
-                seen_q: set[str] = set()
-                _ig_topics: list[str] = []
-                if niche_words:
-                    _ig_topics.append(niche_words[0])
-                if ct_words:
-                    _ig_topics.append(ct_words[0])
-                if len(ct_words) >= 2 and f"{ct_words[0]} {ct_words[1]}" not in _ig_topics:
-                    _ig_topics.append(f"{ct_words[0]} {ct_words[1]}")
-
-                for topic in _ig_topics[:3]:
-                    # 1. Direct site: search (profile pages)
-                    q1 = f"site:instagram.com {topic} España"
-                    if q1 not in seen_q:
-                        seen_q.add(q1)
-                        serp_queries.append(q1)
-                    # 2. "mejores influencers X instagram" — article listings with IG URLs
-                    q2 = f"mejores influencers {topic} España instagram"
-                    if q2 not in seen_q:
-                        seen_q.add(q2)
-                        serp_queries.append(q2)
-
-                # Generic finance profiles fallback
-                q_fin = "site:instagram.com finanzas personales España"
-                if q_fin not in seen_q:
-                    serp_queries.append(q_fin)
+                entries = await _discover_instagram_cse(youtube_queries, num_results, session_factory)
             else:
-                continue
-
-            serp_items: list = []
-            seen_profile_urls: set[str] = set()
-
-            for serp_q in serp_queries:
-                try:
-                    await rate_limiter.acquire("serp")
-                    resp = await provider.search(
-                        serp_q,
-                        location="Spain",
-                        language="es",
-                        num_results=10,  # Serper free tier caps at 10 per request
-                    )
-                    serp_items.extend(resp.items)
-                except Exception as e:
-                    print(f"[influencer] SERP search failed for '{serp_q}': {e}")
-
-            # ── Collect profiles (deduplicated) before enrichment ────────
-            serp_profiles: list[dict] = []  # for Instagram enrichment
-            serp_profile_items: list[dict] = []  # full item data keyed by profile_url
-
-            for position, item in enumerate(serp_items, start=1):
-                if platform == "youtube" and "youtube.com" not in item.url:
-                    continue
-
-                handle, profile_url = _extract_profile(item.url, item.title, platform)
-                if not profile_url:
-                    continue
-                norm_url = profile_url.rstrip("/").lower()
-                if norm_url in seen_profile_urls:
-                    continue
-                seen_profile_urls.add(norm_url)
-
-                clean_handle = handle.lstrip("@") if handle else None
-
-                # For Instagram: fix display name (SERP titles are often article snippets)
-                if platform == "instagram":
-                    title_raw = item.title or ""
-                    _is_profile_title = any(
-                        m in title_raw.lower()
-                        for m in [" • instagram", " | instagram", " - instagram", "(@"]
-                    )
-                    if _is_profile_title:
-                        display_name = _clean_title(title_raw, "instagram") or clean_handle or ""
-                    else:
-                        raw_h = clean_handle or ""
-                        display_name = re.sub(r"[._]", " ", raw_h).title() if raw_h else _clean_title(title_raw, "instagram")
-                else:
-                    display_name = _clean_title(item.title, platform)
-
-                serp_profile_items.append({
-                    "handle": clean_handle,
-                    "display_name": display_name,
-                    "profile_url": profile_url,
-                    "source_url": item.url,
-                    "snippet": item.snippet,
-                    "position": position,
-                    "search_query": serp_q,
-                })
-                if platform == "instagram" and clean_handle:
-                    serp_profiles.append({"handle": clean_handle})
-
-            # ── For Instagram SERP: enrich follower counts via meta tag ──
-            serp_ig_followers: dict[str, int] = {}
-            if platform == "instagram" and serp_profiles:
-                ig_handles = [p["handle"] for p in serp_profiles]
-                try:
-                    serp_ig_followers = await _enrich_instagram_metatag(ig_handles)
-                except Exception as e:
-                    print(f"[influencer] Meta tag enrichment (SERP) failed: {e}")
-
-            # ── Save SERP results ────────────────────────────────────────
-            for entry in serp_profile_items[:max(num_results, 20)]:
-                clean_handle = entry["handle"]
-                h_key = (clean_handle or "").lower()
-                if platform == "instagram":
-                    subscribers = (
-                        serp_ig_followers.get(h_key)
-                        or _extract_subscribers(entry["snippet"])
-                        or _extract_subscribers(entry["display_name"])
-                    )
-                else:
-                    subscribers = _extract_subscribers(entry["snippet"]) or _extract_subscribers(entry["display_name"])
-
+                return []
+            if entries is None:
+                serp_queries = _build_serp_queries(platform, youtube_queries, niche_words, ct_words)
+                entries = await _discover_serp(platform, serp_queries, num_results, provider, session_factory)
+            return entries
+
+        discovered = await asyncio.gather(*(_discover(p) for p in platforms))
+        await reporter.check_cancelled()
+        await reporter.update(progress=0.8)
+
+        # ── Save: one upsert for all results, then drop the stale ones ──────
+        rows: dict[tuple[str, str], dict] = {}
+        for platform, entries in zip(platforms, discovered):
+            for entry in entries:
                 reason = _build_reason(
                     platform=platform,
                     display_name=entry["display_name"],
@@ -446,29 +186,28 @@ async def _run_influencer_search(
                     niche_keywords=niche_keywords,
                 )
                 score = max(0.0, 100 - (entry["position"] - 1) * 8)
+                rows.setdefault((platform, entry["profile_url"]), {
+                    "id": uuid.uuid4(),
+                    "project_id": pid,
+                    "niche_id": uuid.UUID(niche_id) if niche_id else None,
+                    "niche_slug": niche_slug,
+                    "job_id": uuid.UUID(job_id),
+                    "platform": platform,
+                    "handle": entry["handle"],
+                    "display_name": entry["display_name"],
+                    "profile_url": entry["profile_url"],
+                    "source_url": entry["source_url"],
+                    "subscribers": entry["subscribers"],
+                    "snippet": entry["snippet"][:500] if entry["snippet"] else None,
+                    "recommendation_reason": reason,
+                    "relevance_score": round(score, 1),
+                    "search_query": entry["search_query"],
+                })
+        found = list(rows.values())
+        await _save_results(session, found, pid, niche_id, niche_slug, uuid.UUID(job_id))
 
-                result = InfluencerResult(
-                    project_id=pid,
-                    niche_id=uuid.UUID(niche_id) if niche_id else None,
-                    niche_slug=niche_slug,
-                    job_id=uuid.UUID(job_id),
-                    platform=platform,
-                    handle=clean_handle,
-                    display_name=entry["display_name"],
-                    profile_url=entry["profile_url"],
-                    source_url=entry["source_url"],
-                    subscribers=subscribers,
-                    snippet=entry["snippet"][:500] if entry["snippet"] else None,
-                    recommendation_reason=reason,
-                    relevance_score=round(score, 1),
-                    search_query=entry["search_query"],
-                )
-                session.add(result)
-                found.append(result)
-
-        await session.flush()
-        await _update_job(
-            session, job_id,
+        await session.commit()
+        await reporter.update(
             status="completed",
             progress=1.0,
             result={"total": len(found), "platforms": platforms},
@@ -477,141 +216,304 @@ async def _run_influencer_search(
     return {"total": len(found)}
 
 
-# ── Helpers ──────────────────────────────────────────────────────────────────
+async def _save_results(
+    session, rows: list[dict], pid: uuid.UUID, niche_id: str | None, niche_slug: str | None,
+    job_id: uuid.UUID,
+) -> None:
+    """Upsert this search's results and delete the previous ones it didn't find again.
 
-async def _search_youtube_channels(query: str, num_results: int, api_key: str) -> list[dict]:
-    """Search YouTube channels via YouTube Data API v3.
-
-    Returns list of dicts: {channel_id, title, description, profile_url, handle, subscribers}
+    Rows are keyed on (project, niche_slug, platform, profile_url): creators
+    found again keep their id and created_at and only get the new data and
+    job_id, so everything this job didn't touch is stale.
     """
-    import httpx
-
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.get(
-            "https://www.googleapis.com/youtube/v3/search",
-            params={
-                "part": "snippet",
-                "q": query,
-                "type": "channel",
-                "maxResults": 50,          # always fetch max to sort by audience
-                "relevanceLanguage": "es",  # no regionCode — include all Spanish-language channels
-                "key": api_key,
+    if rows:
+        stmt = upsert_insert(InfluencerResult, session).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["project_id", "niche_slug", "platform", "profile_url"],
+            set_={
+                col: stmt.excluded[col]
+                for col in rows[0]
+                if col not in ("id", "project_id", "niche_slug", "platform", "profile_url")
             },
         )
-        resp.raise_for_status()
-        items = resp.json().get("items", [])
+        await session.execute(stmt)
+
+    stale = sa_delete(InfluencerResult).where(
+        InfluencerResult.project_id == pid,
+        or_(InfluencerResult.job_id.is_(None), InfluencerResult.job_id != job_id),
+    )
+    if niche_slug:
+        stale = stale.where(InfluencerResult.niche_slug == niche_slug)
+    elif niche_id:
+        stale = stale.where(InfluencerResult.niche_id == uuid.UUID(niche_id))
+    await session.execute(stale)
+
+
+# ── Discovery (one concurrent round per stage) ───────────────────────────────
+# Each returns candidate entries ready to save: {handle, display_name,
+# profile_url, source_url, snippet, subscribers, position, search_query}.
+# Queries run with asyncio.gather and are merged back in query order, so the
+# dedup and ranking are the same as running them one by one.
+
+async def _gather_queries(label: str, queries: list[str], fetch) -> list[tuple[str, list]]:
+    """Run fetch(query) for every query concurrently; failed queries are skipped."""
+    batches = await asyncio.gather(*(fetch(q) for q in queries), return_exceptions=True)
+    ok = []
+    for q, batch in zip(queries, batches):
+        if isinstance(batch, Exception):
+            print(f"[influencer] {label} failed for '{q}': {batch}")
+            continue
+        ok.append((q, batch))
+    return ok
+
 
-    if not items:
+async def _youtube_api_batches(queries: list[str], session_factory) -> list[tuple[str, list[dict]]]:
+    """YouTube Data API: search.list per query, then one merged channels.list pass."""
+    try:
+        async with YouTubeClient(settings.youtube_api_key, session_factory=session_factory) as yt:
+            searches = await yt.search_channels(queries)
+            channel_ids = [
+                item["id"]["channelId"]
+                for _, items in searches
+                for item in items
+                if item.get("id", {}).get("channelId")
+            ]
+            details = await yt.channel_details(channel_ids)
+    except QuotaExhausted as e:
+        print(f"[influencer] {e} — falling back")
         return []
+    return [(q, build_channels(items, details)) for q, items in searches]
+
+
+async def _discover_youtube(queries: list[str], num_results: int, session_factory) -> list[dict] | None:
+    """YouTube Data API v3, then SearchAPI.io. None means: use the SERP fallback."""
+    sources = []
+    if settings.youtube_api_key:
+        sources.append(lambda: _youtube_api_batches(queries, session_factory))
+    if settings.searchapi_key:
+        sources.append(lambda: _gather_queries(
+            "SearchAPI YouTube", queries,
+            lambda q: _search_youtube_channels_searchapi(q, max(num_results, 20), settings.searchapi_key),
+        ))
+
+    for fetch in sources:
+        batches = await fetch()
+        channels: list[dict] = []
+        seen: set[str] = set()
+        for q, batch in batches:
+            for ch in batch:
+                key = (ch.get("handle") or "").lower() or ch["channel_id"]
+                if ch["channel_id"] in seen or key in seen:
+                    continue
+                seen.update((ch["channel_id"], key))
+                channels.append({**ch, "_query": q})
+        if channels:
+            return [
+                {
+                    "handle": ch.get("handle"),
+                    "display_name": ch["title"],
+                    "profile_url": ch["profile_url"],
+                    "source_url": ch["profile_url"],
+                    "snippet": ch["description"],
+                    "subscribers": ch["subscribers"],
+                    "position": pos,
+                    "search_query": ch["_query"],
+                }
+                for pos, ch in enumerate(channels[:num_results], start=1)
+            ]
+    return None
+
+
+async def _discover_instagram_cse(queries: list[str], num_results: int, session_factory) -> list[dict] | None:
+    """Google CSE discovery + Apify/meta-tag enrichment. None means: use SERP."""
+    if not (settings.google_cse_key and settings.google_cse_cx):
+        return None
+
+    batches = await _gather_queries(
+        "Google CSE Instagram", queries,
+        lambda q: _search_instagram_google_cse(
+            q, max(num_results, 20), settings.google_cse_key, settings.google_cse_cx,
+            session_factory=session_factory,
+        ),
+    )
+    profiles: list[dict] = []
+    seen: set[str] = set()
+    for q, batch in batches:
+        for p in batch:
+            key = (p.get("handle") or "").lower() or p["profile_url"].rstrip("/").lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            profiles.append({**p, "_query": q})
+    if not profiles:
+        return None
+
+    ig_handles = [p["handle"] for p in profiles if p.get("handle")]
 
-    # Batch fetch subscriber counts
-    channel_ids = [
-        item["id"]["channelId"]
+    # Try Apify first (if token set), fall back to free meta tag scraping
+    followers_by_handle: dict[str, int] = {}
+    if settings.apify_token:
+        try:
+            followers_by_handle = await _enrich_instagram_apify(
+                ig_handles, settings.apify_token, session_factory=session_factory,
+            )
+        except Exception as e:
+            print(f"[influencer] Apify enrichment failed: {e}")
+    if not followers_by_handle:
+        try:
+            followers_by_handle = await _enrich_instagram_metatag(ig_handles, session_factory=session_factory)
+        except Exception as e:
+            print(f"[influencer] Meta tag enrichment failed: {e}")
+
+    entries = []
+    for pos, p in enumerate(profiles[:num_results], start=1):
+        handle = p.get("handle")
+        h_key = (handle or "").lstrip("@").lower()
+        followers = followers_by_handle.get(h_key) if h_key else None
+        entries.append({
+            "handle": handle,
+            "display_name": p["display_name"],
+            "profile_url": p["profile_url"],
+            "source_url": p["profile_url"],
+            "snippet": p.get("snippet"),
+            "subscribers": followers or _extract_subscribers(p.get("snippet")),
+            "position": pos,
+            "search_query": p["_query"],
+        })
+    return entries
+
+
+def _build_serp_queries(
+    platform: str, youtube_queries: list[str], niche_words: list[str], ct_words: list[str],
+) -> list[str]:
+    """SERP fallback queries (YouTube without API key, or Instagram without CSE)."""
+    if platform == "youtube":
+        # Run all candidate queries to maximise results
+        serp_queries = []
+        for q in youtube_queries:
+            serp_queries.append(f"site:youtube.com/@ {q}")
+            serp_queries.append(f"youtuber {q} canal")
+        return serp_queries
+
+    # Build Instagram-specific SERP queries.
+    # Mix of: direct site: queries + "mejores influencers X instagram" articles
+    serp_queries = []
+    seen_q: set[str] = set()
+    _ig_topics: list[str] = []
+    if niche_words:
+        _ig_topics.append(niche_words[0])
+    if ct_words:
+        _ig_topics.append(ct_words[0])
+    if len(ct_words) >= 2 and f"{ct_words[0]} {ct_words[1]}" not in _ig_topics:
+        _ig_topics.append(f"{ct_words[0]} {ct_words[1]}")
+
+    for topic in _ig_topics[:3]:
+        # 1. Direct site: search (profile pages)
+        q1 = f"site:instagram.com {topic} España"
+        if q1 not in seen_q:
+            seen_q.add(q1)
+            serp_queries.append(q1)
+        # 2. "mejores influencers X instagram" — article listings with IG URLs
+        q2 = f"mejores influencers {topic} España instagram"
+        if q2 not in seen_q:
+            seen_q.add(q2)
+            serp_queries.append(q2)
+
+    # Generic finance profiles fallback
+    q_fin = "site:instagram.com finanzas personales España"
+    if q_fin not in seen_q:
+        serp_queries.append(q_fin)
+    return serp_queries
+
+
+async def _discover_serp(
+    platform: str, serp_queries: list[str], num_results: int, provider, session_factory,
+) -> list[dict]:
+    """Google SERP fallback: profile URLs found in organic results."""
+
+    async def _search(q: str) -> list:
+        await rate_limiter.acquire("serp")
+        resp = await provider.search(
+            q,
+            location="Spain",
+            language="es",
+            num_results=10,  # Serper free tier caps at 10 per request
+        )
+        return resp.items
+
+    serp_items = [
+        (item, q)
+        for q, items in await _gather_queries("SERP search", serp_queries, _search)
         for item in items
-        if item.get("id", {}).get("channelId")
     ]
-    # Music topic IDs — channels with exclusively these topics are auto-generated artists
-    MUSIC_TOPIC_IDS = {
-        "/m/04rlf", "/m/02mscn", "/m/0ggq0m", "/m/01lyv", "/m/02lkt",
-        "/m/0glt670", "/m/05rwpb", "/m/03_d0", "/m/028sqc", "/m/0g293",
-        "/m/064t9", "/m/06j6l", "/m/06by7", "/m/0gywn",
-    }
-
-    stats: dict[str, dict] = {}
-    if channel_ids:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            stats_resp = await client.get(
-                "https://www.googleapis.com/youtube/v3/channels",
-                params={
-                    "part": "statistics,snippet,topicDetails",
-                    "id": ",".join(channel_ids),
-                    "key": api_key,
-                },
-            )
-            if stats_resp.status_code == 200:
-                for item in stats_resp.json().get("items", []):
-                    cid = item["id"]
-                    title = item.get("snippet", {}).get("title", "")
-                    description = item.get("snippet", {}).get("description", "")
-                    subs = item.get("statistics", {}).get("subscriberCount")
-                    raw_handle = item.get("snippet", {}).get("customUrl") or ""
-                    # customUrl comes as "@channelname" — store without leading @ so the
-                    # frontend can render "@{handle}" without double-@
-                    handle = raw_handle.lstrip("@") or None
-                    topic_ids = set(item.get("topicDetails", {}).get("topicIds", []))
-
-                    # Skip auto-generated music/topic channels
-                    if title.endswith("- Topic"):
-                        continue
-                    if "Auto-generated by YouTube" in description:
-                        continue
-                    if topic_ids and topic_ids.issubset(MUSIC_TOPIC_IDS):
-                        continue
-
-                    # Skip corporate brand channels — detect by description content.
-                    # Brand channels say "somos", "nuestros servicios", etc. while
-                    # creator channels say "mi canal", "te enseño", "soy", etc.
-                    desc_lc = description.lower()[:600]
-                    _corp = [
-                        "nuestros servicios", "nuestra plataforma", "nuestros clientes",
-                        "te ayudamos", "somos una empresa", "somos un equipo",
-                        "descubre nuestro", "conoce nuestros", "ofrecemos",
-                        "nuestros productos", "nuestra app", "nuestra aplicación",
-                        "our services", "our platform", "our clients",
-                        # Financial brand patterns (e.g. MyInvestor)
-                        "miles de clientes", "abre tu cuenta", "tu banca",
-                        "tu cuenta corriente", "únete a los", "gestión automatizada",
-                        "pon tu dinero a trabajar", "gestora de fondos",
-                        "nuestras tarifas", "nuestra app de inversión",
-                    ]
-                    _creator = ["mi canal", "soy ", "en este canal", "te enseño", "comparto",
-                                "mis videos", "mis análisis", "mi experiencia", "sígueme",
-                                "me llamo", "suscríbete"]
-                    corp_score = sum(1 for p in _corp if p in desc_lc)
-                    creator_score = sum(1 for p in _creator if p in desc_lc)
-                    # Also flag if the brand name appears in the first sentence of description
-                    # (brand channels promote themselves: "Bienvenido a MyInvestor...")
-                    title_first_word = title.lower().split()[0] if title else ""
-                    if (len(title_first_word) > 4 and
-                            title_first_word in desc_lc[:150] and
-                            creator_score == 0):
-                        corp_score += 2
-                    if corp_score >= 2 and creator_score == 0:
-                        continue
-
-                    stats[cid] = {
-                        "subscribers": int(subs) if subs else None,
-                        "handle": handle,
-                        "title": title,
-                        "description": description,
-                    }
 
-    results = []
-    for item in items:
-        channel_id = item.get("id", {}).get("channelId")
-        if not channel_id or channel_id not in stats:
+    # ── Collect profiles (deduplicated) before enrichment ────────
+    serp_profile_items: list[dict] = []
+    seen_profile_urls: set[str] = set()
+    seen_handles: set[str] = set()
+
+    for position, (item, serp_q) in enumerate(serp_items, start=1):
+        if platform == "youtube" and "youtube.com" not in item.url:
             continue
-        ch_stats = stats[channel_id]
-        snippet = item.get("snippet", {})
-        handle = ch_stats.get("handle")  # stored without leading @
-        profile_url = (
-            f"https://www.youtube.com/@{handle}"
-            if handle
-            else f"https://www.youtube.com/channel/{channel_id}"
-        )
-        results.append({
-            "channel_id": channel_id,
-            "title": ch_stats.get("title") or snippet.get("title", ""),
-            "description": ch_stats.get("description") or snippet.get("description", ""),
+
+        handle, profile_url = _extract_profile(item.url, item.title, platform)
+        if not profile_url:
+            continue
+        norm_url = profile_url.rstrip("/").lower()
+        clean_handle = handle.lstrip("@") if handle else None
+        if norm_url in seen_profile_urls or (clean_handle and clean_handle.lower() in seen_handles):
+            continue
+        seen_profile_urls.add(norm_url)
+        if clean_handle:
+            seen_handles.add(clean_handle.lower())
+
+        # For Instagram: fix display name (SERP titles are often article snippets)
+        if platform == "instagram":
+            title_raw = item.title or ""
+            _is_profile_title = any(
+                m in title_raw.lower()
+                for m in [" • instagram", " | instagram", " - instagram", "(@"]
+            )
+            if _is_profile_title:
+                display_name = _clean_title(title_raw, "instagram") or clean_handle or ""
+            else:
+                raw_h = clean_handle or ""
+                display_name = _HANDLE_SEPARATORS_RE.sub(" ", raw_h).title() if raw_h else _clean_title(title_raw, "instagram")
+        else:
+            display_name = _clean_title(item.title, platform)
+
+        serp_profile_items.append({
+            "handle": clean_handle,
+            "display_name": display_name,
             "profile_url": profile_url,
-            "handle": handle,
-            "subscribers": ch_stats.get("subscribers"),
+            "source_url": item.url,
+            "snippet": item.snippet,
+            "position": position,
+            "search_query": serp_q,
         })
 
-    # Keep YouTube's relevance ordering — it already ranks most relevant channels first.
-    # (Sorting by subscribers here would push large off-topic channels to the top.)
-    return results
+    # ── For Instagram SERP: enrich follower counts via meta tag ──
+    serp_ig_followers: dict[str, int] = {}
+    if platform == "instagram":
+        ig_handles = [e["handle"] for e in serp_profile_items if e["handle"]]
+        if ig_handles:
+            try:
+                serp_ig_followers = await _enrich_instagram_metatag(ig_handles, session_factory=session_factory)
+            except Exception as e:
+                print(f"[influencer] Meta tag enrichment (SERP) failed: {e}")
+
+    entries = serp_profile_items[:max(num_results, 20)]
+    for entry in entries:
+        h_key = (entry["handle"] or "").lower()
+        entry["subscribers"] = (
+            (serp_ig_followers.get(h_key) if platform == "instagram" else None)
+            or _extract_subscribers(entry["snippet"])
+            or _extract_subscribers(entry["display_name"])
+        )
+    return entries
+
 
+# ── Helpers ──────────────────────────────────────────────────────────────────
 
 async def _search_youtube_channels_searchapi(query: str, num_results: int, api_key: str) -> list[dict]:
     """Search YouTube channels via SearchAPI.io (engine=youtube, type=channel).
@@ -621,6 +523,7 @@ async def _search_youtube_channels_searchapi(query: str, num_results: int, api_k
     """
     import httpx
 
+    await rate_limiter.acquire("searchapi")
     async with httpx.AsyncClient(timeout=20.0) as client:
         resp = await client.get(
             "https://www.searchapi.io/api/v1/search",
@@ -700,7 +603,7 @@ async def _search_youtube_channels_searchapi(query: str, num_results: int, api_k
 
 
 async def _search_instagram_google_cse(
-    query: str, num_results: int, api_key: str, cx: str
+    query: str, num_results: int, api_key: str, cx: str, session_factory=None,
 ) -> list[dict]:
     """Discover Instagram profiles via Google Custom Search Engine.
 
@@ -715,6 +618,14 @@ async def _search_instagram_google_cse(
     # Google CSE max 10 per request; paginate up to num_results
     start = 1
     while len(profiles) < num_results and start <= 91:
+        # Every page is one request against the daily quota
+        if not await rate_limiter.take_daily(
+            "google_cse", settings.google_cse_daily_limit, session_factory=session_factory,
+        ):
+            if not profiles:
+                raise RuntimeError("Google CSE daily quota reached")
+            break
+        await rate_limiter.acquire("google_cse")
         async with httpx.AsyncClient(timeout=15.0) as client:
             resp = await client.get(
                 "https://www.googleapis.com/customsearch/v1",
@@ -757,7 +668,7 @@ async def _search_instagram_google_cse(
                 display_name = _clean_title(title_raw, "instagram") or (handle or "").lstrip("@")
             else:
                 raw_handle = (handle or "").lstrip("@")
-                display_name = re.sub(r"[._]", " ", raw_handle).title() if raw_handle else ""
+                display_name = _HANDLE_SEPARATORS_RE.sub(" ", raw_handle).title() if raw_handle else ""
             profiles.append({
                 "handle": (handle or "").lstrip("@") or None,
                 "display_name": display_name,
@@ -775,59 +686,63 @@ async def _search_instagram_google_cse(
     return profiles
 
 
-async def _enrich_instagram_metatag(handles: list[str]) -> dict[str, int]:
+async def _stored_followers(
+    handles: list[str], session_factory,
+) -> tuple[dict[str, int], list[str]]:
+    """Split handles into fresh follower counts from the profile store and
+    the handles that still need a network lookup."""
+    keys = [profile_key("instagram", h) for h in handles]
+    async with session_factory() as session:
+        fresh = await get_fresh_profiles(session, "instagram", keys)
+    known = {k: p.followers for k, p in fresh.items() if p.followers}
+    missing = [h for h, k in zip(handles, keys) if k not in fresh]
+    return known, missing
+
+
+async def _store_followers(followers: dict[str, int], session_factory) -> None:
+    async with session_factory() as session:
+        await save_profiles(session, "instagram", [
+            {"key": profile_key("instagram", h), "handle": h, "followers": n}
+            for h, n in followers.items()
+        ])
+
+
+async def _enrich_instagram_metatag(handles: list[str], session_factory=None) -> dict[str, int]:
     """Fetch Instagram follower counts for a list of handles by scraping the
     og:description meta tag from each profile page.
 
     Format: "600M Followers, 500 Following, 3.5K Posts - See Instagram photos..."
-    Free and requires no API key.  Throttled to avoid IP blocks.
+    Free and requires no API key. Fetching is concurrent and throttled per
+    host by InstagramEnricher (see instagram_enrich_* settings). Handles with
+    a fresh entry in the profile store are not fetched.
     """
-    import httpx
+    session_factory = session_factory or _db.async_session
+    known, handles = await _stored_followers(handles, session_factory)
 
+    descriptions = await InstagramEnricher().fetch_descriptions(handles)
     result: dict[str, int] = {}
-    # Use a realistic browser User-Agent to reduce block rate
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/122.0.0.0 Safari/537.36"
-        ),
-        "Accept-Language": "es-ES,es;q=0.9",
-    }
-    for handle in handles[:30]:  # cap at 30 to avoid IP blocks
-        h = handle.lstrip("@")
-        try:
-            async with httpx.AsyncClient(timeout=10.0, headers=headers, follow_redirects=True) as client:
-                resp = await client.get(f"https://www.instagram.com/{h}/")
-            if resp.status_code != 200:
-                continue
-            # Find og:description meta tag
-            m = re.search(r'<meta\s+property="og:description"\s+content="([^"]*)"', resp.text)
-            if not m:
-                m = re.search(r'<meta\s+content="([^"]*)"\s+property="og:description"', resp.text)
-            if m:
-                content = m.group(1)
-                followers = _extract_subscribers(content)
-                if followers:
-                    result[h.lower()] = followers
-        except Exception:
-            pass
-        # Small delay to be polite
-        await asyncio.sleep(0.5)
-    return result
-
-
-async def _enrich_instagram_apify(handles: list[str], token: str) -> dict[str, int]:
+    for h, content in descriptions.items():
+        followers = _extract_subscribers(content)
+        if followers:
+            result[h] = followers
+    await _store_followers(result, session_factory)
+    return {**known, **result}
+
+
+async def _enrich_instagram_apify(handles: list[str], token: str, session_factory=None) -> dict[str, int]:
     """Fetch Instagram follower counts for a batch of handles via Apify.
 
     Uses actor apify/instagram-profile-scraper (run-sync, waits for result).
     Returns dict mapping handle → followers_count.
-    Free tier: ~$5/mo credit ≈ 2,500 profiles/month.
+    Free tier: ~$5/mo credit ≈ 2,500 profiles/month — handles with a fresh
+    entry in the profile store are not sent.
     """
     import httpx
 
+    session_factory = session_factory or _db.async_session
+    known, handles = await _stored_followers(handles, session_factory)
     if not handles:
-        return {}
+        return known
 
     async with httpx.AsyncClient(timeout=120.0) as client:
         # Run the actor synchronously and get dataset items directly
@@ -838,7 +753,7 @@ async def _enrich_instagram_apify(handles: list[str], token: str) -> dict[str, i
         )
         if resp.status_code not in (200, 201):
             print(f"[influencer] Apify returned {resp.status_code}: {resp.text[:200]}")
-            return {}
+            return known
         items = resp.json()
 
     result: dict[str, int] = {}
@@ -847,7 +762,8 @@ async def _enrich_instagram_apify(handles: list[str], token: str) -> dict[str, i
         followers = item.get("followersCount") or item.get("followers_count")
         if username and isinstance(followers, int):
             result[username] = followers
-    return result
+    await _store_followers(result, session_factory)
+    return {**known, **result}
 
 
 def _extract_profile(url: str, title: str, platform: str) -> tuple[str | None, str | None]:
@@ -901,6 +817,15 @@ def _extract_profile(url: str, title: str, platform: str) -> tuple[str | None, s
     return None, url
 
 
+_COUNT_RE = re.compile(
+    r"([\d][\d,.]*)\s*([KMBkmb]?)\s*(subscribers?|followers?|suscriptores?|seguidores?)",
+    re.IGNORECASE,
+)
+_IG_HANDLE_SUFFIX_RE = re.compile(r"\s*\(@[^)]+\)\s*$")
+_HANDLE_SEPARATORS_RE = re.compile(r"[._]")
+
+
+@lru_cache(maxsize=4096)
 def _extract_subscribers(text: str | None) -> int | None:
     """Try to parse subscriber/follower count from SERP snippet or title.
 
@@ -909,11 +834,7 @@ def _extract_subscribers(text: str | None) -> int | None:
     """
     if not text:
         return None
-    m = re.search(
-        r"([\d][\d,.]*)\s*([KMBkmb]?)\s*(subscribers?|followers?|suscriptores?|seguidores?)",
-        text,
-        re.IGNORECASE,
-    )
+    m = _COUNT_RE.search(text)
     if not m:
         return None
     try:
@@ -948,46 +869,6 @@ def _extract_subscribers(text: str | None) -> int | None:
         return None
 
 
-def _is_non_spanish(text: str) -> bool:
-    """Return True if text appears to be in a non-Spanish language (e.g. Portuguese, English).
-
-    Uses a lightweight heuristic: count exclusive marker words for each language.
-    Avoids heavy dependencies like langdetect.
-    """
-    if not text:
-        return False
-    t = text.lower()
-
-    # Strong Portuguese markers (words that don't appear in Spanish)
-    pt_markers = [
-        "você", "vocês", "estou", "estão", "também", "porque", "então",
-        "nosso", "nossa", "muito", "obrigado", "obrigada", "já", "ainda",
-        "canal", "vídeo", "inscreva", "inscreva-se", "siga-nos",
-        " em ", " para ", " com ", " como ", " mas ", " por ", " sem ",
-    ]
-    # Strong English markers
-    en_markers = [
-        " the ", " and ", " with ", " for ", " this ", " from ", " that ",
-        " have ", " will ", " about ", " your ", " our ", "subscribe",
-        "unboxing", "review", "tutorial",
-    ]
-    # Spanish markers (to confirm it IS Spanish, reduce false positives)
-    es_markers = [
-        " el ", " la ", " los ", " las ", " en ", " con ", " por ",
-        " que ", " de ", " del ", " un ", " una ", " es ",
-        "español", "españa", "canal", "suscríbete", "sígueme",
-    ]
-
-    pt_score = sum(1 for w in pt_markers if w in t)
-    en_score = sum(1 for w in en_markers if w in t)
-    es_score = sum(1 for w in es_markers if w in t)
-
-    # If clearly Portuguese or English AND not clearly Spanish → reject
-    if (pt_score >= 2 or en_score >= 3) and es_score <= 1:
-        return True
-    return False
-
-
 def _clean_title(title: str, platform: str) -> str:
     """Return a clean display name from a SERP title."""
     if platform == "instagram":
@@ -999,13 +880,13 @@ def _clean_title(title: str, platform: str) -> str:
         elif " - Instagram" in title:
             title = title.split(" - Instagram")[0].strip()
         # Strip trailing " (@handle)" — keep only the real name
-        title = re.sub(r"\s*\(@[^)]+\)\s*$", "", title).strip()
+        title = _IG_HANDLE_SUFFIX_RE.sub("", title).strip()
         # Strip leading "@" if present
         title = title.lstrip("@").strip()
         # If result looks like a raw handle (lowercase + underscores/dots, no spaces),
         # format it as readable words
         if title and title == title.lower() and " " not in title:
-            title = re.sub(r"[._]", " ", title).title()
+            title = _HANDLE_SEPARATORS_RE.sub(" ", title).title()
         return title
 
     for suffix in (" - YouTube", " • YouTube", " | YouTube", " - YouTube Music", " • YouTube Music"):
@@ -1034,37 +915,3 @@ def _build_reason(
         if len(first_sentence) > 20:
             return f"Creador de {platform_label} sobre {topic}. {first_sentence}."
     return f"Creador de contenido en {platform_label} especializado en {topic}."
-
-
-async def _update_job(
-    session,
-    job_id: str,
-    *,
-    status: str | None = None,
-    progress: float | None = None,
-    result: dict | None = None,
-    step_info: dict | None = None,
-    error: str | None = None,
-):
-    from sqlalchemy import select as sa_select
-    job_result = await session.execute(
-        sa_select(BackgroundJob).where(BackgroundJob.id == uuid.UUID(job_id))
-    )
-    job = job_result.scalar_one_or_none()
-    if not job:
-        return
-    if status:
-        job.status = status
-        if status == "running" and not job.started_at:
-            job.started_at = datetime.now(timezone.utc)
-        if status in ("completed", "failed"):
-            job.completed_at = datetime.now(timezone.utc)
-    if progress is not None:
-        job.progress = progress
-    if result is not None:
-        job.result = result
-    if step_info is not None:
-        job.step_info = step_info
-    if error is not None:
-        job.error = error
-    await session.commit()
@@ -1,10 +1,13 @@
 """Inline task runner for local dev (no Redis/Celery required).
 
-When redis_url is empty, tasks run in a background thread with their
-own event loop and a fresh DB engine — same pattern as Celery workers.
+When redis_url is empty, tasks run on a small pool of long-lived worker
+threads. Each worker owns one event loop and one DB engine for its whole
+lifetime (same pattern as a Celery worker process), and the session
+factory is handed to the task explicitly — nothing global is patched.
 """
 
 import asyncio
+import itertools
 import threading
 import traceback
 import uuid
@@ -12,58 +15,143 @@ from datetime import datetime, timezone
 
 from app.config import settings
 
+# Pending jobs: (priority, seq, job_type, coro_factory, job_id)
+_pending: list[tuple] = []
+_running: dict[str, int] = {}  # job_type -> jobs currently running
+_cond = threading.Condition()
+_seq = itertools.count()
+_workers: list[threading.Thread] = []
+_stopping = False
+
 
 def use_inline() -> bool:
     """Return True if we should run tasks inline (no Redis)."""
     return not settings.redis_url
 
 
-def dispatch_inline(coro_factory, job_id: str | None = None):
-    """Schedule an async task to run in a background thread.
+def dispatch_inline(coro_factory, job_id: str | None = None, job_type: str | None = None):
+    """Queue an async task for the inline worker pool.
 
-    coro_factory: a zero-argument callable that returns a coroutine.
+    coro_factory: a callable taking the worker's session factory and
+        returning a coroutine, e.g. ``lambda sf: _run_x(..., session_factory=sf)``.
     job_id: optional BackgroundJob ID to mark as failed on exception.
+    job_type: BackgroundJob.job_type — selects the queue priority and the
+        per-type concurrency cap (see app.tasks.scheduler).
 
-    Runs the task in a separate thread with a fresh DB engine
-    (the main engine's connections can't cross threads/event loops).
+    At most ``settings.inline_workers`` jobs run concurrently; the rest
+    wait, interactive jobs ahead of bulk ones.
     """
-
-    def _target():
-        import sys
-        import app.database as db_module
-        from app.database import create_worker_session
-
-        print(f"[inline_runner] Thread started for job={job_id}", flush=True)
-
-        # Patch async_session for this thread so all task code
-        # (geo_tasks, seo_tasks, etc.) uses the fresh engine
-        original_session = db_module.async_session
-        worker_session = create_worker_session()
-        db_module.async_session = worker_session
-
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    from app.tasks.scheduler import priority_for
+
+    _ensure_pool()
+    priority = priority_for(job_type) if job_type else 0
+    with _cond:
+        _pending.append((priority, next(_seq), job_type, coro_factory, job_id))
+        _pending.sort(key=lambda p: (p[0], p[1]))
+        _cond.notify_all()
+        pending = len(_pending)
+    print(f"[inline_runner] Job queued: job={job_id} type={job_type} (pending={pending})", flush=True)
+
+
+def discard_pending(job_id: str) -> bool:
+    """Drop a job that hasn't started yet. Returns True if it was pending."""
+    with _cond:
+        for i, item in enumerate(_pending):
+            if item[4] == job_id:
+                del _pending[i]
+                return True
+    return False
+
+
+def shutdown_inline_pool(timeout: float = 5.0):
+    """Stop the worker threads and dispose their engines."""
+    global _stopping
+    with _cond:
+        workers = list(_workers)
+        _workers.clear()
+        _stopping = True
+        _cond.notify_all()
+    for thread in workers:
+        thread.join(timeout=timeout)
+    with _cond:
+        _stopping = False
+
+
+def _ensure_pool():
+    with _cond:
+        if _workers:
+            return
+        for i in range(max(1, settings.inline_workers)):
+            thread = threading.Thread(target=_worker_loop, daemon=True, name=f"inline-worker-{i}")
+            thread.start()
+            _workers.append(thread)
+
+
+def _next_job():
+    """Block until a job whose type is under its cap is available (None = stop)."""
+    from app.tasks.scheduler import max_concurrency
+
+    with _cond:
+        while True:
+            if _stopping:
+                return None
+            for i, item in enumerate(_pending):
+                job_type = item[2]
+                cap = max_concurrency(job_type) if job_type else 0
+                if cap <= 0 or _running.get(job_type, 0) < cap:
+                    del _pending[i]
+                    if job_type:
+                        _running[job_type] = _running.get(job_type, 0) + 1
+                    return item
+            _cond.wait()
+
+
+def _job_done(job_type: str | None):
+    with _cond:
+        if job_type:
+            _running[job_type] -= 1
+        _cond.notify_all()
+
+
+def _worker_loop():
+    import sys
+    from app.database import create_worker_session
+    from app.tasks.scheduler import JobCancelled
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    # One engine (and connection pool) per worker, reused across jobs
+    worker_session = create_worker_session()
+    name = threading.current_thread().name
+
+    try:
+        while True:
+            item = _next_job()
+            if item is None:
+                break
+            _, _, job_type, coro_factory, job_id = item
+            try:
+                print(f"[inline_runner] {name} running job={job_id}", flush=True)
+                loop.run_until_complete(coro_factory(worker_session))
+                print(f"[inline_runner] {name} completed job={job_id}", flush=True)
+            except JobCancelled:
+                print(f"[inline_runner] {name} cancelled job={job_id}", flush=True)
+            except Exception as e:
+                print(f"[inline_runner] Task FAILED for job={job_id}: {e}", flush=True)
+                traceback.print_exc(file=sys.stdout)
+                sys.stdout.flush()
+                if job_id:
+                    try:
+                        loop.run_until_complete(_mark_job_failed(worker_session, job_id, str(e)))
+                    except Exception as mark_err:
+                        print(f"[inline_runner] Could not mark job failed: {mark_err}", flush=True)
+            finally:
+                _job_done(job_type)
+    finally:
         try:
-            print(f"[inline_runner] Running task for job={job_id}", flush=True)
-            loop.run_until_complete(coro_factory())
-            print(f"[inline_runner] Task completed for job={job_id}", flush=True)
-        except Exception as e:
-            print(f"[inline_runner] Task FAILED for job={job_id}: {e}", flush=True)
-            traceback.print_exc(file=sys.stdout)
-            sys.stdout.flush()
-            if job_id:
-                try:
-                    loop.run_until_complete(_mark_job_failed(worker_session, job_id, str(e)))
-                except Exception as mark_err:
-                    print(f"[inline_runner] Could not mark job failed: {mark_err}", flush=True)
+            loop.run_until_complete(worker_session.kw["bind"].dispose())
         finally:
             loop.close()
-            # Restore original session for safety
-            db_module.async_session = original_session
-
-    thread = threading.Thread(target=_target, daemon=True, name=f"geo-worker-{job_id}")
-    thread.start()
-    print(f"[inline_runner] Thread dispatched: {thread.name}", flush=True)
 
 
 async def _mark_job_failed(session_factory, job_id: str, error: str):
@@ -81,3 +169,7 @@ async def _mark_job_failed(session_factory, job_id: str, error: str):
             job.error = error
             job.completed_at = datetime.now(timezone.utc)
             await session.commit()
+
+    from app.utils import job_events
+
+    await job_events.publish(job_id, {"status": "failed", "error": error})
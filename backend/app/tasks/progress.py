@@ -0,0 +1,123 @@
+"""Throttled job progress reporter.
+
+Tasks report status/progress/step_info on every tick; the reporter buffers
+the changes and writes them with a single UPDATE by primary key at most
+every ``settings.job_progress_flush_ms`` — or immediately on a status
+change, result or error. On SQLite this keeps progress writes from
+contending with the task's real write path. Each flush is also published
+to app.utils.job_events for the SSE stream.
+"""
+
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, update
+
+import app.database as _db
+from app.config import settings
+from app.models.job import BackgroundJob
+from app.tasks.scheduler import STOPPED_STATUSES, JobCancelled, check_cancelled
+from app.utils import job_events
+
+_FINISHED = ("completed", "failed")
+
+
+class JobProgress:
+    """Buffers BackgroundJob updates for one job (no-op when job_id is None).
+
+    Session contract: the reporter never touches the task's session. Each
+    flush and cancellation check runs in its own short-lived session from
+    ``session_factory`` (pass the task's factory, so inline workers use
+    their own engine) and commits only the job row, so reporting progress
+    never commits half of a task's unit of work. Tasks commit their own
+    work, and report terminal statuses only after that commit.
+
+    SQLite has a single writer: report while the task's session holds no
+    uncommitted writes, or the flush waits out the busy timeout on the
+    task's own write lock.
+    """
+
+    def __init__(self, job_id: str | None, *, session_factory=None, interval_ms: int | None = None):
+        self.job_id = job_id
+        self._session_factory = session_factory or _db.async_session
+        self._uuid = uuid.UUID(job_id) if job_id else None
+        self._interval = (interval_ms if interval_ms is not None else settings.job_progress_flush_ms) / 1000
+        self._pending: dict = {}
+        self._last_flush = 0.0
+        self._last_cancel_check = 0.0
+        self.cancelled = False
+
+    async def update(
+        self,
+        *,
+        status: str | None = None,
+        progress: float | None = None,
+        step_info: dict | None = None,
+        result: dict | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record changes; flush now if they matter or the interval has passed."""
+        if not self.job_id:
+            return
+        values = {
+            "status": status,
+            "progress": progress,
+            "step_info": step_info,
+            "result": result,
+            "error": error,
+        }
+        self._pending.update({k: v for k, v in values.items() if v is not None})
+
+        urgent = status is not None or result is not None or error is not None
+        if urgent or time.monotonic() - self._last_flush >= self._interval:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered changes in one UPDATE, in a session of its own.
+
+        Cancelled (or superseded) rows are never overwritten; if the job
+        turns out to be stopped the next ``check_cancelled`` raises without
+        a query.
+        """
+        if not self._pending:
+            return
+        values = dict(self._pending)
+        status = values.get("status")
+        now = datetime.now(timezone.utc)
+        if status == "running":
+            values["started_at"] = func.coalesce(BackgroundJob.started_at, now)
+        elif status in _FINISHED:
+            values["completed_at"] = now
+
+        async with self._session_factory() as session:
+            res = await session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == self._uuid, BackgroundJob.status.notin_(STOPPED_STATUSES))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            event = dict(self._pending)
+            self._pending.clear()
+            self._last_flush = self._last_cancel_check = time.monotonic()
+            if res.rowcount == 0:
+                try:
+                    await check_cancelled(session, self.job_id)
+                except JobCancelled:
+                    self.cancelled = True
+                return
+        await job_events.publish(self.job_id, event)
+
+    async def check_cancelled(self) -> None:
+        """Raise JobCancelled if the job was cancelled (throttled like flushes)."""
+        if not self.job_id:
+            return
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+        if time.monotonic() - self._last_cancel_check < self._interval:
+            return
+        self._last_cancel_check = time.monotonic()
+        async with self._session_factory() as session:
+            await check_cancelled(session, self.job_id)
+
@@ -0,0 +1,224 @@
+"""Job scheduler — queues, per-type concurrency caps and cancellation.
+
+Sits on top of both backends:
+- Celery (redis_url set): jobs go to a named queue with a priority, and
+  per-task leases in Redis cap how many jobs of each type run at once (a
+  task over the cap retries later instead of occupying the worker).
+- Inline runner (no Redis): the worker pool picks the highest-priority
+  pending job whose type is under its cap.
+
+Cancellation is cooperative: the job row is marked "cancelled" (or
+"failed", when a stale job is superseded) and the task loops call
+``check_cancelled`` between units of work.
+"""
+
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.job import BackgroundJob
+
+# job_type -> queue name
+JOB_QUEUES = {
+    "serp_fetch": "interactive",
+    "gap_analysis": "interactive",
+    "content_generation": "interactive",
+    "serp_batch": "bulk",
+    "geo_analysis": "bulk",
+    "influencer_search": "bulk",
+}
+
+# Lower runs first (matches Celery's Redis transport, where 0 is highest)
+QUEUE_PRIORITY = {
+    "interactive": 0,
+    "bulk": 6,
+}
+
+SLOT_RETRY_SECONDS = 30
+_SLOT_TTL = 6 * 3600  # a lease left by a worker that died mid-job frees up after this
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+# Set on a job from outside its task; the task stops at its next check
+STOPPED_STATUSES = ("cancelled", "failed")
+
+
+class JobCancelled(Exception):
+    """Raised inside a task when its job has been cancelled."""
+
+
+def queue_for(job_type: str) -> str:
+    return JOB_QUEUES.get(job_type, "bulk")
+
+
+def priority_for(job_type: str) -> int:
+    return QUEUE_PRIORITY[queue_for(job_type)]
+
+
+def max_concurrency(job_type: str) -> int:
+    """Max jobs of this type running at once (0 = unlimited)."""
+    return settings.job_concurrency.get(job_type, 0)
+
+
+# ---------------------------------------------------------------------------
+# Submission
+# ---------------------------------------------------------------------------
+
+async def submit_job(
+    db: AsyncSession,
+    job: BackgroundJob,
+    *,
+    inline,
+    celery_task,
+    args: tuple,
+) -> None:
+    """Commit the job row and hand it to the active backend.
+
+    inline: callable taking a session factory and returning the coroutine
+        (see ``inline_runner.dispatch_inline``).
+    celery_task: the Celery task to enqueue when Redis is configured.
+    args: positional args for the Celery task.
+    """
+    from app.tasks.inline_runner import dispatch_inline, use_inline
+
+    job_id_str = str(job.id)
+    if use_inline():
+        await db.commit()
+        dispatch_inline(inline, job_id=job_id_str, job_type=job.job_type)
+        return
+
+    task = celery_task.apply_async(
+        args=args,
+        queue=queue_for(job.job_type),
+        priority=priority_for(job.job_type),
+    )
+    job.celery_task_id = task.id
+    await db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Cancellation
+# ---------------------------------------------------------------------------
+
+async def cancel_job(db: AsyncSession, job: BackgroundJob) -> bool:
+    """Cancel a pending or running job. Returns False if already finished."""
+    if job.status in TERMINAL_STATUSES:
+        return False
+
+    job.status = "cancelled"
+    job.completed_at = datetime.now(timezone.utc)
+    await db.commit()
+
+    from app.utils import job_events
+
+    await job_events.publish(str(job.id), {"status": "cancelled"})
+    _drop_queued(job)
+    return True
+
+
+async def supersede_job(db: AsyncSession, job: BackgroundJob, error: str) -> None:
+    """Mark a stale job failed so a replacement can take over its work."""
+    job.status = "failed"
+    job.error = error
+    job.completed_at = datetime.now(timezone.utc)
+    await db.commit()
+
+    from app.utils import job_events
+
+    await job_events.publish(str(job.id), {"status": "failed", "error": error})
+    _drop_queued(job)
+
+
+def _drop_queued(job: BackgroundJob) -> None:
+    from app.tasks.inline_runner import discard_pending, use_inline
+
+    if use_inline():
+        discard_pending(str(job.id))
+    elif job.celery_task_id:
+        from app.celery_app import celery_app
+
+        # Drops it if still queued; a running task stops at its next check
+        celery_app.control.revoke(job.celery_task_id)
+
+
+async def check_cancelled(session: AsyncSession, job_id: str | None) -> None:
+    """Raise JobCancelled if the job has been cancelled or superseded."""
+    if not job_id:
+        return
+    status = (await session.execute(
+        select(BackgroundJob.status).where(BackgroundJob.id == uuid.UUID(job_id))
+    )).scalar_one_or_none()
+    if status in STOPPED_STATUSES:
+        raise JobCancelled(job_id)
+
+
+# ---------------------------------------------------------------------------
+# Celery concurrency slots
+# ---------------------------------------------------------------------------
+_redis = None
+
+
+def _get_redis():
+    global _redis
+    if _redis is None:
+        import redis
+        _redis = redis.Redis.from_url(settings.redis_url)
+    return _redis
+
+
+# Slots are leases in a sorted set (member = holder token, score = expiry),
+# so each one expires on its own — a lease leaked by a dead worker frees up
+# after _SLOT_TTL however busy the job type is. Pruning, counting and
+# adding run atomically in one script.
+_ACQUIRE_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+def _slot_key(job_type: str) -> str:
+    return f"jobleases:{job_type}"
+
+
+def acquire_slot(job_type: str) -> str | None:
+    """Take a running slot for job_type.
+
+    Returns the lease token to pass to release_slot ("" when the type is
+    uncapped), or None if the type is at its cap.
+    """
+    cap = max_concurrency(job_type)
+    if cap <= 0 or not settings.redis_url:
+        return ""
+    token = uuid.uuid4().hex
+    now = time.time()
+    taken = _get_redis().eval(
+        _ACQUIRE_LUA, 1, _slot_key(job_type), now, cap, now + _SLOT_TTL, token, _SLOT_TTL,
+    )
+    return token if taken else None
+
+
+def release_slot(job_type: str, token: str) -> None:
+    if not token:
+        return
+    _get_redis().zrem(_slot_key(job_type), token)
+
+
+def run_with_slot(task, job_type: str, fn):
+    """Run fn() inside a concurrency slot, or retry the Celery task later."""
+    token = acquire_slot(job_type)
+    if token is None:
+        raise task.retry(countdown=SLOT_RETRY_SECONDS, max_retries=None)
+    try:
+        return fn()
+    except JobCancelled as e:
+        return {"job_id": str(e), "status": "cancelled"}
+    finally:
+        release_slot(job_type, token)
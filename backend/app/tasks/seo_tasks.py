@@ -10,9 +10,12 @@ from app.celery_app import celery
 import app.database as _db
 from app.engines.seo.content_classifier import classify, classify_with_llm
 from app.engines.seo import get_serp_provider
-from app.models.job import BackgroundJob
+from app.engines.intelligence.opportunity_store import bump_intel_version
 from app.models.seo import ContentClassification, SerpQuery, SerpResult
+from app.tasks.scheduler import run_with_slot
+from app.tasks.progress import JobProgress
 from app.utils import cache, rate_limiter
+from app.utils.urls import canonical_url_ids
 
 
 def _run_async(coro):
@@ -33,17 +36,22 @@ def _celery_task(**kwargs):
 @_celery_task(bind=True, name="seo.run_serp_query")
 def run_serp_query(self, query_id: str, job_id: str | None = None):
     """Fetch SERP results for a single query."""
-    return _run_async(_run_serp_query(query_id, job_id))
+    return run_with_slot(self, "serp_fetch", lambda: _run_async(_run_serp_query(query_id, job_id)))
 
 
 @_celery_task(bind=True, name="seo.run_serp_batch")
 def run_serp_batch(self, query_ids: list[str], job_id: str | None = None):
     """Fetch SERP results for multiple queries."""
-    return _run_async(_run_serp_batch(self, query_ids, job_id))
+    return run_with_slot(self, "serp_batch", lambda: _run_async(_run_serp_batch(self, query_ids, job_id)))
 
 
-async def _run_serp_query(query_id: str, job_id: str | None) -> dict:
-    async with _db.async_session() as session:
+async def _run_serp_query(
+    query_id: str, job_id: str | None, session_factory=None, cached: dict | None = None,
+) -> dict:
+    """Fetch and store one query; ``cached`` is a value prefetched by the batch."""
+    session_factory = session_factory or _db.async_session
+    reporter = JobProgress(job_id, session_factory=session_factory)
+    async with session_factory() as session:
         result = await session.execute(
             select(SerpQuery).where(SerpQuery.id == uuid.UUID(query_id))
         )
@@ -51,9 +59,10 @@ async def _run_serp_query(query_id: str, job_id: str | None) -> dict:
         if not sq:
             return {"error": f"SerpQuery {query_id} not found"}
 
-        # Check cache
+        # Check cache (unless the batch already looked it up)
         cache_key = ("serp", sq.keyword, sq.location, sq.language)
-        cached = await cache.get_cached(*cache_key)
+        if cached is None:
+            cached = await cache.get_cached(*cache_key)
 
         if cached:
             items = cached["items"]
@@ -81,10 +90,12 @@ async def _run_serp_query(query_id: str, job_id: str | None) -> dict:
             await cache.set_cached(*cache_key, value={"items": items}, ttl=cache.SERP_TTL)
 
         # Store results in DB
+        url_ids = await canonical_url_ids(session, [item["url"] for item in items])
         for item in items:
             serp_result = SerpResult(
                 query_id=sq.id,
                 url=item["url"],
+                canonical_url_id=url_ids.get(item["url"]),
                 domain=item["domain"],
                 title=item["title"],
                 snippet=item["snippet"],
@@ -114,80 +125,61 @@ async def _run_serp_query(query_id: str, job_id: str | None) -> dict:
             session.add(cc)
 
         sq.last_fetched_at = datetime.now(timezone.utc)
+        await bump_intel_version(session, sq.project_id)
         await session.commit()
 
-        if job_id:
-            await _update_job(session, job_id, status="completed", progress=1.0)
+        await reporter.update(status="completed", progress=1.0)
 
     return {"query_id": query_id, "results": len(items)}
 
 
-async def _run_serp_batch(task, query_ids: list[str], job_id: str | None) -> dict:
+async def _run_serp_batch(
+    task, query_ids: list[str], job_id: str | None, session_factory=None,
+) -> dict:
+    session_factory = session_factory or _db.async_session
+    reporter = JobProgress(job_id, session_factory=session_factory)
     total = len(query_ids)
     completed = 0
+    await reporter.update(status="running")
 
     # Pre-load keyword names for progress step_info
-    keyword_map: dict[str, str] = {}
-    async with _db.async_session() as session:
-        if job_id:
-            await _update_job(session, job_id, status="running")
-        for qid in query_ids:
-            result = await session.execute(
-                select(SerpQuery).where(SerpQuery.id == uuid.UUID(qid))
-            )
-            sq = result.scalar_one_or_none()
-            if sq:
-                keyword_map[qid] = sq.keyword
+    async with session_factory() as session:
+        result = await session.execute(
+            select(SerpQuery.id, SerpQuery.keyword, SerpQuery.location, SerpQuery.language)
+            .where(SerpQuery.id.in_([uuid.UUID(qid) for qid in query_ids]))
+        )
+        rows = {str(row.id): row for row in result.all()}
+        keyword_map: dict[str, str] = {qid: row.keyword for qid, row in rows.items()}
+
+    # Resolve every cache lookup in one round-trip
+    known = [qid for qid in query_ids if qid in rows]
+    hits = await cache.get_many(
+        "serp", [(rows[qid].keyword, rows[qid].location, rows[qid].language) for qid in known]
+    )
+    prefetched = dict(zip(known, hits))
 
     for qid in query_ids:
-        # Update step_info with current keyword before processing
+        # One (throttled) progress write per keyword, before processing it
         if job_id:
-            async with _db.async_session() as session:
-                await _update_job(
-                    session, job_id,
-                    step_info={
-                        "current_keyword": keyword_map.get(qid, ""),
-                        "step": completed + 1,
-                        "total": total,
-                    },
-                )
+            await reporter.check_cancelled()
+            await reporter.update(
+                progress=completed / total,
+                step_info={
+                    "current_keyword": keyword_map.get(qid, ""),
+                    "step": completed + 1,
+                    "total": total,
+                },
+            )
 
         try:
-            await _run_serp_query(qid, None)
+            await _run_serp_query(
+                qid, None, session_factory=session_factory, cached=prefetched.get(qid),
+            )
         except Exception as e:
             print(f"Error fetching SERP for {qid}: {e}")
 
         completed += 1
-        if job_id:
-            async with _db.async_session() as session:
-                await _update_job(
-                    session, job_id,
-                    progress=completed / total,
-                )
 
-    if job_id:
-        async with _db.async_session() as session:
-            await _update_job(session, job_id, status="completed", progress=1.0)
+    await reporter.update(status="completed", progress=1.0)
 
     return {"total": total, "completed": completed}
-
-
-async def _update_job(session, job_id: str, **kwargs):
-    result = await session.execute(
-        select(BackgroundJob).where(BackgroundJob.id == uuid.UUID(job_id))
-    )
-    job = result.scalar_one_or_none()
-    if not job:
-        return
-    for k, v in kwargs.items():
-        if k == "status":
-            setattr(job, k, v)
-            if v == "running" and not job.started_at:
-                job.started_at = datetime.now(timezone.utc)
-            if v == "completed":
-                job.completed_at = datetime.now(timezone.utc)
-        elif k == "progress":
-            job.progress = v
-        elif k == "step_info":
-            job.step_info = v
-    await session.commit()
@@ -1,11 +1,26 @@
 """Response cache for LLM and SERP calls.
 
-Uses Redis when redis_url is set, otherwise falls back to an in-memory dict.
+Uses Redis when redis_url is set, otherwise falls back to a byte-bounded
+in-memory LRU (see cache_mem_max_bytes).
+
+With Redis, a small per-process LRU (L1) sits in front of it so repeated
+reads in the same worker skip the round-trip. Redis values carry a one-byte
+header: b"j" plain JSON, b"z" zlib, b"Z" zstd. Payloads above
+cache_compress_min_bytes are compressed; entries written before the header
+existed (bare JSON) are still read.
 """
 
 import hashlib
 import json
+import threading
 import time
+import zlib
+from collections import OrderedDict
+
+try:
+    import zstandard as _zstd
+except ImportError:  # optional; zlib is used instead
+    _zstd = None
 
 from app.config import settings
 
@@ -26,65 +41,232 @@ def _cache_key(namespace: str, *parts: str) -> str:
 # ---------------------------------------------------------------------------
 # In-memory fallback (used when redis_url is empty)
 # ---------------------------------------------------------------------------
-_mem_store: dict[str, tuple[str, float]] = {}  # key -> (json_str, expire_at)
+class _MemLRU:
+    """Byte-bounded LRU with per-entry expiry.
+
+    Inline workers run on their own threads, so every operation takes the
+    lock. Expired entries are dropped on read and by a daemon sweeper thread;
+    when the byte budget is exceeded the least recently used entries go first.
+    """
+
+    def __init__(self, max_bytes: int, sweep_seconds: int):
+        self.max_bytes = max_bytes
+        self.sweep_seconds = sweep_seconds
+        self._data: OrderedDict[str, tuple[str, float, int]] = OrderedDict()  # key -> (value, expire_at, size)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._sweeper: threading.Thread | None = None
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    @staticmethod
+    def _size(key: str, value: str) -> int:
+        return len(key) + len(value.encode())
+
+    def _drop(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expire_at, _ = entry
+            if expire_at > 0 and time.time() > expire_at:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str, ex: int = 0) -> None:
+        size = self._size(key, value)
+        if size > self.max_bytes:
+            return  # would evict everything else and still not fit
+        expire_at = (time.time() + ex) if ex > 0 else 0
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, expire_at, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+        self._start_sweeper()
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, exp, _) in self._data.items() if 0 < exp < now]
+            for key in expired:
+                self._drop(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is not None or self.sweep_seconds <= 0:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while True:
+            time.sleep(self.sweep_seconds)
+            self.sweep()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_mem_store = _MemLRU(settings.cache_mem_max_bytes, settings.cache_sweep_seconds)
 
 
 async def _mem_get(key: str) -> str | None:
-    entry = _mem_store.get(key)
-    if entry is None:
-        return None
-    val, expire_at = entry
-    if expire_at > 0 and time.time() > expire_at:
-        del _mem_store[key]
-        return None
-    return val
+    return _mem_store.get(key)
 
 
 async def _mem_set(key: str, value: str, ex: int = 0) -> None:
-    expire_at = (time.time() + ex) if ex > 0 else 0
-    _mem_store[key] = (value, expire_at)
+    _mem_store.set(key, value, ex)
 
 
 # ---------------------------------------------------------------------------
 # Redis backend (used when redis_url is set)
 # ---------------------------------------------------------------------------
 _redis = None
+_l1 = _MemLRU(settings.cache_l1_max_bytes, settings.cache_sweep_seconds) if _use_redis else None
+
+if _zstd is not None:
+    _zstd_c, _zstd_d = _zstd.ZstdCompressor(level=3), _zstd.ZstdDecompressor()
 
 
 async def _get_redis():
     global _redis
     if _redis is None:
         import redis.asyncio as aioredis
-        _redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+        _redis = aioredis.from_url(settings.redis_url)
     return _redis
 
 
+def _encode(payload: str) -> bytes:
+    raw = payload.encode()
+    if len(raw) < settings.cache_compress_min_bytes:
+        return b"j" + raw
+    if _zstd is not None:
+        return b"Z" + _zstd_c.compress(raw)
+    return b"z" + zlib.compress(raw, 6)
+
+
+def _decode(data: bytes) -> str:
+    head, body = data[:1], data[1:]
+    if head == b"j":
+        return body.decode()
+    if head == b"z":
+        return zlib.decompress(body).decode()
+    if head == b"Z":
+        if _zstd is None:
+            raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+        return _zstd_d.decompress(body).decode()
+    return data.decode()  # legacy entry: bare JSON
+
+
+def _l1_set(key: str, payload: str, ttl: int) -> None:
+    if _l1 is None or settings.cache_l1_max_bytes <= 0:
+        return
+    ex = min(ttl, settings.cache_l1_ttl_seconds) if ttl > 0 else settings.cache_l1_ttl_seconds
+    _l1.set(key, payload, ex)
+
+
+async def _redis_get_many(keys: list[str]) -> list[str | None]:
+    out: list[str | None] = [_l1.get(k) if _l1 is not None else None for k in keys]
+    missing = [i for i, v in enumerate(out) if v is None]
+    if not missing:
+        return out
+    r = await _get_redis()
+    values = await r.mget([keys[i] for i in missing])
+    for i, data in zip(missing, values):
+        if data is None:
+            continue
+        try:
+            payload = _decode(data)
+        except Exception as e:
+            print(f"[cache] unreadable entry {keys[i]}: {e}")
+            continue
+        out[i] = payload
+        _l1_set(keys[i], payload, settings.cache_l1_ttl_seconds)
+    return out
+
+
+async def _redis_set_many(items: list[tuple[str, str]], ttl: int) -> None:
+    r = await _get_redis()
+    async with r.pipeline(transaction=False) as pipe:
+        for key, payload in items:
+            if ttl > 0:
+                pipe.set(key, _encode(payload), ex=ttl)
+            else:
+                pipe.set(key, _encode(payload))
+        await pipe.execute()
+    for key, payload in items:
+        _l1_set(key, payload, ttl)
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 async def get_cached(namespace: str, *parts: str) -> dict | None:
     """Return cached JSON value or None."""
-    key = _cache_key(namespace, *parts)
-    if _use_redis:
-        r = await _get_redis()
-        data = await r.get(key)
-    else:
-        data = await _mem_get(key)
-    if data:
-        return json.loads(data)
-    return None
+    return (await get_many(namespace, [parts]))[0]
 
 
 async def set_cached(namespace: str, *parts: str, value: dict, ttl: int = LLM_TTL) -> None:
     """Store a JSON-serialisable value in cache."""
-    key = _cache_key(namespace, *parts)
-    payload = json.dumps(value, ensure_ascii=False)
+    await set_many(namespace, [(parts, value)], ttl=ttl)
+
+
+async def get_many(namespace: str, keys: list[tuple[str, ...]]) -> list[dict | None]:
+    """Batch get_cached: one value (or None) per key parts tuple, in order.
+
+    With Redis this is a single MGET for whatever the L1 does not hold.
+    """
+    cache_keys = [_cache_key(namespace, *parts) for parts in keys]
     if _use_redis:
-        r = await _get_redis()
-        if ttl > 0:
-            await r.set(key, payload, ex=ttl)
-        else:
-            await r.set(key, payload)
+        payloads = await _redis_get_many(cache_keys)
     else:
-        await _mem_set(key, payload, ex=ttl)
+        payloads = [await _mem_get(k) for k in cache_keys]
+    return [json.loads(p) if p else None for p in payloads]
+
+
+async def set_many(namespace: str, items: list[tuple[tuple[str, ...], dict]], ttl: int = LLM_TTL) -> None:
+    """Batch set_cached: items are (key parts, value); one pipeline with Redis."""
+    encoded = [(_cache_key(namespace, *parts), json.dumps(value, ensure_ascii=False)) for parts, value in items]
+    if not encoded:
+        return
+    if _use_redis:
+        await _redis_set_many(encoded, ttl)
+    else:
+        for key, payload in encoded:
+            await _mem_set(key, payload, ex=ttl)
+
+
+def cache_stats() -> dict:
+    """Hit/miss/eviction counters and size of the in-memory cache (the L1 with Redis)."""
+    if _use_redis:
+        return {**_l1.stats(), "backend": "redis+l1"}
+    return _mem_store.stats()
@@ -0,0 +1,134 @@
+"""Job progress broadcaster (feeds the SSE endpoint).
+
+Uses Redis pub/sub when redis_url is set (Celery workers publish, any API
+process can stream), otherwise an in-process broadcaster — inline workers
+run in their own threads/loops, so events are handed to each subscriber's
+loop with call_soon_threadsafe.
+"""
+
+import asyncio
+import json
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.config import settings
+
+_use_redis = bool(settings.redis_url)
+
+
+def _channel(job_id: str) -> str:
+    return f"jobs:{job_id}"
+
+
+# ---------------------------------------------------------------------------
+# In-process fallback (used when redis_url is empty)
+# ---------------------------------------------------------------------------
+_subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_sub_lock = threading.Lock()
+
+
+def _mem_publish(job_id: str, event: dict) -> None:
+    with _sub_lock:
+        targets = list(_subscribers.get(job_id, ()))
+    for loop, q in targets:
+        try:
+            loop.call_soon_threadsafe(q.put_nowait, event)
+        except RuntimeError:
+            pass  # subscriber's loop already closed
+
+
+@asynccontextmanager
+async def _mem_subscribe(job_id: str):
+    entry = (asyncio.get_running_loop(), asyncio.Queue())
+    with _sub_lock:
+        _subscribers.setdefault(job_id, set()).add(entry)
+
+    async def _events() -> AsyncIterator[dict]:
+        while True:
+            yield await entry[1].get()
+
+    try:
+        yield _events()
+    finally:
+        with _sub_lock:
+            subs = _subscribers.get(job_id)
+            if subs is not None:
+                subs.discard(entry)
+                if not subs:
+                    del _subscribers[job_id]
+
+
+# ---------------------------------------------------------------------------
+# Redis backend (used when redis_url is set)
+# ---------------------------------------------------------------------------
+# Workers run each task on a fresh event loop, so keep one client per loop
+_redis_clients: dict[int, object] = {}
+
+
+async def _get_redis():
+    import redis.asyncio as aioredis
+
+    key = id(asyncio.get_running_loop())
+    client = _redis_clients.get(key)
+    if client is None:
+        # Clients bound to earlier (finished) loops: close their connections
+        stale = list(_redis_clients.values())
+        _redis_clients.clear()
+        for old in stale:
+            try:
+                await old.aclose()
+            except Exception:
+                pass  # its loop is closed; sockets go with the client object
+        client = aioredis.from_url(settings.redis_url, decode_responses=True)
+        _redis_clients[key] = client
+    return client
+
+
+@asynccontextmanager
+async def _redis_subscribe(job_id: str):
+    import redis.asyncio as aioredis
+
+    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    pubsub = r.pubsub()
+    await pubsub.subscribe(_channel(job_id))
+
+    async def _events() -> AsyncIterator[dict]:
+        async for message in pubsub.listen():
+            if message.get("type") == "message":
+                yield json.loads(message["data"])
+
+    try:
+        yield _events()
+    finally:
+        await pubsub.unsubscribe(_channel(job_id))
+        await pubsub.aclose()
+        await r.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+async def publish(job_id: str, event: dict) -> None:
+    """Broadcast a (partial) job update: {"id", "status"?, "progress"?, ...}."""
+    event = {"id": job_id, **event}
+    if _use_redis:
+        try:
+            r = await _get_redis()
+            await r.publish(_channel(job_id), json.dumps(event, default=str))
+        except Exception as e:
+            print(f"[job_events] publish failed for {job_id}: {e}")
+    else:
+        _mem_publish(job_id, event)
+
+
+def subscribe(job_id: str):
+    """Async context manager yielding an iterator of job updates.
+
+    The subscription is live as soon as the context is entered, so read the
+    current job state *inside* it to avoid missing updates.
+    """
+    if _use_redis:
+        return _redis_subscribe(job_id)
+    return _mem_subscribe(job_id)
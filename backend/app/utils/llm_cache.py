@@ -0,0 +1,137 @@
+"""Memoization for deterministic LLM calls, on top of app.utils.cache.
+
+    @memoize_llm(ttl=30 * 24 * 3600, provider="openai", result_type=ClassificationResult)
+    async def classify_with_llm(url, title, snippet): ...
+
+The key is function + model + a hash of the normalized arguments
+(whitespace collapsed, defaults applied) and of the function's source, so
+editing a prompt template starts a fresh keyspace instead of serving
+answers to the old prompt. Callers pass ``bypass_cache=True`` to force a
+fresh call (its result is still stored). Hit/miss counters per function
+are kept in-process (see llm_cache_stats).
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, is_dataclass
+from typing import Any
+
+from app.config import settings
+from app.utils import cache
+
+_NAMESPACE = "llm_memo"
+
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, field: str) -> None:
+    with _stats_lock:
+        counters = _stats.setdefault(name, {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0})
+        counters[field] += 1
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if is_dataclass(value):
+        return _normalize(asdict(value))
+    return value
+
+
+def _source_hash(fn: Callable) -> str:
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        return ""
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def memoize_llm(
+    *,
+    ttl: int = cache.LLM_TTL,
+    model: str | Callable[[], str] = "",
+    provider: str | None = None,
+    result_type: type | None = None,
+    cache_if: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Cache an async function's result by (name, model, normalized args).
+
+    model: the model the call resolves to, or a callable returning it when
+        that depends on which API keys are configured.
+    provider: instead of model, for calls made through get_adapter(provider).
+    result_type: dataclass the function returns (stored as a dict and
+        rebuilt on hits); other results must be JSON-serializable.
+    cache_if: results for which it returns False (error placeholders,
+        empty answers) are returned but not stored.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        signature = inspect.signature(fn)
+        version = _source_hash(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, bypass_cache: bool = False, **kwargs):
+            if not settings.llm_cache_enabled:
+                return await fn(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            digest = hashlib.sha256(json.dumps(
+                _normalize(dict(bound.arguments)), sort_keys=True, ensure_ascii=False, default=str,
+            ).encode()).hexdigest()
+            if provider is not None:
+                from app.engines.geo import adapter_model
+
+                model_id = adapter_model(provider)
+            else:
+                model_id = model() if callable(model) else model
+            parts = (name, model_id, version, digest)
+
+            if bypass_cache:
+                _count(name, "bypassed")
+            else:
+                try:
+                    cached = await cache.get_cached(_NAMESPACE, *parts)
+                except Exception as e:
+                    print(f"[llm_cache] lookup failed for {name}: {e}")
+                    cached = None
+                if cached is not None:
+                    _count(name, "hits")
+                    value = cached["v"]
+                    return result_type(**value) if result_type is not None else value
+                _count(name, "misses")
+
+            result = await fn(*args, **kwargs)
+            if cache_if is None or cache_if(result):
+                value = asdict(result) if result_type is not None else result
+                try:
+                    await cache.set_cached(_NAMESPACE, *parts, value={"v": value}, ttl=ttl)
+                    _count(name, "stored")
+                except Exception as e:
+                    print(f"[llm_cache] store failed for {name}: {e}")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def llm_cache_stats() -> dict[str, dict]:
+    """Per-function counters and hit rate (hits / lookups) for this process."""
+    with _stats_lock:
+        snapshot = {name: dict(c) for name, c in _stats.items()}
+    for counters in snapshot.values():
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else None
+    return snapshot
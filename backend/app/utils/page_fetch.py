@@ -0,0 +1,198 @@
+"""Page fetching with an on-disk cache of extracted text (domain analysis).
+
+Each URL's extracted text is stored as one JSON file in page_cache_dir
+together with the response's ETag / Last-Modified. Within page_cache_ttl
+the text is served without touching the network; after that the page is
+revalidated with a conditional GET and a 304 keeps the cached text.
+
+Only the first page_fetch_max_bytes of a page are read — the title, meta
+description and the first few thousand characters of text that callers
+use sit well inside that. Parsing uses selectolax when installed, else
+BeautifulSoup (with lxml when installed).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+
+from app.config import settings
+
+try:
+    from selectolax.parser import HTMLParser as _Selectolax
+except ImportError:  # optional; BeautifulSoup is used instead
+    _Selectolax = None
+
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = "lxml"
+except ImportError:
+    _BS4_PARSER = "html.parser"
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+}
+_NOISE_TAGS = ["script", "style", "nav", "footer", "header", "noscript", "svg", "iframe"]
+_BODY_CHARS = 3000
+
+
+@dataclass
+class PageText:
+    title: str | None
+    description: str | None
+    h1: list[str]
+    body: str  # whitespace-collapsed, first _BODY_CHARS chars
+
+    def render(self) -> str:
+        """Labelled sections in the form the domain analysis prompt expects."""
+        parts: list[str] = []
+        if self.title:
+            parts.append(f"Título: {self.title}")
+        if self.description:
+            parts.append(f"Descripción: {self.description}")
+        parts.extend(f"H1: {h}" for h in self.h1)
+        if self.body:
+            parts.append(f"Contenido: {self.body}")
+        return "\n\n".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+def _extract_selectolax(html: str) -> PageText:
+    tree = _Selectolax(html)
+    title_node = tree.css_first("title")
+    title = (title_node.text(strip=True) or None) if title_node else None
+    meta = tree.css_first('meta[name="description"]')
+    description = ((meta.attributes.get("content") or "").strip() or None) if meta else None
+    tree.strip_tags(_NOISE_TAGS)
+    h1 = [t for t in (n.text(strip=True) for n in tree.css("h1")[:3]) if t]
+    # Whole document like BeautifulSoup's get_text() (the title comes first)
+    body = tree.root.text(separator=" ", strip=True) if tree.root else ""
+    return PageText(
+        title=title,
+        description=description,
+        h1=h1,
+        body=" ".join(body.split())[:_BODY_CHARS],
+    )
+
+
+def _extract_bs4(html: str) -> PageText:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, _BS4_PARSER)
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+    title_tag = soup.find("title")
+    meta = soup.find("meta", attrs={"name": "description"})
+    h1 = [t for t in (h.get_text(strip=True) for h in soup.find_all("h1")[:3]) if t]
+    body = soup.get_text(separator=" ", strip=True)
+    return PageText(
+        title=title_tag.string.strip() if title_tag and title_tag.string else None,
+        description=meta["content"].strip() if meta and meta.get("content") else None,
+        h1=h1,
+        body=" ".join(body.split())[:_BODY_CHARS],
+    )
+
+
+def extract_text(html: str) -> PageText:
+    """Title, meta description, first H1s and leading body text of an HTML page."""
+    if _Selectolax is not None:
+        return _extract_selectolax(html)
+    return _extract_bs4(html)
+
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+def _cache_path(url: str) -> Path:
+    return Path(settings.page_cache_dir) / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+
+def _read_entry(url: str) -> dict | None:
+    try:
+        entry = json.loads(_cache_path(url).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("url") == url else None
+
+
+def _write_entry(url: str, entry: dict) -> None:
+    """Atomic write (temp file + rename) — several workers may share the directory."""
+    path = _cache_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+async def _read_capped(resp: httpx.Response, max_bytes: int) -> bytes:
+    buf = bytearray()
+    async for chunk in resp.aiter_bytes():
+        buf += chunk
+        if len(buf) >= max_bytes:
+            break
+    return bytes(buf[:max_bytes])
+
+
+async def fetch_page_text(url: str, *, refresh: bool = False) -> PageText:
+    """Extracted text of *url*, from the disk cache when possible.
+
+    refresh=True skips the TTL and always revalidates. Raises
+    httpx.HTTPStatusError / httpx.HTTPError like a plain GET would, unless
+    a cached copy exists — then that copy is returned instead.
+    """
+    entry = await asyncio.to_thread(_read_entry, url)
+    if entry and not refresh and time.time() - entry["fetched_at"] < settings.page_cache_ttl:
+        return PageText(**entry["page"])
+
+    headers = dict(_HEADERS)
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        async with httpx.AsyncClient(follow_redirects=True, timeout=settings.page_fetch_timeout) as client:
+            async with client.stream("GET", url, headers=headers) as resp:
+                if resp.status_code == 304 and entry:
+                    page = PageText(**entry["page"])
+                else:
+                    resp.raise_for_status()
+                    raw = await _read_capped(resp, settings.page_fetch_max_bytes)
+                    html = raw.decode(resp.charset_encoding or "utf-8", errors="replace")
+                    page = await asyncio.to_thread(extract_text, html)
+                etag = resp.headers.get("etag")
+                last_modified = resp.headers.get("last-modified")
+    except httpx.HTTPError:
+        if entry:
+            return PageText(**entry["page"])
+        raise
+
+    await asyncio.to_thread(_write_entry, url, {
+        "url": url,
+        "etag": etag or (entry or {}).get("etag"),
+        "last_modified": last_modified or (entry or {}).get("last_modified"),
+        "fetched_at": time.time(),
+        "page": asdict(page),
+    })
+    return page
@@ -1,12 +1,22 @@
 """Token-bucket rate limiter (per LLM/SERP provider).
 
 Uses Redis when redis_url is set, otherwise falls back to in-memory tracking.
+The daily quota ledger (take_daily) falls back to the daily_quota_usage
+table instead, so API server and worker processes share one count and it
+survives restarts.
 """
 
 import asyncio
 import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
 
+from sqlalchemy import select, update
+
+import app.database as _db
 from app.config import settings
+from app.models.compat import upsert_insert
+from app.models.quota import DailyQuotaUsage
 
 _use_redis = bool(settings.redis_url)
 
@@ -17,6 +27,9 @@ _RPM_MAP = {
     "gemini": settings.gemini_rpm,
     "perplexity": settings.perplexity_rpm,
     "serp": settings.serp_rpm,
+    "youtube": settings.youtube_rpm,
+    "searchapi": settings.searchapi_rpm,
+    "google_cse": settings.google_cse_rpm,
 }
 
 # ---------------------------------------------------------------------------
@@ -36,6 +49,40 @@ async def _mem_acquire(provider: str, interval: float) -> None:
         await asyncio.sleep(wait)
 
 
+# ---------------------------------------------------------------------------
+# Database ledger (daily quotas without Redis)
+# ---------------------------------------------------------------------------
+async def _db_take_daily(session_factory, provider: str, day: str, limit: int, cost: int) -> bool:
+    async with session_factory() as session:
+        await session.execute(
+            upsert_insert(DailyQuotaUsage.__table__, session)
+            .values(provider=provider, day=day, used=0)
+            .on_conflict_do_nothing(index_elements=["provider", "day"])
+        )
+        # Check and increment in one statement, so concurrent takers can't overshoot
+        res = await session.execute(
+            update(DailyQuotaUsage)
+            .where(
+                DailyQuotaUsage.provider == provider,
+                DailyQuotaUsage.day == day,
+                DailyQuotaUsage.used + cost <= limit,
+            )
+            .values(used=DailyQuotaUsage.used + cost)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+    return res.rowcount == 1
+
+
+async def _db_daily_used(session_factory, provider: str, day: str) -> int:
+    async with session_factory() as session:
+        used = (await session.execute(
+            select(DailyQuotaUsage.used)
+            .where(DailyQuotaUsage.provider == provider, DailyQuotaUsage.day == day)
+        )).scalar_one_or_none()
+    return used or 0
+
+
 # ---------------------------------------------------------------------------
 # Redis backend
 # ---------------------------------------------------------------------------
@@ -73,3 +120,37 @@ async def acquire(provider: str) -> None:
             return
         wait = interval - (now - float(last))
         await asyncio.sleep(wait)
+
+
+async def take_daily(
+    provider: str, limit: int, cost: int = 1, tz: str = "UTC", session_factory=None,
+) -> bool:
+    """Count *cost* units against *provider*'s daily quota.
+
+    The day rolls over at midnight in *tz* (YouTube quotas reset at midnight
+    Pacific time). Returns False, without counting, if the units would take
+    today's usage past *limit*. session_factory is used for the database
+    ledger (no Redis); inline workers pass their own.
+    """
+    day = f"{datetime.now(ZoneInfo(tz)):%Y-%m-%d}"
+    if not _use_redis:
+        return await _db_take_daily(session_factory or _db.async_session, provider, day, limit, cost)
+    key = f"{provider}:{day}"
+
+    r = await _get_redis()
+    used = await r.incrby(f"rate:daily:{key}", cost)
+    if used == cost:
+        await r.expire(f"rate:daily:{key}", 2 * 86400)
+    if used > limit:
+        await r.decrby(f"rate:daily:{key}", cost)
+        return False
+    return True
+
+
+async def daily_used(provider: str, tz: str = "UTC", session_factory=None) -> int:
+    """Units counted against *provider*'s quota today."""
+    day = f"{datetime.now(ZoneInfo(tz)):%Y-%m-%d}"
+    if not _use_redis:
+        return await _db_daily_used(session_factory or _db.async_session, provider, day)
+    r = await _get_redis()
+    return int(await r.get(f"rate:daily:{provider}:{day}") or 0)
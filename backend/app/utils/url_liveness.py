@@ -0,0 +1,109 @@
+"""URL liveness checks (filters LLM-hallucinated citation URLs).
+
+Verdicts are cached in app.utils.cache — alive URLs for
+url_check_alive_ttl, dead ones for url_check_dead_ttl — so the endpoint
+and the GEO pipeline share them. Unknown URLs are checked with one shared
+client: each unique host is resolved first (hosts that don't resolve make
+all their URLs dead without an HTTP attempt), then a HEAD request per URL,
+falling back to a streamed GET (headers only) for servers that reject
+HEAD. Requests are capped globally and per host.
+"""
+
+import asyncio
+import socket
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+from app.utils import cache
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (compatible; SanchoCMO/1.0; +https://sancho.ai)"
+    )
+}
+_DNS_TIMEOUT = 3.0
+# Statuses some servers return for HEAD but not GET
+_RETRY_WITH_GET = {403, 405, 501}
+
+
+async def _resolves(host: str) -> bool:
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.wait_for(loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), _DNS_TIMEOUT)
+        return True
+    except Exception:
+        return False
+
+
+async def _probe(client: httpx.AsyncClient, url: str) -> bool:
+    try:
+        r = await client.head(url)
+        if r.status_code in _RETRY_WITH_GET:
+            async with client.stream("GET", url) as r:
+                pass  # status is enough — don't read the body
+        return r.status_code < 400
+    except Exception:
+        return False
+
+
+async def _check_uncached(urls: list[str]) -> dict[str, bool]:
+    by_host: dict[str, list[str]] = defaultdict(list)
+    verdicts: dict[str, bool] = {}
+    for url in urls:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            verdicts[url] = False
+        else:
+            by_host[parts.hostname.lower()].append(url)
+
+    hosts = list(by_host)
+    resolved = await asyncio.gather(*(_resolves(h) for h in hosts))
+
+    overall = asyncio.Semaphore(settings.url_check_concurrency)
+
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=settings.url_check_timeout,
+        headers=_HEADERS,
+        verify=False,  # noqa: S501 — external URLs, SSL errors irrelevant
+    ) as client:
+
+        async def check_host(host_urls: list[str]) -> None:
+            per_host = asyncio.Semaphore(settings.url_check_per_host)
+
+            async def check(url: str) -> None:
+                async with per_host, overall:
+                    verdicts[url] = await _probe(client, url)
+
+            await asyncio.gather(*(check(u) for u in host_urls))
+
+        checks = []
+        for host, ok in zip(hosts, resolved):
+            if ok:
+                checks.append(check_host(by_host[host]))
+            else:
+                verdicts.update(dict.fromkeys(by_host[host], False))
+        await asyncio.gather(*checks)
+    return verdicts
+
+
+async def check_urls(urls: list[str]) -> dict[str, bool]:
+    """Return {url: alive} for every unique URL (2xx/3xx after redirects = alive)."""
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}
+    cached = await cache.get_many("url_alive", [(u,) for u in unique])
+    verdicts = {u: c["alive"] for u, c in zip(unique, cached) if c is not None}
+
+    todo = [u for u in unique if u not in verdicts]
+    if todo:
+        fresh = await _check_uncached(todo)
+        verdicts.update(fresh)
+        alive = [((u,), {"alive": True}) for u, ok in fresh.items() if ok]
+        dead = [((u,), {"alive": False}) for u, ok in fresh.items() if not ok]
+        await cache.set_many("url_alive", alive, ttl=settings.url_check_alive_ttl)
+        await cache.set_many("url_alive", dead, ttl=settings.url_check_dead_ttl)
+    return verdicts
@@ -0,0 +1,84 @@
+"""URL canonicalization and the shared canonical-URL table.
+
+Citations, SERP results and gap items store the URL as found plus a
+``canonical_url_id`` into ``canonical_urls``, so variants of one page
+(http/https, www, tracking params, fragments, trailing slash) dedupe and
+join as integers across GEO and SEO data.
+"""
+
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import select
+
+from app.models.compat import upsert_insert
+from app.models.domain import CanonicalUrl
+
+# Query params that only identify the click, never the page
+_TRACKING_PARAMS = frozenset({
+    "gclid", "gclsrc", "dclid", "fbclid", "msclkid", "yclid", "twclid", "ttclid",
+    "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "srsltid",
+    "ref_src", "ref_url", "spm", "si",
+})
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_IN_CHUNK = 500  # keeps IN (...) lists under SQLite's bound-parameter limit
+
+
+def _is_tracking(key: str) -> bool:
+    key = key.lower()
+    return key.startswith("utm_") or key in _TRACKING_PARAMS
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """Canonical form used for dedup: ``https://host/path?sorted-query``.
+
+    Scheme becomes https, the host is lowercased without ``www.`` and its
+    default port, fragments, tracking params and trailing slashes are
+    dropped and the remaining query params are sorted. Anything that isn't
+    an http(s) URL is returned stripped but otherwise unchanged.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.removeprefix("www.")
+    if port and port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k)
+    ))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+async def canonical_url_ids(session, urls: list[str]) -> dict[str, int]:
+    """Return {url: canonical_urls.id} for every URL, creating missing rows.
+
+    Safe under concurrent writers: inserts skip URLs another worker added
+    first, ids are then read back.
+    """
+    canonical = {u: canonicalize_url(u) for u in urls if u}
+    unique = list(dict.fromkeys(canonical.values()))
+    if not unique:
+        return {}
+
+    insert = upsert_insert(CanonicalUrl.__table__, session)
+    ids: dict[str, int] = {}
+    for i in range(0, len(unique), _IN_CHUNK):
+        chunk = unique[i:i + _IN_CHUNK]
+        await session.execute(
+            insert.values([{"url": c, "domain": urlsplit(c).hostname} for c in chunk])
+            .on_conflict_do_nothing(index_elements=["url"])
+        )
+        rows = await session.execute(
+            select(CanonicalUrl.url, CanonicalUrl.id).where(CanonicalUrl.url.in_(chunk))
+        )
+        ids.update(rows.tuples().all())
+    return {u: ids[c] for u, c in canonical.items()}
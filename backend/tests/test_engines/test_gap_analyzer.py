@@ -0,0 +1,168 @@
+"""analyze_gaps / analyze_gaps_many against the original per-niche dict implementation."""
+
+import random
+
+import pytest
+
+from app.engines.intelligence.gap_analyzer import _score_opportunity, analyze_gaps, analyze_gaps_many
+
+NICHES = ["fintech", "seguros", "viajes", "salud"]
+CONTENT_TYPES = [None, "ranking", "review", "solution", "news"]
+DOMAIN_TYPES = [None, "editorial", "ugc", "corporate"]
+
+
+def _reference_gaps(geo_citations, serp_results, client_brand_names, competitor_brand_names,
+                    client_domains, excluded_domains):
+    """Reference: one metadata dict per URL, lookup sets rebuilt per row."""
+    url_map: dict[str, dict] = {}
+
+    def slot(url, domain, **meta):
+        return url_map.setdefault(url, {
+            "domain": domain, "competitors": set(), "found_in_geo": False, "found_in_serp": False, **meta,
+        })
+
+    for c in geo_citations:
+        url, domain = c.get("url", ""), c.get("domain", "")
+        if not url or domain in excluded_domains:
+            continue
+        data = slot(url, domain, client_present=False, content_type=None,
+                    domain_type=c.get("domain_type"), keyword=None, niche=None)
+        data["found_in_geo"] = True
+        brand = c.get("brand_name", "")
+        if brand:
+            if brand.lower() in {n.lower() for n in client_brand_names}:
+                data["client_present"] = True
+            elif brand.lower() in {n.lower() for n in competitor_brand_names}:
+                data["competitors"].add(brand)
+
+    for s in serp_results:
+        url, domain = s.get("url", ""), s.get("domain", "")
+        if not url or domain in excluded_domains:
+            continue
+        is_client_domain = domain in {d.lower() for d in client_domains}
+        if url not in url_map:
+            slot(url, domain, client_present=is_client_domain, content_type=s.get("content_type"),
+                 domain_type=s.get("domain_type"), keyword=s.get("keyword"), niche=s.get("niche"))
+        elif is_client_domain:
+            url_map[url]["client_present"] = True
+        data = url_map[url]
+        data["found_in_serp"] = True
+        for key in ("content_type", "keyword", "niche", "domain_type"):
+            if s.get(key):
+                data[key] = s[key]
+
+    opportunities = [
+        (url, data["domain"], sorted(data["competitors"]), data["found_in_geo"], data["found_in_serp"],
+         data["content_type"], data["domain_type"], _score_opportunity(data), data["keyword"], data["niche"])
+        for url, data in url_map.items()
+        if data["domain"] not in {d.lower() for d in client_domains}
+        and data["competitors"] and not data["client_present"]
+    ]
+    opportunities.sort(key=lambda o: o[7], reverse=True)
+    return len(url_map), opportunities
+
+
+def _as_tuples(result):
+    return result.total_urls_analyzed, [
+        (o.url, o.domain, o.competitor_brands, o.found_in_geo, o.found_in_serp,
+         o.content_type, o.domain_type, o.opportunity_score, o.keyword, o.niche)
+        for o in result.opportunities
+    ]
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    """~30k rows over 4 niches; niches share URLs, domains and some competitors."""
+    rng = random.Random(1234)
+    brands = [f"Brand{i}" for i in range(60)]
+    competitors = {niche: rng.sample(brands, 20) for niche in NICHES}
+    client_names = ["Escudero", "escudero app"]
+    domains = [f"site{i}.com" for i in range(400)] + ["escudero.es"]
+    urls = [(f"https://{d}/p/{n}", d) for d in domains for n in range(8)]
+
+    citations = []
+    for _ in range(8000):
+        url, domain = rng.choice(urls)
+        brand = rng.choice(brands + client_names + ["", "BRAND3", "Unknown"])
+        citations.append({
+            "url": url,
+            "domain": domain,
+            "brand_name": brand,
+            "domain_type": rng.choice(DOMAIN_TYPES),
+            "niche": rng.choice([*NICHES, None, None]),
+        })
+    serp = []
+    for _ in range(20000):
+        url, domain = rng.choice(urls)
+        serp.append({
+            "url": url,
+            "domain": domain,
+            "position": rng.randint(1, 10),
+            "keyword": rng.choice([None, "mejor app", "comparativa", "opiniones"]),
+            "niche": rng.choice(NICHES),
+            "content_type": rng.choice(CONTENT_TYPES),
+            "domain_type": rng.choice(DOMAIN_TYPES),
+        })
+    return {
+        "citations": citations,
+        "serp": serp,
+        "competitors": competitors,
+        "client_names": client_names,
+        "client_domains": ["escudero.es"],
+        "excluded": {"site0.com", "site1.com"},
+    }
+
+
+def _per_niche_reference(data, niche):
+    return _reference_gaps(
+        [c for c in data["citations"] if c["niche"] in (niche, None)],
+        [s for s in data["serp"] if s["niche"] == niche],
+        data["client_names"],
+        data["competitors"][niche],
+        data["client_domains"],
+        data["excluded"],
+    )
+
+
+@pytest.mark.parametrize("niche", NICHES)
+def test_analyze_gaps_matches_reference(synthetic, niche):
+    result = analyze_gaps(
+        geo_citations=[c for c in synthetic["citations"] if c["niche"] in (niche, None)],
+        serp_results=[s for s in synthetic["serp"] if s["niche"] == niche],
+        client_brand_names=synthetic["client_names"],
+        competitor_brand_names=synthetic["competitors"][niche],
+        client_domains=synthetic["client_domains"],
+        excluded_domains=synthetic["excluded"],
+    )
+    expected = _per_niche_reference(synthetic, niche)
+    assert expected[1], "synthetic input should produce gaps"
+    assert _as_tuples(result) == expected
+
+
+def test_analyze_gaps_many_matches_per_niche_reference(synthetic):
+    results = analyze_gaps_many(
+        geo_citations=synthetic["citations"],
+        serp_results=synthetic["serp"],
+        client_brand_names=synthetic["client_names"],
+        competitor_brand_names_by_niche=synthetic["competitors"],
+        client_domains=synthetic["client_domains"],
+        excluded_domains=synthetic["excluded"],
+    )
+    assert set(results) == set(NICHES)
+    for niche in NICHES:
+        assert _as_tuples(results[niche]) == _per_niche_reference(synthetic, niche)
+
+
+def test_analyze_gaps_many_none_key_collects_serp_rows_without_niche():
+    citations = [{"url": "https://blog.com/a", "domain": "blog.com", "brand_name": "Rival"}]
+    serp = [{"url": "https://blog.com/b", "domain": "blog.com", "niche": None, "content_type": "ranking"}]
+    results = analyze_gaps_many(
+        geo_citations=citations,
+        serp_results=serp,
+        client_brand_names=["Escudero"],
+        competitor_brand_names_by_niche={None: ["Rival"], "fintech": []},
+        client_domains=[],
+    )
+    assert [o.url for o in results[None].opportunities] == ["https://blog.com/a"]
+    assert results[None].total_urls_analyzed == 2
+    assert results["fintech"].gaps_found == 0
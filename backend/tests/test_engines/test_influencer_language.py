@@ -0,0 +1,33 @@
+"""Verdicts of the creator-profile language heuristic on real titles/descriptions."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.engines.influencer.language import _MARKERS, is_non_spanish, marker_scores, non_spanish_many
+
+SAMPLES = json.loads((Path(__file__).parent / "fixtures" / "influencer_language.json").read_text(encoding="utf-8"))
+
+
+def _substring_scores(text: str) -> tuple[int, int, int]:
+    """Reference scoring: every marker as a plain substring of the text."""
+    return tuple(sum(1 for m in _MARKERS[lang] if m in text) for lang in ("pt", "en", "es"))
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=[f"{s['lang']}-{i}" for i, s in enumerate(SAMPLES)])
+def test_verdict(sample):
+    assert is_non_spanish(sample["text"]) is sample["non_spanish"]
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=[f"{s['lang']}-{i}" for i, s in enumerate(SAMPLES)])
+def test_token_lookup_matches_substring_markers(sample):
+    # " the " markers are looked up as split(" ")[1:-1] tokens — double
+    # spaces, tabs/newlines and markers at either end must count the same
+    text = sample["text"].lower()
+    assert marker_scores(text) == _substring_scores(text)
+
+
+def test_non_spanish_many_keeps_order_and_handles_none():
+    texts = [s["text"] for s in SAMPLES] + [None]
+    assert non_spanish_many(texts) == [s["non_spanish"] for s in SAMPLES] + [False]
@@ -0,0 +1,69 @@
+"""score_key_opportunities_vectorized against the per-domain scorer on randomized inputs."""
+
+import random
+from dataclasses import asdict
+
+import pytest
+
+from app.engines.intelligence.key_opportunity import DomainIntelligence, score_key_opportunities
+from app.engines.intelligence.vectorized_scoring import score_key_opportunities_vectorized
+
+
+def _random_domain(rng: random.Random, i: int) -> DomainIntelligence:
+    return DomainIntelligence(
+        domain=f"d{i}.com",
+        display_name=rng.choice([None, f"Site {i}"]),
+        domain_type=rng.choice([None, "editorial", "ugc", "reference", "corporate"]),
+        accepts_sponsored=rng.choice([None, True, False]),
+        # Tier boundaries, None (unknown) and non-positive traffic
+        domain_authority=rng.choice([None, 0, 5, 10, 19, 20, 39, 40, 59, 60, 90, rng.randint(0, 100)]),
+        monthly_traffic=rng.choice([
+            None, 0, -1, 999, 1000, 9999, 10000, 10**5, 10**6, 5 * 10**6, rng.randint(-10, 10**7),
+        ]),
+        serp_urls=[f"https://d{i}.com/{j}" for j in range(rng.randint(0, 8))],
+        serp_keywords=[rng.choice("abcdefghijkl") for _ in range(rng.randint(0, 12))],
+        serp_positions=[rng.randint(1, 30) for _ in range(rng.choice([0, 0, 1, 3, 6]))],
+        serp_content_types=[rng.choice(["ranking", "review", "solution", "news"]) for _ in range(rng.randint(0, 3))],
+        geo_citation_count=rng.randint(0, 8),
+        geo_providers=[rng.choice(["openai", "anthropic", "gemini", "perplexity"]) for _ in range(rng.randint(0, 4))],
+        geo_mentioned_brands=[rng.choice("pqrs") for _ in range(rng.randint(0, 4))],
+        competitor_brands_present=[f"b{j}" for j in range(rng.choice([0, 1, 2, 3, 5]))],
+        client_present=rng.random() < 0.1,
+        niches=[rng.choice("mno") for _ in range(rng.randint(0, 4))],
+    )
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+def test_vectorized_matches_scalar(seed):
+    rng = random.Random(seed)
+    domains = [_random_domain(rng, i) for i in range(3000)]
+
+    expected = score_key_opportunities(domains)
+    actual = score_key_opportunities_vectorized(domains)
+
+    assert expected
+    assert [asdict(o) for o in actual] == [asdict(o) for o in expected]
+
+
+def test_vectorized_matches_scalar_on_edge_cases():
+    base = {"competitor_brands_present": ["Rival"]}
+    domains = [
+        DomainIntelligence(domain="unknown.com", **base),
+        DomainIntelligence(domain="zero.com", monthly_traffic=0, domain_authority=0, **base),
+        DomainIntelligence(domain="negative.com", monthly_traffic=-5, domain_authority=None, **base),
+        DomainIntelligence(domain="no-positions.com", serp_urls=["https://no-positions.com/a"],
+                           serp_keywords=["k"], serp_positions=[], **base),
+        DomainIntelligence(domain="geo-only.com", geo_citation_count=3, geo_providers=["openai"], **base),
+        DomainIntelligence(domain="client.com", client_present=True, **base),
+        DomainIntelligence(domain="no-competitors.com", domain_authority=80),
+    ]
+
+    expected = score_key_opportunities(domains)
+    actual = score_key_opportunities_vectorized(domains)
+
+    # Client-owned and competitor-free domains are skipped
+    assert {o.domain for o in expected} == {
+        "unknown.com", "zero.com", "negative.com", "no-positions.com", "geo-only.com",
+    }
+    assert [asdict(o) for o in actual] == [asdict(o) for o in expected]
+    assert score_key_opportunities_vectorized([]) == []
@@ -0,0 +1,121 @@
+"""Hot-path queries must be served by the indexes declared on the models."""
+
+import importlib.util
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.models  # noqa: F401
+from app.database import Base, _create_missing_indexes
+
+_MIGRATION = Path(__file__).parents[1] / "alembic" / "versions" / "0001_hot_path_indexes.py"
+
+# postgresql+asyncpg:// URL of a scratch database for the Postgres plans
+_PG_URL = os.environ.get("TEST_POSTGRES_URL")
+
+# Valid on both backends (Postgres ids are native UUIDs)
+_ID = "'00000000-0000-0000-0000-000000000000'"
+
+# (query, index that must appear in its plan)
+HOT_QUERIES = [
+    (
+        f"SELECT id FROM geo_runs WHERE project_id = {_ID} AND status = 'completed' "
+        "ORDER BY created_at DESC LIMIT 1",
+        "ix_geo_runs_project_status_created",
+    ),
+    (
+        f"SELECT turn FROM geo_responses WHERE run_id = {_ID} AND prompt_id = {_ID} AND provider = 'openai'",
+        "ix_geo_responses_run_prompt_provider_turn",
+    ),
+    (f"SELECT * FROM brand_mentions WHERE response_id = {_ID}", "ix_brand_mentions_response_id"),
+    (f"SELECT * FROM brand_mentions WHERE brand_id = {_ID}", "ix_brand_mentions_brand_id"),
+    (f"SELECT * FROM source_citations WHERE response_id = {_ID}", "ix_source_citations_response_id"),
+    ("SELECT * FROM source_citations WHERE domain = 'example.com'", "ix_source_citations_domain"),
+    (f"SELECT * FROM serp_queries WHERE project_id = {_ID} AND niche = 'n'", "ix_serp_queries_project_niche"),
+    (f"SELECT * FROM serp_results WHERE query_id = {_ID} ORDER BY position", "ix_serp_results_query_position"),
+    ("SELECT * FROM serp_results WHERE domain = 'example.com'", "ix_serp_results_domain"),
+    (
+        f"SELECT * FROM gap_analyses WHERE project_id = {_ID} ORDER BY created_at DESC LIMIT 1",
+        "ix_gap_analyses_project_created",
+    ),
+    (f"SELECT * FROM gap_items WHERE analysis_id = {_ID}", "ix_gap_items_analysis_id"),
+    (f"SELECT * FROM brands WHERE project_id = {_ID}", "ix_brands_project_id"),
+    ("SELECT * FROM brand_domains WHERE domain = 'example.com'", "ix_brand_domains_domain"),
+    (f"SELECT * FROM brand_domains WHERE brand_id = {_ID}", "ix_brand_domains_brand_id"),
+    (
+        f"SELECT * FROM prompts WHERE project_id = {_ID} AND niche_id = {_ID} AND is_active = TRUE",
+        "ix_prompts_project_niche_active",
+    ),
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'indexes.db'}")
+    Base.metadata.create_all(eng)
+    yield eng
+    eng.dispose()
+
+
+@pytest.mark.parametrize("query,index", HOT_QUERIES, ids=[i for _, i in HOT_QUERIES])
+def test_hot_query_uses_index(engine, query, index):
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+    assert f"INDEX {index}" in plan, plan
+
+
+@pytest.fixture
+async def pg_engine():
+    """The models' tables in a throwaway schema of the TEST_POSTGRES_URL database."""
+    schema = f"test_indexes_{uuid.uuid4().hex[:12]}"
+    admin = create_async_engine(_PG_URL)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    eng = create_async_engine(_PG_URL, connect_args={"server_settings": {"search_path": schema}})
+    try:
+        async with eng.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield eng
+    finally:
+        await eng.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        await admin.dispose()
+
+
+@pytest.mark.skipif(not _PG_URL, reason="TEST_POSTGRES_URL not set")
+@pytest.mark.parametrize("query,index", HOT_QUERIES, ids=[i for _, i in HOT_QUERIES])
+async def test_hot_query_uses_index_on_postgres(pg_engine, query, index):
+    async with pg_engine.connect() as conn:
+        # The tables are empty: with sequential scans priced out, a query
+        # no index can serve still plans as a Seq Scan
+        await conn.execute(text("SET enable_seqscan = off"))
+        plan = "\n".join(row[0] for row in await conn.execute(text(f"EXPLAIN {query}")))
+    assert index in plan, plan
+    assert "Seq Scan" not in plan, plan
+
+
+def test_missing_indexes_are_created_on_existing_tables(engine):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_geo_responses_run_prompt_provider_turn"))
+        _create_missing_indexes(conn)
+    names = {ix["name"] for ix in inspect(engine).get_indexes("geo_responses")}
+    assert "ix_geo_responses_run_prompt_provider_turn" in names
+
+
+def test_migration_matches_model_indexes():
+    spec = importlib.util.spec_from_file_location("hot_path_indexes", _MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    declared = {
+        index.name: (table.name, [c.name for c in index.columns])
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+    }
+    for name, table, columns in migration.INDEXES:
+        assert declared.get(name) == (table, columns), name
@@ -1,8 +1,14 @@
 "use client";
 
 import { useCallback, useEffect, useRef, useState } from "react";
-import { geo, type JobStatus } from "@/lib/api";
+import { geo, jobEventsUrl, type JobStatus } from "@/lib/api";
 
+const TERMINAL = ["completed", "failed", "cancelled"];
+
+/**
+ * Track a background job. Subscribes to the server-sent event stream and
+ * falls back to polling GET /geo/jobs/{id} if the stream is unavailable.
+ */
 export function useJobPolling(jobId: string | null, intervalMs = 3000) {
   const [job, setJob] = useState<JobStatus | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -13,7 +19,7 @@ export function useJobPolling(jobId: string | null, intervalMs = 3000) {
     try {
       const status = await geo.getJobStatus(jobId);
       setJob(status);
-      if (status.status === "completed" || status.status === "failed") {
+      if (TERMINAL.includes(status.status)) {
         clearInterval(timerRef.current);
       }
     } catch (e) {
@@ -24,9 +30,37 @@ export function useJobPolling(jobId: string | null, intervalMs = 3000) {
 
   useEffect(() => {
     if (!jobId) return;
-    poll(); // immediate first call
-    timerRef.current = setInterval(poll, intervalMs);
-    return () => clearInterval(timerRef.current);
+
+    const startPolling = () => {
+      poll(); // immediate first call
+      timerRef.current = setInterval(poll, intervalMs);
+    };
+
+    if (typeof EventSource === "undefined") {
+      startPolling();
+      return () => clearInterval(timerRef.current);
+    }
+
+    let done = false;
+    const source = new EventSource(jobEventsUrl(jobId));
+    source.onmessage = (msg) => {
+      // First event is the full job; later ones carry only changed fields
+      const update = JSON.parse(msg.data) as Partial<JobStatus>;
+      setJob((prev) => ({ ...(prev ?? {}), ...update }) as JobStatus);
+      if (update.status && TERMINAL.includes(update.status)) {
+        done = true;
+        source.close();
+      }
+    };
+    source.onerror = () => {
+      source.close();
+      if (!done) startPolling();
+    };
+
+    return () => {
+      source.close();
+      clearInterval(timerRef.current);
+    };
   }, [jobId, intervalMs, poll]);
 
   return { job, error, isRunning: job?.status === "running" || job?.status === "pending" };
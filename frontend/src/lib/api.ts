@@ -256,6 +256,9 @@ export interface AggregatedResult {
   top_cited_domains: CitedDomain[];
 }
 
+/** Server-sent event stream of job progress (see useJobPolling). */
+export const jobEventsUrl = (jobId: string) => `${API_BASE}/geo/jobs/${jobId}/events`;
+
 export const geo = {
   createRun: (projectId: string, nicheId?: string | null, providers?: string[]) =>
     request<JobStatus>("/geo/runs", {
@@ -274,6 +277,8 @@ export const geo = {
   getMetrics: (runId: string) =>
     request<AggregatedResult>(`/geo/runs/${runId}/metrics`),
   getJobStatus: (jobId: string) => request<JobStatus>(`/geo/jobs/${jobId}`),
+  cancelJob: (jobId: string) =>
+    request<JobStatus>(`/geo/jobs/${jobId}/cancel`, { method: "POST" }),
   validateUrls: (urls: string[]) =>
     request<{ valid: string[] }>("/geo/validate-urls", {
       method: "POST",